@@ -0,0 +1,219 @@
+"""Micro-benchmarks for the OSC and SynthDef hot paths.
+
+Run with 'python bench.py'. No scsynth is needed; dispatching is measured
+against a fake server, so nothing is bound or sent.
+
+  python bench.py                    run everything at the default sizes
+  python bench.py -b decode -b build run only the named benchmarks
+  python bench.py -n dispatch=100000 run a benchmark at the given size instead of its defaults
+  python bench.py --save base.json   also save the results as a baseline
+  python bench.py --compare base.json
+                                     report the change against a saved baseline
+
+Each result is reported in operations per second, plus the number of
+gc-tracked objects one operation leaves alive. Python 2 has no way to count
+the allocations themselves.
+"""
+import argparse
+import array
+import gc
+import json
+import sys
+import supercollider.osc as osc
+from supercollider.core import SynthDef, compileDefs
+from supercollider.oscutil import msg
+from supercollider.ugen import SinOsc, Out
+
+clock = osc.defaultClock.monotonic
+
+def buildMessage(n):
+    m = osc.OSCMessage("/b_setn")
+    for i in xrange(n):
+        m.append(float(i))
+    return m
+
+def encodeMessage(n):
+    return buildMessage(n).getBinary()
+
+def encodeArray(n):
+    m = osc.OSCMessage("/b_setn")
+    m.append(array.array('f', xrange(n)))
+    return m.getBinary()
+
+def uncachedBinary(m):
+    m.address = m.address    # throw away the cached encoding
+    return m.getBinary()
+
+def decodeMessage(binary):
+    return osc.decodeOSC(binary)
+
+def nestedBundle(depth):
+    """Returns a bundle nested 'depth' levels deep, with a message at every level"""
+    b = osc.OSCBundle()
+    b.append(msg("/n_free", 1000))
+    for i in xrange(depth - 1):
+        outer = osc.OSCBundle()
+        outer.append(msg("/n_free", i))
+        outer.append(b)
+        b = outer
+    return b
+
+def bundleRoundTrip(b):
+    return osc.decodeOSC(uncachedBinary(b))
+
+class FakeServer(object):
+    """Just enough of an OSCServer for OSCRequestHandler.dispatchMessage()"""
+    def __init__(self, n):
+        handler = lambda addr, tags, data, client_address: None
+        self.callbacks = osc.OSCAddressSpace()
+        for i in xrange(n):
+            self.callbacks["/node/%d/freq" % i] = handler
+
+class FakeHandler(osc.OSCRequestHandler):
+    """An OSCRequestHandler which doesn't handle a request when instantiated"""
+    def __init__(self, n):
+        self.server = FakeServer(n)
+        self.client_address = ('127.0.0.1', 57110)
+
+def buildGraph(n):
+    """Returns a SynthDef of about 'n' UGens: a balanced tree of BinaryOpUGens
+    summing n/2 SinOscs (a chain would exhaust the recursion limit in addUgen)"""
+    sd = SynthDef("bench%d" % n, [('freq', 440)])
+    layer = [SinOsc.ar(sd.controls[0], i % 16) for i in xrange(max(1, n // 2))]
+    while len(layer) > 1:
+        pairs = [layer[i] + layer[i + 1] for i in xrange(0, len(layer) - 1, 2)]
+        if len(layer) % 2:
+            pairs.append(layer[-1])
+        layer = pairs
+    sd.addUgen(Out.ar(0, layer[0]))
+    return sd
+
+## The SCgf version 1 format counts UGens in 16 bits
+maxUgens = 0xffff
+
+def setupBuild(n): return buildMessage, (n,)
+def setupEncode(n): return uncachedBinary, (buildMessage(n),)
+def setupArray(n): return encodeArray, (n,)
+def setupDecode(n): return decodeMessage, (encodeMessage(n),)
+## Encoding & decoding recurse once per nesting level
+maxDepth = 200
+
+def setupBundle(n):
+    if n > maxDepth:
+        return None
+    return bundleRoundTrip, (nestedBundle(n),)
+def setupDispatch(n): return FakeHandler(n).dispatchMessage, ("/node/%d/freq" % (n - 1), "f", [440.0])
+def setupPattern(n): return FakeHandler(n).dispatchMessage, ("/node/%d/fre?" % (n - 1), "f", [440.0])
+
+def setupCompile(n):
+    sd = buildGraph(n)
+    if len(sd.ugens) > maxUgens:
+        return None
+    return compileDefs, ([sd],)
+
+## name: (setup(n) -> (function, args) or None if n is too large, default sizes)
+benchmarks = [
+    ('build', setupBuild, [10, 1000, 100000]),
+    ('getBinary', setupEncode, [10, 1000, 100000]),
+    ('array', setupArray, [10, 1000, 100000]),
+    ('decode', setupDecode, [10, 1000, 100000]),
+    ('bundle', setupBundle, [1, 10, 100]),
+    ('dispatch', setupDispatch, [10, 1000, 10000]),
+    ('pattern', setupPattern, [10, 1000, 10000]),
+    ('compile', setupCompile, [10, 1000, 10000, 100000]),
+]
+
+def timeit(f, *args):
+    """Returns the best wall-clock time per call of f(*args), in seconds.
+    Calls are repeated in batches of increasing size until a batch takes
+    at least 0.2s; the best of three such batches is reported."""
+    number = 1
+    while True:
+        start = clock()
+        for i in xrange(number):
+            f(*args)
+        elapsed = clock() - start
+        if elapsed >= 0.2:
+            break
+        number *= 10
+    best = elapsed
+    for i in range(2):
+        if elapsed > 2.0:
+            break
+        start = clock()
+        for i in xrange(number):
+            f(*args)
+        elapsed = clock() - start
+        best = min(best, elapsed)
+    return best / number
+
+def retained(f, *args):
+    """Returns the number of gc-tracked objects one call of f(*args) leaves alive"""
+    gc.collect()
+    before = len(gc.get_objects())
+    f(*args)
+    return len(gc.get_objects()) - before
+
+def run(selected=None, sizes=None):
+    """Runs the benchmarks, printing and returning {name: {size: {'ops': ..., 'retained': ...}}}.
+    'sizes' maps benchmark names to the sizes to run them at, instead of their defaults."""
+    sizes = sizes or {}
+    results = {}
+    for name, setup, default_sizes in benchmarks:
+        if selected and name not in selected and name not in sizes:
+            continue
+        results[name] = {}
+        for n in sizes.get(name, default_sizes):
+            prepared = setup(n)
+            if prepared == None:
+                print '%-10s %7d  skipped: too large' % (name, n)
+                continue
+            f, args = prepared
+            ops = 1.0 / timeit(f, *args)
+            objects = retained(f, *args)
+            results[name][str(n)] = {'ops': ops, 'retained': objects}
+            print '%-10s %7d %14.1f ops/s %12d retained gc objects' % (name, n, ops, objects)
+    return results
+
+def compare(results, baseline):
+    """Prints the change in ops/s of each result against the baseline"""
+    for name in sorted(results):
+        for n in sorted(results[name], key=int):
+            old = baseline.get(name, {}).get(n)
+            if old == None:
+                continue
+            change = (results[name][n]['ops'] / old['ops'] - 1.0) * 100
+            print '%-10s %7s %+8.1f%% ops/s  (%.1f -> %.1f)' % (name, n, change, old['ops'], results[name][n]['ops'])
+
+def parseSize(arg):
+    """Parses a NAME=SIZE command-line argument"""
+    name, _, n = arg.partition('=')
+    if name not in [b[0] for b in benchmarks] or not n.isdigit():
+        raise argparse.ArgumentTypeError("expected NAME=SIZE with one of %s, got %r"
+                                         % (', '.join(b[0] for b in benchmarks), arg))
+    return name, int(n)
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="OSC and SynthDef micro-benchmarks")
+    parser.add_argument('-b', '--benchmark', action='append',
+                        help="run only this benchmark (%s)" % ', '.join(b[0] for b in benchmarks))
+    parser.add_argument('-n', '--size', action='append', type=parseSize, default=[], metavar='NAME=SIZE',
+                        help="run the named benchmark at this size instead of its defaults (repeatable)")
+    parser.add_argument('--save', help="save the results to this JSON file")
+    parser.add_argument('--compare', help="compare against a JSON file saved with --save")
+    options = parser.parse_args(argv)
+
+    sizes = {}
+    for name, n in options.size:
+        sizes.setdefault(name, []).append(n)
+    results = run(options.benchmark, sizes)
+    if options.compare:
+        with open(options.compare) as f:
+            compare(results, json.load(f)['results'])
+    if options.save:
+        with open(options.save, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'results': results},
+                      f, indent=1, sort_keys=True)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
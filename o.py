@@ -4,6 +4,7 @@ from supercollider import SynthDef, mc
 from supercollider.ugen import *
 from supercollider.oscutil import *
 import supercollider.buf as buf
+import supercollider.reply as reply
 import os
 
 def m2():
@@ -69,7 +70,7 @@ def m3():
     m = msg("/d_recv")
     m.append(supercollider.compileDefs([m2()]), 'b')
     n = supercollider.node.Node("s")
-    m.append(n.s_new().getBinary(), 'b')
+    m.append(n.s_new(), 'b')
     send(m)
     send(delayedBundle(2.0, n.set("freqL", 400).n_set()))
     send(delayedBundle(3.0, n.n_free()))
@@ -86,6 +87,7 @@ def m4():
 
     m = osc.OSCMessage("/status")
     cl = s.client
+    replies = reply.Replies(s, (hostname, 57110))
     cl.sendto(m, (hostname, 57110))
 
     def send(msgOrBundle):
@@ -100,7 +102,7 @@ def m4():
     m = msg("/d_recv")
     m.append(supercollider.compileDefs([sd]), 'b')
     n = supercollider.node.Node("s")
-    m.append(delayedBundle(0.01, n.s_new()).getBinary(), 'b')
+    m.append(delayedBundle(0.01, n.s_new()), 'b')
     #send(m)
     #send(delayedBundle(1.0, n.set("freqL", 400).n_set()))
     #send(delayedBundle(2.0, n.set("freqL", 550).n_set()))
@@ -118,9 +120,9 @@ def m4():
     m.append(buf.allocRead(0,
                            os.path.abspath("scratch/sound/VOXX_L2S_Project_SnareDrum06_Steal_WorldMax_14x6_mono.wav")
                            #os.path.abspath("scratch/sound/VOXX_L2S_Project_Crash_Cymbal_Istambul_Mehmed_16_stereo.wav")
-                           ).getBinary(), 'b')
+                           ), 'b')
     send(m)
-    time.sleep(1)
+    replies.sync(5.0)
     send(n.s_new())
     send(delayedBundle(7.0, n.n_free()))
 
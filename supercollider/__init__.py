@@ -1,6 +1,6 @@
 import supercollider.core as core
 import supercollider.osc as osc
-from supercollider.core import compileDefs, mc, SynthDef
+from supercollider.core import compileDefs, d_recv, mc, SynthDef
 from supercollider.oscutil import *
 from supercollider.ugen import *
 from supercollider.node import *
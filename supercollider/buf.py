@@ -26,7 +26,7 @@ manager = BufferManager()
 
 def _maybeAppendCompletionMsg(m, completion_msg):
     if completion_msg is not None:
-        m.append(completion_msg.getBinary(), 'b')
+        m.append(completion_msg, 'b')
 
 def alloc(buffer_number,
           frame_count,
@@ -101,6 +101,26 @@ def free(buffer_number,
     _maybeAppendCompletionMsg(m, completion_msg)
     return m
 
+def setn(buffer_number,
+         start_index,
+         values):
+    ## values may be a numpy array or array.array, which gets encoded
+    ## as a single run of floats.
+    m = oscutil.msg("/b_setn")
+    m.append(buffer_number)
+    m.append(start_index)
+    m.append(len(values))
+    m.append(values, 'f')
+    return m
+
+def setnChunks(buffer_number,
+               start_index,
+               values,
+               max_size = None):
+    ## As setn, split into as many /b_setn messages as it takes to
+    ## keep each under max_size bytes (default: the largest UDP packet).
+    return oscutil.setnChunks("/b_setn", [buffer_number], start_index, values, max_size)
+
 def zero(buffer_number,
          completion_msg = None):
     m = oscutil.msg("/b_zero")
@@ -0,0 +1,173 @@
+import supercollider.osc as osc
+import supercollider.oscutil as oscutil
+import socket
+import threading
+
+## One scsynth process only uses one core. A Cluster spreads nodes
+## over several scsynth processes (on one machine or many): synthdefs
+## go to every server, each new node goes to the least loaded one,
+## and later messages for a node follow it to its home server.
+##
+##   cluster = Cluster([('localhost', 57110), ('localhost', 57111)])
+##   cluster.broadcast(d_recv([synthdef]))
+##   n = Node("s")
+##   cluster.s_new(n)
+##   cluster.send(n, n.set("freq", 440).n_set())
+##   cluster.n_free(n)
+
+class Endpoint(object):
+    def __init__(self, address):
+        self.address = address
+        self.nodes = set()
+        ## From the last /status.reply, if polled
+        self.synths = None
+        self.avg_cpu = None
+        self.peak_cpu = None
+        ## Our nodes started less those ended since that reply
+        self.since_poll = 0
+
+    def load(self):
+        return {'nodes': len(self.nodes),
+                'synths': self.synths,
+                'avg_cpu': self.avg_cpu,
+                'peak_cpu': self.peak_cpu}
+
+def _resolve(address):
+    ## Replies come from a numeric address, so servers are keyed by one.
+    return (socket.gethostbyname(address[0]), address[1])
+
+class Cluster(object):
+    ## policy 'nodes' places new nodes on the server running the fewest
+    ## of our nodes; 'cpu' on the one with the lowest estimated CPU
+    ## load: the average CPU of the last poll_status(), plus the cost
+    ## of the nodes started (less those ended) since. A node's cost is
+    ## the CPU per synth over all polled servers. A server not polled
+    ## yet is estimated from our nodes on it alone. Ties go by node
+    ## count.
+
+    ## CPU % per node until a poll reports running synths
+    default_node_cpu = 1.0
+
+    def __init__(self, addresses, server = None, policy = 'nodes'):
+        ## If an OSCServer is given, its client sends everything, so
+        ## scsynth's replies reach it; the cluster then handles
+        ## /status.reply (for poll_status()) and /n_end (to forget
+        ## nodes that ended by themselves, see notify()).
+        if policy not in ('nodes', 'cpu'):
+            raise ValueError('unknown placement policy %r' % (policy,))
+        self.policy = policy
+        self.servers = [Endpoint(_resolve(a)) for a in addresses]
+        self._by_address = dict((s.address, s) for s in self.servers)
+        self._homes = {}
+        self._lock = threading.Lock()
+        if server is None:
+            self.client = osc.OSCClient()
+        else:
+            self.client = server.client
+            oscutil.addMsgHandler(server, '/status.reply', self._status_reply)
+            oscutil.addMsgHandler(server, '/n_end', self._n_end)
+
+    def _send(self, server, msg):
+        self.client.sendto(msg, server.address)
+
+    def broadcast(self, msg):
+        ## For /d_recv, /d_load, /notify, /g_new of shared groups etc.
+        for server in self.servers:
+            self._send(server, msg)
+
+    def notify(self, on = True):
+        self.broadcast(oscutil.msg("/notify", int(on)))
+
+    def poll_status(self):
+        ## Asks every server for its load; the replies arrive through
+        ## the OSCServer given to the constructor.
+        self.broadcast(oscutil.msg("/status"))
+
+    def place(self):
+        ## The server the next new node should go to.
+        if self.policy == 'cpu':
+            cost = self.node_cpu()
+            key = lambda s: (self._estimate(s, cost), len(s.nodes))
+        else:
+            key = lambda s: len(s.nodes)
+        return min(self.servers, key = key)
+
+    def node_cpu(self):
+        ## The estimated CPU % of one node.
+        polled = [s for s in self.servers if s.avg_cpu is not None and s.synths]
+        synths = sum(s.synths for s in polled)
+        if not synths:
+            return self.default_node_cpu
+        return sum(s.avg_cpu for s in polled) / float(synths)
+
+    def _estimate(self, server, cost):
+        if server.avg_cpu is None:
+            return len(server.nodes) * cost
+        return max(server.avg_cpu + server.since_poll * cost, 0.0)
+
+    def s_new(self, node, add_action = 0, add_target = 1):
+        ## Starts node on the least loaded server, and returns that
+        ## server's address. add_target must exist on every server
+        ## (the default group 1 does).
+        self._lock.acquire()
+        try:
+            server = self.place()
+            server.nodes.add(node.id)
+            server.since_poll += 1
+            self._homes[node.id] = server
+        finally:
+            self._lock.release()
+        self._send(server, node.s_new(add_action, add_target))
+        return server.address
+
+    def home(self, node):
+        ## The address of the server node (or node id) runs on.
+        return self._home(node).address
+
+    def _home(self, node):
+        node_id = getattr(node, 'id', node)
+        try:
+            return self._homes[node_id]
+        except KeyError:
+            raise KeyError('node %d was not started through this cluster' % node_id)
+
+    def send(self, node, msg):
+        ## Sends msg (e.g. node.n_set()) to the server node runs on.
+        self._send(self._home(node), msg)
+
+    def n_free(self, node):
+        self.send(node, node.n_free())
+        self._forget(node.id)
+
+    def _forget(self, node_id):
+        self._lock.acquire()
+        try:
+            server = self._homes.pop(node_id, None)
+            if server is not None:
+                server.nodes.discard(node_id)
+                server.since_poll -= 1
+        finally:
+            self._lock.release()
+
+    def load(self):
+        ## {(host, port): {'nodes': ..., 'synths': ..., 'avg_cpu': ...,
+        ## 'peak_cpu': ...}} for every server.
+        return dict((s.address, s.load()) for s in self.servers)
+
+    def _status_reply(self, addr, tags, data, client_address):
+        ## /status.reply 1 ugens synths groups synthdefs avg_cpu peak_cpu ...
+        server = self._by_address.get(client_address)
+        if server is not None and len(data) >= 7:
+            self._lock.acquire()
+            try:
+                server.synths = data[2]
+                server.avg_cpu = data[5]
+                server.peak_cpu = data[6]
+                server.since_poll = 0
+            finally:
+                self._lock.release()
+
+    def _n_end(self, addr, tags, data, client_address):
+        server = self._by_address.get(client_address)
+        if server is not None and data and self._homes.get(data[0]) is server:
+            self._forget(data[0])
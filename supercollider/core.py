@@ -1,4 +1,10 @@
 import supercollider.osc as osc
+import supercollider.oscutil as oscutil
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
 import time
 import struct
 
@@ -41,6 +47,62 @@ def compileDefs(synthdefs):
                     eu16(0) ## number of variants
                     ])
 
+_defs_directory = None
+
+def _defsDirectory():
+    ## A private directory for d_recv()'s .scsyndef files, removed at
+    ## exit.
+    global _defs_directory
+    if _defs_directory is None:
+        _defs_directory = tempfile.mkdtemp(prefix = 'scsyndef-')
+        ## scsynth may run as another user
+        os.chmod(_defs_directory, 0755)
+        atexit.register(shutil.rmtree, _defs_directory, True)
+    return _defs_directory
+
+def d_recv(synthdefs, completion_msg = None, max_size = None, directory = None):
+    ## Returns a /d_recv message carrying the compiled synthdefs, or,
+    ## if that would be larger than max_size bytes (default: the
+    ## largest UDP packet), writes them to a .scsyndef file in
+    ## directory (default: a private temp directory, removed at exit)
+    ## and returns a /d_load message for it instead. Sending the same
+    ## synthdef names again replaces their file, so files don't pile up
+    ## over a session. The file must be readable by scsynth, so the
+    ## fallback only works with a server on the same machine (or a
+    ## shared directory).
+    if max_size is None:
+        max_size = osc.OSCClient.max_packet_size
+    data = compileDefs(synthdefs)
+    m = oscutil.msg("/d_recv")
+    m.append(data, 'b')
+    if completion_msg is not None:
+        m.append(completion_msg, 'b')
+    if m.encodedSize() <= max_size:
+        return m
+    if directory is None:
+        directory = _defsDirectory()
+    ## The file is named by a hash of the synthdef names, so a name
+    ## containing '../' can't redirect it. It's written under a new
+    ## random name by mkstemp() (so a symlink planted in a shared
+    ## directory isn't followed) and renamed into place, which leaves
+    ## a file scsynth may still be loading intact.
+    names = '\0'.join(s.name for s in synthdefs)
+    path = os.path.join(directory, hashlib.sha1(names).hexdigest() + '.scsyndef')
+    fd, temp_path = tempfile.mkstemp(suffix = '.tmp', dir = directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            ## scsynth may run as another user
+            os.fchmod(f.fileno(), 0644)
+            f.write(data)
+        os.rename(temp_path, path)
+    except:
+        os.unlink(temp_path)
+        raise
+    m = oscutil.msg("/d_load", path)
+    if completion_msg is not None:
+        m.append(completion_msg, 'b')
+    return m
+
 class MultiChannel(object):
     def __init__(self, specs):
         self.specs = specs
@@ -50,5 +50,23 @@ class Node(object):
         inits = self.inits(controlnamefilter)
         return supercollider.oscutil.msg("/n_set", self.id, *inits)
 
+    def s_new_template(self, controlnames, add_action = AddAction.GROUP_HEAD, add_target = 1):
+        ## Slots are the values of controlnames, in order.
+        frozen = {0: self.synthdef_name, 1: self.id, 2: add_action, 3: add_target}
+        for i in range(len(controlnames)):
+            frozen[4 + i*2] = controlnames[i]
+        return supercollider.oscutil.template("/s_new",
+                                              "siii" + "sf" * len(controlnames),
+                                              frozen)
+
+    def n_set_template(self, controlnames):
+        ## Slots are the values of controlnames, in order.
+        frozen = {0: self.id}
+        for i in range(len(controlnames)):
+            frozen[1 + i*2] = controlnames[i]
+        return supercollider.oscutil.template("/n_set",
+                                              "i" + "sf" * len(controlnames),
+                                              frozen)
+
     def n_free(self):
         return supercollider.oscutil.msg("/n_free", self.id)
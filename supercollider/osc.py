@@ -133,8 +133,11 @@ Original Comments
 > 	- dwh
 """
 
-import math, re, socket, select, string, struct, sys, threading, time, types
-from SocketServer import UDPServer, DatagramRequestHandler, ForkingMixIn, ThreadingMixIn
+import array, asyncore, bisect, collections, copy, errno, heapq, math, multiprocessing, os, Queue, re, socket, select, stat, string, struct, sys, threading, time, types
+from SocketServer import TCPServer, UDPServer, DatagramRequestHandler, ForkingMixIn, ThreadingMixIn
+
+# SO_REUSEPORT, where the platform has it
+_SO_REUSEPORT = getattr(socket, 'SO_REUSEPORT', None)
 
 global version
 version = ("0.3","5b", "$Rev: 5294 $"[6:-2])
@@ -171,6 +174,11 @@ try:
 except ImportError:
 	pass
 
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
 ######
 #
 # OSCMessage classes
@@ -218,6 +226,25 @@ class OSCMessage(object):
 		"""
 		self.address = address
 
+	def _getAddress(self):
+		return self._address
+
+	def _setAddress(self, address):
+		self._address = address
+		self._binary = None
+
+	address = property(_getAddress, _setAddress, doc="The OSC-address")
+
+	def _getTypetags(self):
+		return ',' + ''.join(self._tags)
+
+	typetags = property(_getTypetags, doc="The typetag-string of the appended arguments, including the leading ','")
+
+	def _getMessage(self):
+		return str(self._data)
+
+	message = property(_getMessage, doc="The binary representation of the appended arguments")
+
 	def clear(self, address=""):
 		"""Clear (or set a new) OSC-address and clear any arguments appended so far
 		"""
@@ -227,8 +254,13 @@ class OSCMessage(object):
 	def clearData(self):
 		"""Clear any arguments appended so far
 		"""
-		self.typetags = ","
-		self.message  = ""
+		# The arguments are kept in a growable buffer, with one typetag per argument in a list,
+		# and the offset of each argument in the buffer in another.
+		# The encoded message is only built (once) by getBinary()
+		self._tags = []
+		self._data = bytearray()
+		self._offsets = []
+		self._binary = None
 
 	def append(self, argument, typehint=None):
 		"""Appends data to the message, updating the typetags based on
@@ -240,7 +272,19 @@ class OSCMessage(object):
 		if type(argument) == types.DictType:
 			argument = argument.items()
 		elif isinstance(argument, OSCMessage):
-			raise TypeError("Can only append 'OSCMessage' to 'OSCBundle'")
+			if typehint != 'b':
+				raise TypeError("Can only append 'OSCMessage' to 'OSCBundle', or as a blob (with typehint 'b')")
+			
+			self._appendBlob(argument.getSegments())
+			return
+		
+		if (typehint == 'b') and isinstance(argument, (str, bytearray, buffer, memoryview)):
+			self._appendBlob([argument])
+			return
+		
+		if isinstance(argument, array.array) or ((numpy != None) and isinstance(argument, numpy.ndarray)):
+			if self._appendArray(argument, typehint):
+				return
 		
 		if hasattr(argument, '__iter__'):
 			for arg in argument:
@@ -257,17 +301,112 @@ class OSCMessage(object):
 		else:
 			tag, binary = OSCArgument(argument, typehint)
 
-		self.typetags += tag
-		self.message += binary
+		self._tags.append(tag)
+		self._offsets.append(len(self._data))
+		self._data += binary
+		self._binary = None
+
+	def _appendBlob(self, segments):
+		"""Appends the concatenation of the given buffer-segments as a single blob,
+		copying each segment (once) straight into the message's buffer
+		"""
+		length = _segmentsLength(segments)
+		padded = (length + 3) & ~3
+		
+		self._tags.append('b')
+		self._offsets.append(len(self._data))
+		self._data += struct.pack(">i", padded)	# like OSCBlob(), the size includes the padding
+		for segment in segments:
+			self._data += segment
+		self._data += "\0" * (padded - length)
+		self._binary = None
+		
+	def _appendArray(self, argument, typehint=None):
+		"""Appends all elements of a numpy-array or array.array in one go, as a run of 'i' (int32)
+		or 'f' (float32) arguments. The typehint, if 'i' or 'f', overrides the array's own type.
+		Returns False (appending nothing) for arrays of non-numeric types
+		"""
+		if typehint in ('i', 'f'):
+			tag = typehint
+		elif isinstance(argument, array.array):
+			if argument.typecode in 'fd':
+				tag = 'f'
+			elif argument.typecode in 'bBhHiIlL':
+				tag = 'i'
+			else:
+				return False
+		elif argument.dtype.kind == 'f':
+			tag = 'f'
+		elif argument.dtype.kind in 'iub':
+			tag = 'i'
+		else:
+			return False
 		
-	def getBinary(self):
+		if numpy != None:
+			values = numpy.asarray(argument).ravel()
+			if (tag == 'i') and len(values) and (values.dtype.kind != 'b'):
+				# astype() would silently wrap these around
+				if (values.dtype.kind == 'f') and not numpy.isfinite(values).all():
+					raise OSCError("Can't append non-finite values as int32 ('i') arguments")
+				if (values.min() < -0x80000000) or (values.max() > 0x7fffffff):
+					raise OSCError("Array values out of the int32 range of 'i' arguments")
+			binary = values.astype({'i':'>i4', 'f':'>f4'}[tag]).tostring()
+		else:
+			if (tag == 'i') and isinstance(argument, array.array) and (argument.typecode in 'fd'):
+				argument = [int(v) for v in argument]
+			
+			run = array.array(tag, argument)
+			if sys.byteorder== 'little':
+				run.byteswap()
+			binary = run.tostring()
+		
+		start = len(self._data)
+		self._tags.extend(tag * (len(binary) / 4))
+		self._offsets.extend(xrange(start, start + len(binary), 4))
+		self._data += binary
+		self._binary = None
+
+		return True
+		
+	def getBinary(self, address_map=None):
 		"""Returns the binary representation of the message
+		If an 'address_map' dict is given, and the message's OSC-address appears in it,
+		the address is replaced by the mapped value (see OSCClient.setAddressMap())
 		"""
-		binary = OSCString(self.address)
-		binary += OSCString(self.typetags)
-		binary += self.message
+		if address_map and (self.address in address_map):
+			return OSCAddress(address_map[self.address]) + OSCString(self.typetags) + str(self._data)
 		
-		return binary
+		if self._binary == None:
+			self._binary = OSCAddress(self.address) + OSCString(self.typetags) + str(self._data)
+		
+		return self._binary
+
+	def getSegments(self, address_map=None):
+		"""Returns the binary representation of the message as a list of buffer-segments,
+		which, concatenated, equal getBinary(address_map).
+		The arguments are not copied into the segments, so the segments are only valid
+		until the message is modified.
+		"""
+		if address_map and (self.address in address_map):
+			address = address_map[self.address]
+		elif self._binary != None:
+			return [self._binary]
+		else:
+			address = self.address
+		
+		return [OSCAddress(address) + OSCString(self.typetags), buffer(self._data)]
+
+	def encodedSize(self, address_map=None):
+		"""Returns the length in bytes of getBinary(address_map), without encoding the message
+		"""
+		if address_map and (self.address in address_map):
+			address = address_map[self.address]
+		elif self._binary != None:
+			return len(self._binary)
+		else:
+			address = self.address
+		
+		return _addressSize(address) + ((len(self._tags) + 5) & ~3) + len(self._data)
 
 	def __repr__(self):
 		"""Returns a string containing the decode Message
@@ -282,7 +421,7 @@ class OSCMessage(object):
 	def __len__(self):
 		"""Returns the number of arguments appended so far
 		"""
-		return (len(self.typetags) - 1)
+		return len(self._tags)
 	
 	def __eq__(self, other):
 		"""Return True if two OSCMessages have the same address & content
@@ -290,7 +429,7 @@ class OSCMessage(object):
 		if not isinstance(other, self.__class__):
 			return False
 		
-		return (self.address == other.address) and (self.typetags == other.typetags) and (self.message == other.message)
+		return (self.address == other.address) and (self._tags == other._tags) and (self._data == other._data)
 	
 	def __ne__(self, other):
 		"""Return (not self.__eq__(other))
@@ -332,27 +471,89 @@ class OSCMessage(object):
 		for item in items:
 			self.append(item[1], item[0])
 		
+	def _argument(self, i):
+		"""Returns the (decoded) argument at the given (non-negative) index
+		"""
+		return _readArgumentAt(self._data, self._offsets[i], self._tags[i])
+	
+	def _index(self, i):
+		"""Returns the given argument-index as a non-negative index.
+		Raises IndexError if the index is out of range
+		"""
+		n = len(self._tags)
+		if i < 0:
+			i += n
+		if (i < 0) or (i >= n):
+			raise IndexError("OSCMessage argument index out of range")
+		
+		return i
+	
+	def _simpleSlice(self, i):
+		"""Returns the (start, stop) indices of the argument-index or slice 'i',
+		or None if 'i' is an extended slice (with a step other than 1)
+		"""
+		if type(i) != types.SliceType:
+			i = self._index(i)
+			return (i, i + 1)
+		
+		(start, stop, step) = i.indices(len(self._tags))
+		if step != 1:
+			return None
+		
+		return (start, max(start, stop))
+	
+	def _splice(self, start, stop, msg):
+		"""Replace the arguments from index 'start' up to 'stop' with the arguments
+		of the given OSCMessage, patching the encoded arguments in place
+		"""
+		end = len(self._data)
+		if start < len(self._offsets):
+			data_start = self._offsets[start]
+		else:
+			data_start = end
+		if stop < len(self._offsets):
+			data_stop = self._offsets[stop]
+		else:
+			data_stop = end
+		
+		self._data[data_start:data_stop] = msg._data
+		
+		shift = len(msg._data) - (data_stop - data_start)
+		offsets = [data_start + o for o in msg._offsets]
+		if shift:
+			offsets.extend([o + shift for o in self._offsets[stop:]])
+		else:
+			offsets.extend(self._offsets[stop:])
+		
+		self._offsets[start:] = offsets
+		self._tags[start:stop] = msg._tags
+		self._binary = None
+	
+	def _encapsulate(self, items):
+		"""Returns a new (address-less) message of the same class as this one,
+		containing the given list of (typehint, value) tuples
+		"""
+		msg = self.__class__(self.address)
+		for (typehint, value) in items:
+			msg.append(value, typehint)
+		
+		return msg
+	
 	def values(self):
 		"""Returns a list of the arguments appended so far
 		"""
-		return decodeOSC(self.getBinary())[2:]
+		return _decodeArguments(self._data, self._data, 0, len(self._data), self.typetags, [], True)
 	
 	def tags(self):
 		"""Returns a list of typetags of the appended arguments
 		"""
-		return list(self.typetags.lstrip(','))
+		return list(self._tags)
 	
 	def items(self):
 		"""Returns a list of (typetag, value) tuples for 
 		the arguments appended so far
 		"""
-		out = []
-		values = self.values()
-		typetags = self.tags()
-		for i in range(len(values)):
-			out.append((typetags[i], values[i]))
-			
-		return out
+		return zip(self.tags(), self.values())
 
 	def __contains__(self, val):
 		"""Test if the given value appears in the OSCMessage's arguments
@@ -362,15 +563,21 @@ class OSCMessage(object):
 	def __getitem__(self, i):
 		"""Returns the indicated argument (or slice)
 		"""
-		return self.values()[i]
+		if type(i) == types.SliceType:
+			return [self._argument(j) for j in range(*i.indices(len(self._tags)))]
+		
+		return self._argument(self._index(i))
 
 	def __delitem__(self, i):
 		"""Removes the indicated argument (or slice)
 		"""
-		items = self.items()
-		del items[i]
-			
-		self._reencode(items)
+		indices = self._simpleSlice(i)
+		if indices == None:
+			items = self.items()
+			del items[i]
+			self._reencode(items)
+		else:
+			self._splice(indices[0], indices[1], self.__class__())
 	
 	def _buildItemList(self, values, typehint=None):
 		if isinstance(values, OSCMessage):
@@ -384,7 +591,7 @@ class OSCMessage(object):
 					items.append((typehint, val))
 		elif type(values) == types.TupleType:
 			items = [values[:2]]
-		else:		
+		else:        
 			items = [(typehint, values)]
 			
 		return items
@@ -394,36 +601,34 @@ class OSCMessage(object):
 		'val' can be a single int/float/string, or a (typehint, value) tuple.
 		Or, if 'i' is a slice, a list of these or another OSCMessage.
 		"""
-		items = self.items()
-		
 		new_items = self._buildItemList(val)
 		
 		if type(i) != types.SliceType:
 			if len(new_items) != 1:
 				raise TypeError("single-item assignment expects a single value or a (typetag, value) tuple")
-			
-			new_items = new_items[0]
-			
-		# finally...
-		items[i] = new_items
 		
-		self._reencode(items)
+		indices = self._simpleSlice(i)
+		if indices == None:
+			items = self.items()
+			items[i] = new_items
+			self._reencode(items)
+		else:
+			self._splice(indices[0], indices[1], self._encapsulate(new_items))
 	
 	def setItem(self, i, val, typehint=None):
 		"""Set indicated argument to a new value (with typehint)
 		"""
-		items = self.items()
-		
-		items[i] = (typehint, val)
-			
-		self._reencode(items)
+		i = self._index(i)
+		self._splice(i, i + 1, self._encapsulate([(typehint, val)]))
 		
 	def copy(self):
 		"""Returns a deep copy of this OSCMessage
 		"""
 		msg = self.__class__(self.address)
-		msg.typetags = self.typetags
-		msg.message = self.message
+		msg._tags = self._tags[:]
+		msg._data = self._data[:]
+		msg._offsets = self._offsets[:]
+		msg._binary = self._binary
 		return msg
 	
 	def count(self, val):
@@ -436,35 +641,32 @@ class OSCMessage(object):
 		Raises ValueError if val isn't found
 		"""
 		return self.values().index(val)
-	
+
 	def extend(self, values):
 		"""Append the contents of 'values' to this OSCMessage.
 		'values' can be another OSCMessage, or a list/tuple of ints/floats/strings
 		"""
-		items = self.items() + self._buildItemList(values)
-		
-		self._reencode(items)
+		n = len(self._tags)
+		if type(values) == type(self):
+			self._splice(n, n, values)
+		else:
+			self._splice(n, n, self._encapsulate(self._buildItemList(values)))
 		
 	def insert(self, i, val, typehint = None):
 		"""Insert given value (with optional typehint) into the OSCMessage
 		at the given index.
 		"""
-		items = self.items()
-		
-		for item in reversed(self._buildItemList(val)):
-			items.insert(i, item)
-			
-		self._reencode(items)
+		(i, _, _) = slice(i, i).indices(len(self._tags))
+		self._splice(i, i, self._encapsulate(self._buildItemList(val, typehint)))
 		
 	def popitem(self, i):
 		"""Delete the indicated argument from the OSCMessage, and return it
 		as a (typetag, value) tuple.
 		"""
-		items = self.items()
-		
-		item = items.pop(i)
+		i = self._index(i)
+		item = (self._tags[i], self._argument(i))
 		
-		self._reencode(items)
+		del self[i]
 		
 		return item
 	
@@ -486,22 +688,7 @@ class OSCMessage(object):
 		"""Removes the first argument with the given value from the OSCMessage.
 		Raises ValueError if val isn't found.
 		"""
-		items = self.items()
-		
-		# this is not very efficient...
-		i = 0
-		for (t, v) in items:
-			if (v == val):
-				break
-			i += 1
-		else:
-			raise ValueError("'%s' not in OSCMessage" % str(m))
-		# but more efficient than first calling self.values().index(val),
-		# then calling self.items(), which would in turn call self.values() again...
-		
-		del items[i]
-		
-		self._reencode(items)
+		del self[self.index(val)]
 		
 	def __iter__(self):
 		"""Returns an iterator of the OSCMessage's arguments
@@ -527,7 +714,7 @@ class OSCMessage(object):
 	def itertags(self):
 		"""Returns an iterator of the OSCMessage's arguments' typetags
 		"""
-		return iter(self.tags())
+		return iter(self._tags)
 
 seconds1900To1970 = 2208988800L
 class OSCBundle(OSCMessage):
@@ -544,6 +731,10 @@ class OSCBundle(OSCMessage):
 	  The OSCBundle's 'address' is inherited by any OSCMessage the OSCBundle object creates.
 	  - OSC-bundles have a timetag to tell the receiver when the bundle should be processed.
 	  The default timetag value (0) means 'immediately'
+	
+	The OSCBundle keeps (private copies of) the OSCMessages appended to it, and only encodes
+	them when getBinary() is called. So inspecting, filtering or copying an OSCBundle
+	never needs to decode it again.
 	"""
 	def __init__(self, address="", time=0):
 		"""Instantiate a new OSCBundle.
@@ -552,9 +743,19 @@ class OSCBundle(OSCMessage):
 		The bundle's timetag can be set with the 'time' argument
 		"""
 		super(OSCBundle, self).__init__(address)
-		self.timetag = 0
+		self._ntp = 1L
 		self.setTimeTag(time)
 
+	def _getTimeTag(self):
+		"""Returns the TimeTag in floating seconds since 1900, or 0 for 'immediately'
+		"""
+		if self._ntp <= 1:
+			return 0
+		
+		return self._ntp / 4294967296.0
+
+	timetag = property(_getTimeTag)
+
 	def __str__(self):
 		"""Returns the Bundle's contents (and timetag, if nonzero) as a string.
 		"""
@@ -564,7 +765,7 @@ class OSCBundle(OSCMessage):
 			out = "#bundle ["
 
 		if self.__len__():
-			for val in self.values():
+			for val in self._elements:
 				out += "%s, " % str(val)
 			out = out[:-2]		# strip trailing space and comma
 			
@@ -574,18 +775,70 @@ class OSCBundle(OSCMessage):
 		"""Set or change the OSCBundle's TimeTag
 		In 'Python Time', that's floating seconds since the Epoch
 		"""
-		if time >= 0:
-			self.timetag = time + seconds1900To1970
-	
+		if time > 0:
+			self.setNTPTimeTag(_ntpFromTime(time))
+		elif time == 0:
+			self.setNTPTimeTag(1L)
+
+	def setDelayedTimeTag(self, delta, clock=None):
+		"""Set the OSCBundle's TimeTag to 'delta' seconds from now, as read from
+		the given OSCClock (or the module's default clock)
+		"""
+		self.setNTPTimeTag((clock or defaultClock).ntp(delta))
+
+	def setNTPTimeTag(self, ntp):
+		"""Set the OSCBundle's TimeTag as a 64-bit NTP fixed-point integer
+		(32 bits of seconds since 1900, 32 bits of fraction). 1 means 'immediately'
+		"""
+		self._ntp = long(ntp)
+		self._binary = None
+
+	def getNTPTimeTag(self):
+		"""Return the OSCBundle's TimeTag as a 64-bit NTP fixed-point integer
+		"""
+		return self._ntp
+
 	def getTimeTagStr(self):
 		"""Return the TimeTag as a human-readable string
 		"""
-		fract, secs = math.modf(self.timetag - seconds1900To1970)
+		fract, secs = math.modf(_timeFromNTP(self._ntp))
 		out = time.ctime(secs)[11:19]
 		out += ("%.3f" % fract)[1:]
 		
 		return out
 	
+	def clearData(self):
+		"""Clear any OSCMessages appended so far
+		"""
+		super(OSCBundle, self).clearData()
+		self._elements = []
+
+	def _getMessage(self):
+		return self.getBinary()[16:]
+
+	message = property(_getMessage, doc="The binary representation of the appended OSCMessages")
+
+	def _argument(self, i):
+		"""Returns (a copy of) the OSCMessage at the given (non-negative) index
+		"""
+		return self._elements[i].copy()
+	
+	def _splice(self, start, stop, msg):
+		"""Replace the OSCMessages from index 'start' up to 'stop' with the
+		OSCMessages of the given OSCBundle
+		"""
+		self._elements[start:stop] = msg._elements
+		self._tags[start:stop] = msg._tags
+		self._binary = None
+
+	def _appendElement(self, msg):
+		"""Appends the given OSCMessage (or OSCBundle) as-is, without copying it.
+		Only to be used for messages which are not going to be modified afterwards.
+		"""
+		self._elements.append(msg)
+		self._tags.append('b')
+		self._binary = None
+
 	def append(self, argument, typehint = None):
 		"""Appends data to the bundle, creating an OSCMessage to encapsulate
 		the provided argument unless this is already an OSCMessage.
@@ -596,7 +849,7 @@ class OSCBundle(OSCMessage):
 		  - if 'args' appears in the dict, its value(s) become the OSCMessage's arguments
 		"""
 		if isinstance(argument, OSCMessage):
-			binary = OSCBlob(argument.getBinary())
+			msg = argument.copy()
 		else:
 			msg = OSCMessage(self.address)
 			if type(argument) == types.DictType:
@@ -607,43 +860,95 @@ class OSCBundle(OSCMessage):
 			else:
 				msg.append(argument, typehint)
 			
-			binary = OSCBlob(msg.getBinary())
-
-		self.message += binary
-		self.typetags += 'b'
+		self._appendElement(msg)
 		
-	def getBinary(self):
+	def getBinary(self, address_map=None):
 		"""Returns the binary representation of the message
+		If an 'address_map' dict is given, it is applied to all contained OSCMessages
+		(see OSCMessage.getBinary())
 		"""
-		binary = OSCString("#bundle")
-		binary += OSCTimeTag(self.timetag)
-		binary += self.message
+		if address_map:
+			return self._encode(address_map)
 		
-		return binary
+		if self._binary == None:
+			self._binary = self._encode(None)
+		
+		return self._binary
 
-	def _reencapsulate(self, decoded):
-		if decoded[0] == "#bundle":
-			msg = OSCBundle()
-			msg.setTimeTag(decoded[1])
-			for submsg in decoded[2:]:
-				msg.append(self._reencapsulate(submsg))
-				
-		else:
-			msg = OSCMessage(decoded[0])
-			tags = decoded[1].lstrip(',')
-			for i in range(len(tags)):
-				msg.append(decoded[2+i], tags[i])
+	def getSegments(self, address_map=None):
+		"""Returns the binary representation of the bundle as a list of buffer-segments
+		(see OSCMessage.getSegments())
+		"""
+		if (self._binary != None) and not address_map:
+			return [self._binary]
+		
+		segments = [OSCString("#bundle") + struct.pack('>Q', self._ntp)]
+		for msg in self._elements:
+			element = msg.getSegments(address_map)
+			segments.append(struct.pack(">i", _segmentsLength(element)))
+			segments.extend(element)
+		
+		return segments
+
+	def encodedSize(self, address_map=None):
+		"""Returns the length in bytes of getBinary(address_map), without encoding the bundle
+		"""
+		if (self._binary != None) and not address_map:
+			return len(self._binary)
+		
+		size = 16
+		for msg in self._elements:
+			size += 4 + msg.encodedSize(address_map)
+		
+		return size
+
+	def split(self, max_size, address_map=None):
+		"""Returns a list of OSCBundles, with this bundle's timetag, which together contain
+		this bundle's OSCMessages (in order) and each encode to at most 'max_size' bytes.
+		Contained OSCBundles that are too large are split in turn.
+		Note that the receiver no longer executes the messages as one atomic bundle.
+		Raises OSCError if a single OSCMessage doesn't fit in 'max_size' bytes.
+		"""
+		bundles = []
+		size = max_size
+		for msg in self._elements:
+			msgsize = msg.encodedSize(address_map)
+			if (20 + msgsize <= max_size):
+				parts = [msg]
+			elif isinstance(msg, OSCBundle):
+				parts = msg.split(max_size - 20, address_map)
+			else:
+				raise OSCError("%d-byte OSC-message '%s' doesn't fit in %d bytes" % (msgsize, msg.address, max_size))
+			
+			for part in parts:
+				partsize = 4 + part.encodedSize(address_map)
+				if size + partsize > max_size:
+					bundle = self.__class__(self.address)
+					bundle.setNTPTimeTag(self._ntp)
+					bundles.append(bundle)
+					size = 16
 				
-		return msg
-	
+				bundle._appendElement(part)
+				size += partsize
+		
+		return bundles
+
+	def _encode(self, address_map):
+		"""Returns the binary representation of the message
+		"""
+		binary = [OSCString("#bundle"), struct.pack('>Q', self._ntp)]
+		for msg in self._elements:
+			# encoded OSCMessages are always a multiple of 4 bytes long; no need to pad these blobs
+			element = msg.getBinary(address_map)
+			binary.append(struct.pack(">i", len(element)))
+			binary.append(element)
+		
+		return ''.join(binary)
+
 	def values(self):
-		"""Returns a list of the OSCMessages appended so far
+		"""Returns a list of (copies of) the OSCMessages appended so far
 		"""
-		out = []
-		for decoded in decodeOSC(self.getBinary())[2:]:
-			out.append(self._reencapsulate(decoded))
-			
-		return out
+		return [msg.copy() for msg in self._elements]
 		
 	def __eq__(self, other):
 		"""Return True if two OSCBundles have the same timetag & content
@@ -651,15 +956,135 @@ class OSCBundle(OSCMessage):
 		if not isinstance(other, self.__class__):
 			return False
 		
-		return (self.timetag == other.timetag) and (self.typetags == other.typetags) and (self.message == other.message)
+		return (self._ntp == other._ntp) and (self._elements == other._elements)
 	
 	def copy(self):
 		"""Returns a deep copy of this OSCBundle
 		"""
 		copy = super(OSCBundle, self).copy()
-		copy.timetag = self.timetag
+		copy._ntp = self._ntp
+		copy._elements = self._elements[:]
 		return copy
 
+class OSCTemplate(object):
+	"""Precompiled encoder for OSC-messages which are sent over and over again with the same 'shape'.
+	
+	An OSCTemplate freezes an OSC-address and a typetag-string once, and compiles the
+	layout of the whole message into a single struct.Struct. Encoding a new set of
+	argument-values is then a single Struct.pack() call, returning a ready-to-send binary
+	(see OSCClient.sendBinary()):
+	  >>> t = OSCTemplate("/n_set", ",isf", {1:'freq'})
+	  >>> t.getBinary(1000, 440.0) == oscutil.msg("/n_set", 1000, 'freq', 440.0).getBinary()
+	  True
+	
+	Arguments of variable length ('s' strings and 'b' blobs) must be frozen, by passing their
+	value in the 'frozen' dict of {argument-index:value} pairs. Numeric arguments ('i' and 'f')
+	may be frozen too. The remaining arguments are the template's 'slots', whose values are passed
+	(in order) to getBinary().
+	"""
+	def __init__(self, address, typetags, frozen=None):
+		"""Compile a new OSCTemplate.
+		  - address (string): the OSC-address of the messages
+		  - typetags (string): the typetags of all arguments, with or without the leading ','
+		  - frozen (dict): {argument-index:value} pairs for arguments which never change
+		"""
+		if not typetags.startswith(','):
+			typetags = ',' + typetags
+		
+		if frozen == None:
+			frozen = {}
+		
+		self.address = address
+		self.typetags = typetags
+		self.frozen = frozen
+		
+		fmt = ['>']
+		values = []
+		slots = []
+		const = OSCAddress(address) + OSCString(typetags)
+		for (i, tag) in enumerate(typetags[1:]):
+			if i in frozen:
+				const += OSCTemplate._encodeFrozen(tag, frozen[i])
+				continue
+			
+			if tag not in 'if':
+				raise OSCError("OSCTemplate argument %d of type '%s' must be frozen" % (i, tag))
+			
+			if len(const):
+				fmt.append('%ds' % len(const))
+				values.append(const)
+				const = ""
+			
+			fmt.append(tag)
+			slots.append(len(values))
+			values.append(None)
+		
+		if len(const):
+			fmt.append('%ds' % len(const))
+			values.append(const)
+		
+		self._struct = struct.Struct(''.join(fmt))
+		self._values = values
+		self._slots = slots
+		
+		# the common case: a constant header followed by nothing but slots
+		self._head = values[0]
+		self._simple = (slots == range(1, len(values)))
+	
+	@staticmethod
+	def _encodeFrozen(tag, value):
+		"""Returns the binary representation of a frozen argument
+		"""
+		if tag == 'b':
+			return OSCBlob(value)
+		elif tag in 'ifs':
+			(argtag, binary) = OSCArgument(value, tag)
+			if argtag == tag:
+				return binary
+		
+		raise OSCError("Can't freeze %s as OSC-type '%s'" % (repr(value), tag))
+	
+	def __len__(self):
+		"""Returns the number of (unfrozen) slots in this template
+		"""
+		return len(self._slots)
+	
+	def __str__(self):
+		"""Returns the template's address and typetags as a string.
+		"""
+		return "%s %s (%d slots)" % (self.address, self.typetags, len(self._slots))
+	
+	def getBinary(self, *args):
+		"""Returns the binary representation of the message,
+		with the template's slots filled in by the given argument-values.
+		"""
+		if len(args) != len(self._slots):
+			raise TypeError("OSCTemplate '%s' takes %d arguments (%d given)" % (self.address, len(self._slots), len(args)))
+		
+		if self._simple:
+			return self._struct.pack(self._head, *args)
+		
+		values = self._values[:]
+		for i in range(len(args)):
+			values[self._slots[i]] = args[i]
+		
+		return self._struct.pack(*values)
+	
+	def message(self, *args):
+		"""Returns an OSCMessage equivalent to getBinary(*args)
+		"""
+		msg = OSCMessage(self.address)
+		args = list(args)
+		for (i, tag) in enumerate(self.typetags[1:]):
+			if i in self.frozen:
+				value = self.frozen[i]
+			else:
+				value = args.pop(0)
+			
+			msg.append(value, tag)
+		
+		return msg
+
 ######
 #
 # OSCMessage encoding functions
@@ -675,6 +1100,46 @@ def OSCString(next):
 	OSCstringLength = math.ceil((len(next)+1) / 4.0) * 4
 	return struct.pack(">%ds" % (OSCstringLength), str(next))
 
+def _segmentsLength(segments):
+	"""Returns the total length of a list of buffer-segments
+	"""
+	length = 0
+	for segment in segments:
+		length += len(segment)
+	
+	return length
+
+def joinSegments(segments):
+	"""Concatenates a list of buffer-segments (see OSCMessage.getSegments()) into a
+	single buffer, with a single copy
+	"""
+	if len(segments) == 1:
+		return segments[0]
+	
+	binary = bytearray()
+	for segment in segments:
+		binary += segment
+	
+	return binary
+
+def OSCAddress(address):
+	"""Convert an OSC-address into its binary representation.
+	That's a zero-padded OSC String, or an int32 for integer addresses
+	(like the command-numbers scsynth accepts in place of its command-names)
+	"""
+	if type(address) in IntTypes:
+		return struct.pack(">i", address)
+	
+	return OSCString(address)
+
+def _addressSize(address):
+	"""Returns the length of OSCAddress(address)
+	"""
+	if type(address) in IntTypes:
+		return 4
+	
+	return (len(address) + 4) & ~3
+
 def OSCBlob(next):
 	"""Convert a string into an OSC Blob.
 	An OSC-Blob is a binary encoded block of data, prepended by a 'size' (int32).
@@ -727,17 +1192,94 @@ def OSCArgument(next, typehint=None):
 	return (tag, binary)
 
 def OSCTimeTag(time):
-	"""Convert a time in floating seconds to its
+	"""Convert a time in floating seconds since the Epoch to its
 	OSC binary representation
 	"""
 	if time > 0:
-		fract, secs = math.modf(time)
-		binary = struct.pack('>ll', long(secs), long(fract * 1e9))
+		binary = struct.pack('>Q', _ntpFromTime(time))
 	else:
-		binary = struct.pack('>ll', 0L, 1L)
+		binary = struct.pack('>LL', 0L, 1L)
 
 	return binary
 
+def _ntpFromTime(time):
+	"""Convert a time in floating seconds since the Epoch to a 64-bit NTP
+	fixed-point integer. The fraction is in units of 2**-32 seconds.
+	"""
+	secs = int(math.floor(time))
+	return ((long(secs) + seconds1900To1970) << 32) + long((time - secs) * 4294967296.0)
+
+def _timeFromNTP(ntp):
+	"""Convert a 64-bit NTP fixed-point integer to floating seconds since the Epoch
+	"""
+	return ((ntp >> 32) - seconds1900To1970) + (ntp & 0xFFFFFFFFL) / 4294967296.0
+
+def _monotonicClock():
+	"""Returns the best available monotonic clock function;
+	time.monotonic() where it exists, clock_gettime(CLOCK_MONOTONIC) through ctypes on Linux,
+	or time.time() as a last resort.
+	"""
+	if hasattr(time, 'monotonic'):
+		return time.monotonic
+	
+	try:
+		import ctypes, ctypes.util
+		
+		class timespec(ctypes.Structure):
+			_fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+		
+		librt = ctypes.CDLL(ctypes.util.find_library('rt') or 'librt.so.1', use_errno=True)
+		clock_gettime = librt.clock_gettime
+		clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
+		if clock_gettime(1, ctypes.byref(timespec())) != 0:	# 1 = CLOCK_MONOTONIC
+			return time.time
+		
+		def monotonic():
+			ts = timespec()
+			clock_gettime(1, ctypes.byref(ts))
+			return ts.tv_sec + ts.tv_nsec * 1e-9
+		
+		return monotonic
+	except (ImportError, OSError, AttributeError):
+		return time.time
+
+class OSCClock(object):
+	"""A source of OSC TimeTags which doesn't jump when the wall-clock does.
+	
+	The wall-clock time is read once, as a 64-bit NTP fixed-point integer, and anchored to
+	a monotonic clock reading. TimeTags are then derived from the monotonic clock's
+	progress since the anchor, so the spacing between scheduled bundles is exact
+	(to well below a microsecond) even if the system time is adjusted meanwhile.
+	Call resync() to re-anchor to the wall-clock, e.g. after a known time-change.
+	"""
+	def __init__(self, monotonic=None):
+		"""Instantiate a new OSCClock.
+		'monotonic' is an optional function returning floating seconds from an arbitrary origin
+		"""
+		if monotonic == None:
+			monotonic = _monotonicClock()
+		
+		self.monotonic = monotonic
+		self.resync()
+	
+	def resync(self):
+		"""Re-anchor this clock to the current wall-clock time
+		"""
+		self._origin = self.monotonic()
+		self._anchor = _ntpFromTime(time.time())
+	
+	def ntp(self, delta=0.0):
+		"""Returns the time 'delta' seconds from now as a 64-bit NTP fixed-point integer
+		"""
+		return self._anchor + long((self.monotonic() - self._origin + delta) * 4294967296.0)
+	
+	def time(self, delta=0.0):
+		"""Returns the time 'delta' seconds from now in floating seconds since the Epoch
+		"""
+		return _timeFromNTP(self.ntp(delta))
+
+defaultClock = OSCClock()
+
 ######
 #
 # OSCMessage decoding functions
@@ -787,11 +1329,11 @@ def _readTimeTag(data):
 	"""Tries to interpret the next 8 bytes of the data
 	as a TimeTag.
 	 """
-	high, low = struct.unpack(">ll", data[0:8])
+	high, low = struct.unpack(">LL", data[0:8])
 	if (high == 0) and (low <= 1):
 		time = 0.0
 	else:
-		time = int(high) + float(low / 1e9)
+		time = (high - seconds1900To1970) + low / 4294967296.0
 	rest = data[8:]
 	return (time, rest)
 
@@ -825,57 +1367,196 @@ def _readDouble(data):
 
 	return (double, rest)
 
-def decodeOSC(data):
-	"""Converts a binary OSC message to a Python list. 
+# Splits a typetag-string into runs of same-typed numeric arguments, and single other arguments
+_typetagRuns = re.compile(r"i+|f+|d+|.")
+
+# The size (in bytes) of the numeric OSC-types
+_numericSizes = {'i':4, 'f':4, 'd':8}
+
+def _readStringAt(data, offset, end=None):
+	"""Reads the (null-terminated) string starting at the given offset, and ending before 'end'.
+	Returns a (string, offset of the next item) tuple
+	"""
+	if end == None:
+		end = len(data)
+	
+	null = data.find("\0", offset, end)
+	if null < 0:
+		raise OSCError("Unterminated OSC-string at offset %d" % offset)
+	
+	return (str(data[offset:null]), offset + ((null - offset) / 4 + 1) * 4)
+
+def _checkLength(offset, size, end):
+	"""Raises OSCError if the 'size' bytes at the given offset don't end before 'end'
+	"""
+	if offset + size > end:
+		raise OSCError("Truncated OSC-packet: %d bytes at offset %d overrun its end at %d" % (size, offset, end))
+
+# The numpy dtypes of the numeric OSC-types
+_numericDTypes = {'i':'>i4', 'f':'>f4', 'd':'>f8'}
+
+def _decodeAt(data, view, offset, end, copy_blobs, min_array_run=0):
+	"""Decodes the OSC-packet occupying data[offset:end] into a Python list.
+	'data' is the packet's underlying string, and 'view' a memoryview of it.
+	Nothing is sliced off 'data' except the decoded strings & (if copy_blobs is True) blobs.
+	If min_array_run > 0, runs of at least that many same-typed numeric arguments are
+	decoded into a single numpy-array, which is a view of 'data'.
 	"""
-	table = {"i":_readInt, "f":_readFloat, "s":_readString, "b":_readBlob, "d":_readDouble}
 	decoded = []
-	address,  rest = _readString(data)
-	if address.startswith(","):
+	_checkLength(offset, 4, end)
+	if (data[offset:offset + 1] == "\0") and struct.unpack_from(">i", view, offset)[0]:
+		# an integer address (e.g. a scsynth command-number). An all-zero address is an empty string
+		address = struct.unpack_from(">i", view, offset)[0]
+		offset += 4
+	else:
+		address, offset = _readStringAt(data, offset, end)
+
+	if (type(address) in types.StringTypes) and address.startswith(","):
 		typetags = address
 		address = ""
 	else:
 		typetags = ""
 
 	if address == "#bundle":
-		time, rest = _readTimeTag(rest)
+		_checkLength(offset, 8, end)
+		time = _readTimeTag(str(data[offset:offset + 8]))[0]
+		offset += 8
 		decoded.append(address)
 		decoded.append(time)
-		while len(rest)>0:
-			length, rest = _readInt(rest)
-			decoded.append(decodeOSC(rest[:length]))
-			rest = rest[length:]
-
-	elif len(rest)>0:
+		while offset < end:
+			_checkLength(offset, 4, end)
+			length = struct.unpack_from(">i", view, offset)[0]
+			offset += 4
+			_checkLength(offset, length, end)
+			decoded.append(_decodeAt(data, view, offset, offset + length, copy_blobs, min_array_run))
+			offset += length
+
+	elif offset < end:
 		if not len(typetags):
-			typetags, rest = _readString(rest)
+			typetags, offset = _readStringAt(data, offset, end)
 		decoded.append(address)
 		decoded.append(typetags)
-		if typetags.startswith(","):
-			for tag in typetags[1:]:
-				value, rest = table[tag](rest)
-				decoded.append(value)
-		else:
-			raise OSCError("OSCMessage's typetag-string lacks the magic ','")
+		_decodeArguments(data, view, offset, end, typetags, decoded, copy_blobs, min_array_run)
 
 	return decoded
 
-######
-#
-# Utility functions
-#
-######
+def _decodeArguments(data, view, offset, end, typetags, decoded, copy_blobs, min_array_run=0):
+	"""Decodes the arguments described by 'typetags', found in data[offset:end]
+	and appends them to the 'decoded' list. Returns 'decoded'.
+	(see _decodeAt())
+	"""
+	if not typetags.startswith(","):
+		raise OSCError("OSCMessage's typetag-string lacks the magic ','")
+	
+	for run in _typetagRuns.findall(typetags, 1):
+		tag = run[0]
+		if tag in _numericSizes:
+			_checkLength(offset, len(run) * _numericSizes[tag], end)
+		
+		if (tag in _numericSizes) and min_array_run and (len(run) >= min_array_run):
+			values = numpy.frombuffer(data, _numericDTypes[tag], len(run), offset)
+			values.setflags(write=False)	# a view of a bytearray would be writable
+			decoded.append(values)
+			offset += len(run) * _numericSizes[tag]
+		elif tag in _numericSizes:
+			decoded.extend(struct.unpack_from(">%d%s" % (len(run), tag), view, offset))
+			offset += len(run) * _numericSizes[tag]
+		elif tag == 's':
+			value, offset = _readStringAt(data, offset, end)
+			decoded.append(value)
+		elif tag == 'b':
+			_checkLength(offset, 4, end)
+			length = struct.unpack_from(">i", view, offset)[0]
+			offset += 4
+			_checkLength(offset, length, end)
+			if copy_blobs:
+				decoded.append(str(data[offset:offset + length]))
+			else:
+				decoded.append(view[offset:offset + length])
+			offset += (length + 3) & ~3
+		elif tag == 't':
+			_checkLength(offset, 8, end)
+			decoded.append(_readTimeTag(str(data[offset:offset + 8]))[0])
+			offset += 8
+		else:
+			raise OSCError("Unsupported OSC-typetag '%s'" % tag)
 
-def hexDump(bytes):
-	""" Useful utility; prints the string in hexadecimal.
+	return decoded
+
+def _readArgumentAt(data, offset, tag):
+	"""Decodes the single argument of the given type found at data[offset:]
 	"""
-	print "byte   0  1  2  3  4  5  6  7  8  9  A  B  C  D  E  F"
+	if tag in _numericSizes:
+		return struct.unpack_from(">" + tag, data, offset)[0]
+	elif tag == 's':
+		return _readStringAt(data, offset)[0]
+	elif tag == 'b':
+		length = struct.unpack_from(">i", data, offset)[0]
+		return str(data[offset + 4:offset + 4 + length])
+	elif tag == 't':
+		return _readTimeTag(str(data[offset:offset + 8]))[0]
+	
+	raise OSCError("Unsupported OSC-typetag '%s'" % tag)
 
-	num = len(bytes)
-	for i in range(num):
-		if (i) % 16 == 0:
-			 line = "%02X0 : " % (i/16)
-		line += "%02X " % ord(bytes[i])
+def _checkArrayRun(min_array_run):
+	"""Raises OSCError if decoding into numpy-arrays is requested, but numpy isn't available
+	"""
+	if min_array_run and (numpy == None):
+		raise OSCError("Decoding numeric runs into arrays requires numpy")
+
+def decodeOSCBuffer(data, offset=0, end=None, min_array_run=0):
+	"""Converts a binary OSC message (or the part of it between 'offset' and 'end')
+	to a Python list, without copying the packet data.
+	Blobs are returned as memoryview-slices of 'data'.
+	'data' may be a string, a bytearray or a memoryview (which gets copied once,
+	because memoryviews can't be searched for the end of OSC-strings)
+	If 'min_array_run' is given, runs of at least that many consecutive 'i', 'f' or 'd' arguments
+	are returned as a single numpy-array (a read-only view of 'data') instead of as separate values.
+	"""
+	_checkArrayRun(min_array_run)
+	
+	if isinstance(data, memoryview):
+		view = data
+		data = view.tobytes()
+	else:
+		view = memoryview(data)
+	
+	if end == None:
+		end = len(data)
+	
+	try:
+		return _decodeAt(data, view, offset, end, False, min_array_run)
+	except struct.error, e:
+		raise OSCError("Malformed OSC-packet: %s" % str(e))
+
+def decodeOSC(data, min_array_run=0):
+	"""Converts a binary OSC message to a Python list. 
+	If 'min_array_run' is given, runs of at least that many consecutive 'i', 'f' or 'd' arguments
+	are returned as a single numpy-array instead of as separate values.
+	"""
+	_checkArrayRun(min_array_run)
+	
+	try:
+		return _decodeAt(data, memoryview(data), 0, len(data), True, min_array_run)
+	except struct.error, e:
+		raise OSCError("Malformed OSC-packet: %s" % str(e))
+
+######
+#
+# Utility functions
+#
+######
+
+def hexDump(bytes):
+	""" Useful utility; prints the string in hexadecimal.
+	"""
+	print "byte   0  1  2  3  4  5  6  7  8  9  A  B  C  D  E  F"
+
+	num = len(bytes)
+	for i in range(num):
+		if (i) % 16 == 0:
+			 line = "%02X0 : " % (i/16)
+		line += "%02X " % ord(bytes[i])
 		if (i+1) % 16 == 0:
 			print "%s: %s" % (line, repr(bytes[i-15:i+1]))
 			line = ""
@@ -979,6 +1660,214 @@ def parseUrlStr(url):
 	
 	return ((host, port), prefix)
 
+######
+#
+# Send-path instrumentation
+#
+######
+
+class OSCHistogram(object):
+	"""A histogram of durations (in seconds), with exponentially spaced buckets.
+	Bucket i counts the values up to bounds[i] (and above bounds[i - 1]); the last bucket counts the rest.
+	"""
+	# 1 microsecond to about 1 second, doubling
+	default_bounds = tuple([1e-6 * 2 ** i for i in range(21)])
+	
+	def __init__(self, bounds=None):
+		if bounds == None:
+			bounds = self.default_bounds
+		
+		self.bounds = tuple(bounds)
+		self.reset()
+	
+	def reset(self):
+		self.counts = [0] * (len(self.bounds) + 1)
+		self.count = 0
+		self.sum = 0.0
+		self.min = None
+		self.max = None
+	
+	def add(self, value):
+		self.counts[bisect.bisect_left(self.bounds, value)] += 1
+		self.count += 1
+		self.sum += value
+		if (self.min == None) or (value < self.min):
+			self.min = value
+		if (self.max == None) or (value > self.max):
+			self.max = value
+	
+	def asDict(self):
+		"""Returns {'count', 'sum', 'min', 'max', 'buckets'}, where 'buckets' is a list of
+		(upper bound, count) pairs, the last having upper bound None
+		"""
+		return {'count': self.count, 'sum': self.sum, 'min': self.min, 'max': self.max,
+			'buckets': zip(self.bounds + (None,), self.counts)}
+
+class OSCSendStats(object):
+	"""Counters & histograms for the packets sent to one address (or to all addresses)
+	"""
+	def __init__(self, bounds=None):
+		self.packets = 0
+		self.messages = 0
+		self.bytes = 0
+		self.errors = 0
+		self.dropped = 0
+		self.encode_time = OSCHistogram(bounds)
+		self.wait_time = OSCHistogram(bounds)
+	
+	def asDict(self):
+		return {'packets': self.packets, 'messages': self.messages, 'bytes': self.bytes,
+			'errors': self.errors, 'dropped': self.dropped,
+			'encode_time': self.encode_time.asDict(), 'wait_time': self.wait_time.asDict()}
+
+def _listMessages(msg, messages=None):
+	"""Returns a list of the OSCMessages in the given OSCMessage or (nested) OSCBundle
+	"""
+	if messages == None:
+		messages = []
+	
+	if not isinstance(msg, OSCBundle):
+		messages.append(msg)
+	else:
+		for m in msg._elements:
+			if isinstance(m, OSCMessage):
+				_listMessages(m, messages)
+	
+	return messages
+
+def _addressKey(address):
+	"""Returns the given (host, port) tuple (or socket-path) as a 'host:port' string (or the path)
+	"""
+	if type(address) == types.TupleType:
+		return "%s:%d" % address[:2]
+	
+	return str(address)
+
+class OSCStats(object):
+	"""Records what OSCClients send: per remote address, the number of packets, messages & bytes,
+	histograms of the time spent encoding packets & waiting for the socket to send them,
+	and the number of sends that failed ('errors') or timed out ('dropped').
+	Per OSC-address (e.g. '/n_set'), it counts the messages sent & their encoded bytes
+	(not counting the bundles around them).
+	
+	Instrumentation is off unless an OSCStats is given to a client (see OSCClient.setStats());
+	several clients may share one OSCStats.
+	
+	  stats = OSCStats()
+	  client.setStats(stats)
+	  ...
+	  exporter.publish(stats.asDict())
+	
+	Trace-callbacks registered with addTrace() are called after every send, with arguments
+	(address, packet, size, encode_time, wait_time, error), where 'error' is None
+	if the send succeeded. Callbacks are called from the sending thread, so should be quick.
+	"""
+	def __init__(self, bounds=None, clock=None):
+		"""Instantiate an OSCStats.
+		  - bounds (list): the upper bounds (in seconds) of the histogram-buckets (see OSCHistogram)
+		  - clock: a function returning floating seconds, used to time encoding & sending
+		  (defaults to the monotonic clock of OSCClock)
+		"""
+		if clock == None:
+			clock = defaultClock.monotonic
+		
+		self.bounds = bounds
+		self.clock = clock
+		self.traces = []
+		self._lock = threading.Lock()
+		self.reset()
+	
+	def reset(self):
+		"""Clear all counters & histograms
+		"""
+		self._lock.acquire()
+		try:
+			self.total = OSCSendStats(self.bounds)
+			self.addresses = {}
+			self.osc_addresses = {}
+		finally:
+			self._lock.release()
+	
+	def addTrace(self, callback):
+		"""Register a trace-callback (see above)
+		"""
+		self.traces = self.traces + [callback]
+	
+	def removeTrace(self, callback):
+		"""Unregister a trace-callback
+		"""
+		self.traces = [t for t in self.traces if t != callback]
+	
+	def _address(self, address):
+		key = _addressKey(address)
+		try:
+			return self.addresses[key]
+		except KeyError:
+			stats = self.addresses[key] = OSCSendStats(self.bounds)
+			return stats
+	
+	def record(self, address, packet, size, encode_time, wait_time, address_map=None):
+		"""Record a successful send of the given packet (an OSCMessage or OSCBundle) of 'size' bytes.
+		'encode_time' may be None for a packet encoded once and sent to several addresses;
+		it is then recorded with the first one only.
+		'address_map' is the sending client's (see OSCClient.setAddressMap()), with which the packet was encoded.
+		"""
+		messages = _listMessages(packet)
+		self._lock.acquire()
+		try:
+			for msg in messages:
+				try:
+					counts = self.osc_addresses[msg.address]
+				except KeyError:
+					counts = self.osc_addresses[msg.address] = [0, 0]
+				
+				counts[0] += 1
+				counts[1] += msg.encodedSize(address_map)
+			
+			for stats in (self.total, self._address(address)):
+				stats.packets += 1
+				stats.messages += len(messages)
+				stats.bytes += size
+				if encode_time != None:
+					stats.encode_time.add(encode_time)
+				stats.wait_time.add(wait_time)
+		finally:
+			self._lock.release()
+		
+		for trace in self.traces:
+			trace(address, packet, size, encode_time, wait_time, None)
+	
+	def error(self, address, packet, error, dropped=False):
+		"""Record a failed send of the given packet. 'dropped' is True if the send timed out.
+		"""
+		self._lock.acquire()
+		try:
+			for stats in (self.total, self._address(address)):
+				if dropped:
+					stats.dropped += 1
+				else:
+					stats.errors += 1
+		finally:
+			self._lock.release()
+		
+		for trace in self.traces:
+			trace(address, packet, 0, None, None, error)
+	
+	def asDict(self):
+		"""Returns all counters & histograms as a dict:
+		{'total': {...}, 'addresses': {'host:port': {...}, ...}}, with the values of each
+		as returned by OSCSendStats.asDict(), and
+		'osc_addresses': {'/osc/address': {'messages': ..., 'bytes': ...}, ...}
+		"""
+		self._lock.acquire()
+		try:
+			return {'total': self.total.asDict(),
+				'addresses': dict([(key, stats.asDict()) for (key, stats) in self.addresses.items()]),
+				'osc_addresses': dict([(key, {'messages': messages, 'bytes': size})
+					for (key, (messages, size)) in self.osc_addresses.items()])}
+		finally:
+			self._lock.release()
+
 ######
 #
 # OSCClient class
@@ -990,6 +1879,18 @@ class OSCClient(object):
 	"""
 	# set outgoing socket buffer size
 	sndbuf_size = 4096 * 8
+	
+	# the most buffer-segments to pass to a single sendmsg() call (IOV_MAX on most systems)
+	max_segments = 1024
+	
+	# the largest UDP payload; larger bundles are split, larger messages refused
+	max_packet_size = 65507
+	
+	# the socket family of the Client's own socket
+	address_family = socket.AF_INET
+	
+	# the OSCStats recording what this Client sends, if any
+	stats = None
 
 	def __init__(self, server=None):
 		"""Construct an OSC Client.
@@ -1004,7 +1905,7 @@ class OSCClient(object):
 		self.socket = None
 		
 		if server == None:
-			self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+			self.socket = socket.socket(self.address_family, socket.SOCK_DGRAM)
 			self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf_size)
 			self._fd = self.socket.fileno()
 
@@ -1013,7 +1914,22 @@ class OSCClient(object):
 			self.setServer(server)
 
 		self.client_address = None
+		self.address_map = None
 		
+	def setAddressMap(self, address_map):
+		"""Set a dict of {OSC-address:replacement} pairs, applied to the OSC-address
+		of every message sent by this Client. Replacements may be integers, e.g. to send
+		scsynth command-numbers instead of command-names (see oscutil.commands)
+		Set to None to send all OSC-addresses as they are.
+		"""
+		self.address_map = address_map
+
+	def setStats(self, stats):
+		"""Set an OSCStats to record what this Client sends (see OSCStats),
+		or None to turn instrumentation off.
+		"""
+		self.stats = stats
+
 	def setServer(self, server):
 		"""Associate this Client with given server.
 		The Client will send from the Server's socket.
@@ -1096,7 +2012,7 @@ class OSCClient(object):
 			self.client_address = None
 			raise OSCClientError("SocketError: %s" % str(e))
 		
-		if self.server != None:
+		if (self.server != None) and (type(address) == types.TupleType):
 			self.server.return_port = address[1]
 
 	def sendto(self, msg, address, timeout=None):
@@ -1105,24 +2021,100 @@ class OSCClient(object):
 		  - address:  (host, port) tuple specifing remote server to send the message to
 		  - timeout:  A timeout value for attempting to send. If timeout == None,
 		  	this call blocks until socket is available for writing. 
-		Raises OSCClientError when timing out while waiting for the socket. 
+		Raises OSCClientTimeout (an OSCClientError) when timing out while waiting for the socket. 
 		"""
 		if not isinstance(msg, OSCMessage):
 			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
 
-		ret = select.select([],[self._fd], [], timeout)
-		try:
-			ret[1].index(self._fd)
-		except:
-			# for the very rare case this might happen
-			raise OSCClientError("Timed out waiting for file descriptor")
+		if self.stats != None:
+			self._sendInstrumented(msg, address, timeout)
+			return
+
+		for packet in _splitPacket(msg, self.max_packet_size, self.address_map):
+			self.sendBinary(packet.getSegments(self.address_map), address, timeout)
+
+	def _sendInstrumented(self, msg, address, timeout):
+		"""Send the given OSCMessage (see sendto()), recording the send with this Client's OSCStats
+		"""
+		stats = self.stats
+		clock = stats.clock
+		if address == None:
+			# connected; by connect(), or by whoever set up the socket
+			stat_address = self.client_address or self.address()
+		else:
+			stat_address = address
 		
 		try:
-			self.socket.connect(address)
-			self.socket.sendall(msg.getBinary())
+			packets = _splitPacket(msg, self.max_packet_size, self.address_map)
+		except OSCClientError, e:
+			stats.error(stat_address, msg, e)
+			raise
+		
+		for packet in packets:
+			start = clock()
+			segments = packet.getSegments(self.address_map)
+			encoded = clock()
+			try:
+				self.sendBinary(segments, address, timeout)
+			except (OSCClientError, socket.error), e:
+				stats.error(stat_address, packet, e, dropped=isinstance(e, OSCClientTimeout))
+				raise
+			
+			stats.record(stat_address, packet, _segmentsLength(segments), encoded - start, clock() - encoded,
+				self.address_map)
+
+	def _sendPacket(self, binary):
+		"""Send a binary OSC-packet, or a list of buffer-segments making up an OSC-packet,
+		on the (connected) socket. Segments are passed to the kernel as-is (scatter-gather)
+		where the socket supports sendmsg(), and concatenated otherwise.
+		"""
+		if type(binary) != types.ListType:
+			self.socket.sendall(binary)
+		elif hasattr(self.socket, 'sendmsg') and (len(binary) <= self.max_segments):
+			self.socket.sendmsg(binary)
+		else:
+			self.socket.sendall(joinSegments(binary))
+
+	def sendBinary(self, binary, address=None, timeout=None):
+		"""Send an already-encoded OSC-packet (as returned by OSCMessage.getBinary() or OSCTemplate.getBinary())
+		  - binary:  the binary OSC-packet to be sent, or a list of buffer-segments (see OSCMessage.getSegments())
+		  - address:  (host, port) tuple specifing remote server to send the packet to.
+			If address == None, the packet is sent to the server this Client is connected to.
+		  - timeout:  A timeout value for attempting to send. If timeout == None,
+			  this call blocks until socket is available for writing. 
+		Raises OSCClientTimeout (an OSCClientError) when timing out while waiting for the socket. 
+		"""
+		if timeout != None:
+			# without a timeout, the (blocking) send itself waits for the socket
+			ret = select.select([],[self._fd], [], timeout)
+			try:
+				ret[1].index(self._fd)
+			except:
+				# for the very rare case this might happen
+				raise OSCClientTimeout("Timed out waiting for file descriptor")
+		
+		if address == None:
+			try:
+				self._sendPacket(binary)
+			except socket.error, e:
+				if e[0] in (7, 65):	# 7 = 'no address associated with nodename',  65 = 'no route to host'
+					raise e
+				else:
+					raise OSCClientError("while sending: %s" % str(e))
 			
+			return
+		
+		try:
 			if self.client_address:
+				# some platforms refuse sendto() on a connected socket
+				self.socket.connect(address)
+				self._sendPacket(binary)
 				self.socket.connect(self.client_address)
+			else:
+				if type(binary) == types.ListType:
+					binary = joinSegments(binary)
+				
+				self.socket.sendto(binary, address)
 			
 		except socket.error, e:
 			if e[0] in (7, 65):	# 7 = 'no address associated with nodename',  65 = 'no route to host'
@@ -1136,26 +2128,845 @@ class OSCClient(object):
 		  - msg:  OSCMessage (or OSCBundle) to be sent
 		  - timeout:  A timeout value for attempting to send. If timeout == None,
 		  	this call blocks until socket is available for writing. 
-		Raises OSCClientError when timing out while waiting for the socket,
+		Raises OSCClientTimeout (an OSCClientError) when timing out while waiting for the socket,
 		or when the Client isn't connected to a remote server.
 		"""
 		if not isinstance(msg, OSCMessage):
 			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
 
-		ret = select.select([],[self._fd], [], timeout)
+		if self.stats != None:
+			self._sendInstrumented(msg, None, timeout)
+			return
+
+		for packet in _splitPacket(msg, self.max_packet_size, self.address_map):
+			self.sendBinary(packet.getSegments(self.address_map), None, timeout)
+
+def _splitPacket(msg, max_size, address_map=None):
+	"""Returns a list of OSCMessages and/or OSCBundles, which each encode to at most 'max_size' bytes,
+	to send in place of the given OSCMessage or OSCBundle. Oversized bundles are split
+	(see OSCBundle.split()), but oversized messages can't be; these raise OSCClientError.
+	"""
+	if msg.encodedSize(address_map) <= max_size:
+		return [msg]
+	
+	if isinstance(msg, OSCBundle):
 		try:
-			ret[1].index(self._fd)
+			return msg.split(max_size, address_map)
+		except OSCError, e:
+			raise OSCClientError(str(e))
+	
+	raise OSCClientError("%d-byte OSC-message '%s' is larger than the %d-byte packet limit" % (msg.encodedSize(address_map), msg.address, max_size))
+
+class OSCAsyncClient(asyncore.dispatcher):
+	"""Non-blocking OSC Client, driven by an asyncore event-loop.
+	Sending never waits for the socket: a packet is passed to the kernel straight away when
+	there is room for it, and queued otherwise, to be sent (in order) when the event-loop
+	finds the socket writable. Packets received on the socket (e.g. replies from scsynth)
+	are decoded and passed to the 'callback', if one is set.
+	
+	Any number of OSCAsyncClients (and other asyncore dispatchers) can share one event-loop,
+	so a single thread can drive several servers:
+	
+	  client = OSCAsyncClient(('localhost', 57110))
+	  client.send(msg("/s_new", "default", 1000, 0, 1))
+	  client.send_at(msg("/n_free", 1000), time.time() + 2.0)
+	  asyncore.loop()
+	"""
+	def __init__(self, address=None, callback=None, map=None):
+		"""Construct an asynchronous OSC Client.
+		  - address ((host, port) tuple): the default remote server to send to.
+		  - callback:  a function called as callback(decoded, source_address)
+		  for every OSC-packet received. Malformed packets, and exceptions raised by the callback,
+		  are reported through handle_packet_error()
+		  - map:  the asyncore socket-map this client joins (default: asyncore's global map)
+		"""
+		asyncore.dispatcher.__init__(self, map=map)
+		self.create_socket(socket.AF_INET, socket.SOCK_DGRAM)
+		self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, OSCClient.sndbuf_size)
+		# datagram sockets have no connection to wait for
+		self.connected = True
+		
+		self.client_address = address
+		self.callback = callback
+		self.address_map = None
+		self.max_packet_size = OSCClient.max_packet_size
+		self._queue = collections.deque()
+	
+	def setAddressMap(self, address_map):
+		"""Set a dict of {OSC-address:replacement} pairs, applied to the OSC-address
+		of every message sent by this Client (see OSCClient.setAddressMap())
+		"""
+		self.address_map = address_map
+	
+	def pending(self):
+		"""Returns the number of packets waiting for the socket to become writable
+		"""
+		return len(self._queue)
+	
+	def sendBinary(self, binary, address=None):
+		"""Send an already-encoded OSC-packet, or queue it if the socket isn't writable.
+		  - address:  (host, port) tuple specifing remote server to send the packet to.
+			If address == None, the packet is sent to the Client's default address.
+		"""
+		if address == None:
+			address = self.client_address
+			if address == None:
+				raise OSCClientError("No address to send to")
+		
+		if type(binary) == types.ListType:
+			binary = joinSegments(binary)
+		
+		if self._queue or not self._sendto(binary, address):
+			self._queue.append((binary, address))
+	
+	def send(self, msg, address=None):
+		"""Send the given OSCMessage (or OSCBundle) without blocking.
+		  - address:  (host, port) tuple specifing remote server to send the message to.
+			If address == None, the message is sent to the Client's default address.
+		"""
+		if not isinstance(msg, OSCMessage):
+			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
+		
+		for packet in _splitPacket(msg, self.max_packet_size, self.address_map):
+			self.sendBinary(packet.getBinary(self.address_map), address)
+	
+	def send_at(self, msg, time, address=None):
+		"""Send the given OSCMessage (or OSCBundle) in a bundle timetagged with the given time,
+		in floating seconds since the Epoch, so the receiver executes it at that time.
+		Use defaultClock.time(delta) for times that don't follow wall-clock jumps.
+		"""
+		if not isinstance(msg, OSCMessage):
+			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
+		
+		bundle = OSCBundle(time=time)
+		bundle._appendElement(msg)
+		self.send(bundle, address)
+	
+	def _sendto(self, binary, address):
+		"""Returns False if the socket has no room for the packet
+		"""
+		try:
+			self.socket.sendto(binary, address)
+		except socket.error, e:
+			if e[0] in (errno.EAGAIN, errno.EWOULDBLOCK, errno.ENOBUFS):
+				return False
+			
+			raise OSCClientError("while sending to %s: %s" % (str(address), str(e)))
+		
+		return True
+	
+	def writable(self):
+		return len(self._queue) > 0
+	
+	def handle_write(self):
+		while self._queue:
+			binary, address = self._queue[0]
+			if not self._sendto(binary, address):
+				return
+			
+			self._queue.popleft()
+	
+	def handle_read(self):
+		try:
+			data, address = self.socket.recvfrom(65536)
+		except socket.error, e:
+			if e[0] in (errno.EAGAIN, errno.EWOULDBLOCK, errno.ECONNREFUSED):
+				# ECONNREFUSED reports an earlier packet sent to a port nobody listens on
+				return
+			
+			raise
+		
+		if self.callback != None:
+			try:
+				self.callback(decodeOSC(data), address)
+			except Exception:
+				self.handle_packet_error(data, address)
+	
+	def handle_packet_error(self, data, address):
+		"""Called (from within the except-clause) when a received packet can't be decoded,
+		or the callback raises. Prints the traceback; unlike handle_error(), it keeps the client open.
+		"""
+		import traceback
+		print >>sys.stderr, "Exception handling an OSC-packet from %s:" % str(address)
+		traceback.print_exc()
+	
+	def handle_connect(self):
+		pass
+
+class OSCCoalescer(object):
+	"""Gathers OSCMessages sent through it into bundles, so a dense stream of small messages
+	(e.g. an /n_set per parameter change) goes out as a few datagrams instead of one each.
+	
+	Messages are collected until one of these happens, and then sent as one (untimed) bundle:
+	  - adding the next message would make the bundle larger than 'mtu' bytes
+	  - 'window' seconds have passed since the first message was collected
+	  - a message is sent with urgent=True
+	  - flush() is called, e.g. at the end of each 'tick' of a sequencer.
+	  Used as a context-manager, the coalescer flushes when the with-block ends:
+	  
+		coalescer = OSCCoalescer(client)
+		with coalescer:
+			for node in nodes:
+				coalescer.send(node.set("freq", f).n_set())
+	
+	Any client with a sendBinary(binary, address) method will do (OSCClient, OSCAsyncClient).
+	The coalescer is thread-safe.
+	"""
+	# the largest UDP payload that fits an Ethernet frame, without IP fragmentation
+	mtu = 1472
+	
+	def __init__(self, client, mtu=None, window=None, address=None):
+		"""Construct a coalescer, sending through the given client.
+		  - mtu:  the largest datagram to send, in bytes (default 1472)
+		  - window:  the longest time in seconds a message is held back for,
+		  or None to hold messages until the bundle is full or flushed.
+		  - address:  the (host, port) tuple to send to, or None to send where the client sends.
+		"""
+		self.client = client
+		if mtu != None:
+			self.mtu = mtu
+		
+		self.window = window
+		self.address = address
+		
+		self._pending = []
+		self._size = 0
+		self._timer = None
+		# counts the bundles taken, so a window-timer firing after its bundle was sent does nothing
+		self._generation = 0
+		self._lock = threading.Lock()
+		# held while sending, without holding _lock, so datagrams go out in the order they were taken
+		self._send_lock = threading.Lock()
+	
+	def __enter__(self):
+		return self
+	
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.flush()
+	
+	def pending(self):
+		"""Returns the number of messages collected but not sent yet
+		"""
+		return len(self._pending)
+	
+	def send(self, msg, urgent=False):
+		"""Add the given OSCMessage (or OSCBundle) to the current bundle.
+		If 'urgent' is True, the current bundle (including this message) is sent immediately.
+		"""
+		if not isinstance(msg, OSCMessage):
+			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
+		
+		binary = msg.getBinary(getattr(self.client, 'address_map', None))
+		outgoing = []
+		self._lock.acquire()
+		try:
+			if self._size + 4 + len(binary) > self.mtu:
+				outgoing.append(self._take())
+			
+			if 20 + len(binary) > self.mtu:
+				# too large to share a datagram with anything; don't bother bundling
+				outgoing.append(binary)
+			else:
+				if not self._pending:
+					self._size = 16	# "#bundle\0" + timetag
+					if (self.window != None) and not urgent:
+						self._timer = threading.Timer(self.window, self._expire, (self._generation,))
+						self._timer.setDaemon(True)
+						self._timer.start()
+				
+				self._pending.append(binary)
+				self._size += 4 + len(binary)
+				
+				if urgent:
+					outgoing.append(self._take())
 		except:
-			# for the very rare case this might happen
-			raise OSCClientError("Timed out waiting for file descriptor")
+			self._lock.release()
+			raise
+		
+		self._send(outgoing)
+	
+	def flush(self):
+		"""Send all collected messages now
+		"""
+		self._lock.acquire()
+		self._send([self._take()])
+	
+	def _expire(self, generation):
+		"""Called by the window-timer; sends the bundle it was started for, unless already sent
+		"""
+		self._lock.acquire()
+		if generation != self._generation:
+			self._lock.release()
+			return
+		
+		self._send([self._take()])
+	
+	def close(self):
+		"""Send all collected messages, and stop the window-timer
+		"""
+		self.flush()
+	
+	def _take(self):
+		"""Returns the collected messages as one packet (or None if there are none), and starts a new bundle.
+		Called holding _lock.
+		"""
+		self._generation += 1
+		if self._timer != None:
+			self._timer.cancel()
+			self._timer = None
+		
+		if not self._pending:
+			return None
+		
+		if len(self._pending) == 1:
+			binary = self._pending[0]
+		else:
+			binary = [OSCString("#bundle"), OSCTimeTag(0)]
+			for element in self._pending:
+				binary.append(struct.pack(">i", len(element)))
+				binary.append(element)
+			
+			binary = ''.join(binary)
+		
+		self._pending = []
+		self._size = 0
+		return binary
+	
+	def _send(self, packets):
+		"""Send the given packets (skipping None) in order. Called holding _lock, which is released
+		once the send-lock is held, so other threads can collect the next bundle meanwhile.
+		"""
+		packets = [binary for binary in packets if binary != None]
+		if not packets:
+			self._lock.release()
+			return
+		
+		self._send_lock.acquire()
+		self._lock.release()
+		try:
+			for binary in packets:
+				self.client.sendBinary(binary, self.address)
+		finally:
+			self._send_lock.release()
+
+class OSCSendQueue(object):
+	"""A send-queue in front of a client, with two priority classes, so time-critical
+	control messages (/n_set, /s_new, ...) never wait behind bulk transfers
+	(buffer uploads, SynthDef libraries, ...) on the same socket.
+	
+	Packets are sent, in order within each class, by a background thread. Queued control
+	packets always go first; bulk packets go out only while no control packet is waiting,
+	and no faster than 'bulk_rate' bytes per second (if given), so they can't flood the
+	receiver's socket-buffer.
+	
+	  queue = OSCSendQueue(client, address, bulk_rate=1000000, overflow='replace')
+	  for m in buf.setnChunks(0, 0, samples):
+		  queue.send(m, bulk=True)
+	  queue.send(node.set("freq", 440).n_set())
+	
+	Each class holds at most 'max_depth' packets. When the control class is full, the 'overflow' policy applies:
+	  - 'block': send() waits for room (at most 'timeout' seconds, if given)
+	  - 'raise': send() raises OSCClientError
+	  - 'replace': the oldest queued update with the same key as the new message is dropped;
+	  if there is none, send() waits as with 'block'
+	A full bulk class always blocks, unless the policy is 'raise'; bulk data is never dropped.
+	
+	A message's key is given to send(), or derived from the message: see 'keyed'.
+	Any client with a sendBinary(binary, address) method will do (OSCClient, OSCAsyncClient, OSCCoalescer).
+	"""
+	# OSC-address: number of leading arguments identifying what a message updates,
+	# for messages with exactly one argument more (i.e. a single value)
+	keyed = {'/n_set': 2, '/c_set': 1}
+	
+	# the most packets queued per class
+	max_depth = 1024
+	
+	# the most bytes sent in a burst at the full rate, after the bulk class has been idle
+	bulk_burst = 65536
+	
+	def __init__(self, client, address=None, bulk_rate=None, max_depth=None, overflow='block'):
+		"""Construct a send-queue, sending through the given client.
+		  - address:  the (host, port) tuple to send to, or None to send where the client sends.
+		  - bulk_rate:  the most bytes per second to send of bulk packets, or None for no limit
+		  - max_depth:  the most packets queued per class (default 1024)
+		  - overflow:  'block', 'raise' or 'replace' (see above)
+		"""
+		if overflow not in ('block', 'raise', 'replace'):
+			raise ValueError("unknown overflow policy %r" % (overflow,))
+		
+		self.client = client
+		self.address = address
+		self.bulk_rate = bulk_rate
+		if max_depth != None:
+			self.max_depth = max_depth
+		
+		self.overflow = overflow
+		
+		# number of control updates dropped by the 'replace' policy, and failed sends
+		self.replaced = 0
+		self.errors = 0
+		self.last_error = None
+		
+		self._control = collections.deque()
+		self._bulk = collections.deque()
+		self._cond = threading.Condition()
+		self._running = True
+		self._busy = False
+		self._clock = defaultClock.monotonic
+		self._allowance = self.bulk_burst
+		self._refilled = self._clock()
+		
+		self._thread = threading.Thread(target=self._run)
+		self._thread.setDaemon(True)
+		self._thread.start()
+	
+	def pending(self):
+		"""Returns the numbers of (control, bulk) packets queued
+		"""
+		return (len(self._control), len(self._bulk))
+	
+	def _key(self, msg):
+		if isinstance(msg, OSCBundle):
+			return None
+		
+		n = self.keyed.get(msg.address)
+		if (n == None) or (len(msg) != n + 1):
+			return None
+		
+		return (msg.address,) + tuple(msg.values()[:n])
+	
+	def send(self, msg, bulk=False, key=None, timeout=None):
+		"""Queue the given OSCMessage (or OSCBundle) for sending.
+		  - bulk:  True to queue it in the bulk class, False (default) in the control class
+		  - key:  identifies what a control message updates, for the 'replace' overflow policy.
+		  If None, it's derived from the message (see 'keyed').
+		  - timeout:  the longest time in seconds to wait for room in a full queue, or None to wait indefinitely
+		Raises OSCClientError when the queue is full and can't take the message (see above).
+		"""
+		if not isinstance(msg, OSCMessage):
+			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
+		
+		address_map = getattr(self.client, 'address_map', None)
+		max_size = getattr(self.client, 'max_packet_size', OSCClient.max_packet_size)
+		packets = _splitPacket(msg, max_size, address_map)
+		if (key == None) and (not bulk) and (len(packets) == 1):
+			key = self._key(msg)
+		
+		if timeout != None:
+			deadline = self._clock() + timeout
+		else:
+			deadline = None
+		
+		binaries = [packet.getBinary(address_map) for packet in packets]
+		self._cond.acquire()
+		try:
+			self._put(binaries, bulk, key, deadline)
+		finally:
+			self._cond.release()
+	
+	def _put(self, binaries, bulk, key, deadline):
+		"""Queue all the given packets (of one message, split up), or none of them
+		"""
+		if bulk:
+			queue = self._bulk
+		else:
+			queue = self._control
+		
+		if len(binaries) > self.max_depth:
+			raise OSCClientError("Message splits into %d packets; the send queue holds %d" % (len(binaries), self.max_depth))
+		
+		while self._running and (len(queue) + len(binaries) > self.max_depth):
+			if self.overflow == 'raise':
+				raise OSCClientError("Send queue full")
+			
+			if (self.overflow == 'replace') and (not bulk) and (key != None):
+				for entry in queue:
+					if entry[0] == key:
+						queue.remove(entry)
+						self.replaced += 1
+						break
+				else:
+					entry = None
+				
+				if entry != None:
+					break
+			
+			self._wait(deadline)
+		
+		if not self._running:
+			raise OSCClientError("Send queue closed")
+		
+		for binary in binaries:
+			queue.append((key, binary))
+		self._cond.notifyAll()
+	
+	def _wait(self, deadline):
+		"""Wait for the sending thread to make progress, or raise OSCClientTimeout if 'deadline' has passed
+		"""
+		if deadline == None:
+			self._cond.wait()
+			return
+		
+		remaining = deadline - self._clock()
+		if remaining <= 0:
+			raise OSCClientTimeout("Timed out waiting for the send queue")
+		
+		self._cond.wait(remaining)
+	
+	def _bulkDelay(self, size):
+		"""Returns how long the next bulk packet must wait for the rate-limit, or 0.
+		"""
+		if self.bulk_rate == None:
+			return 0
+		
+		now = self._clock()
+		self._allowance = min(self.bulk_burst, self._allowance + (now - self._refilled) * self.bulk_rate)
+		self._refilled = now
+		if self._allowance >= 0:
+			# a packet larger than the allowance goes now, and is paid for afterwards
+			self._allowance -= size
+			return 0
+		
+		return -self._allowance / float(self.bulk_rate)
+	
+	def _run(self):
+		self._cond.acquire()
+		try:
+			while True:
+				if self._control:
+					binary = self._control.popleft()[1]
+				elif self._bulk:
+					delay = self._bulkDelay(len(self._bulk[0][1]))
+					if delay > 0:
+						# a control packet queued meanwhile wakes us up
+						self._cond.wait(delay)
+						continue
+					
+					binary = self._bulk.popleft()[1]
+				elif self._running:
+					self._cond.wait()
+					continue
+				else:
+					break
+				
+				self._busy = True
+				self._cond.notifyAll()
+				self._cond.release()
+				try:
+					self.client.sendBinary(binary, self.address)
+				except (OSCClientError, socket.error), e:
+					self.errors += 1
+					self.last_error = e
+				finally:
+					self._cond.acquire()
+					self._busy = False
+			
+			self._cond.notifyAll()
+		finally:
+			self._cond.release()
+	
+	def flush(self, timeout=None):
+		"""Wait until all queued packets have been sent (at most 'timeout' seconds, if given).
+		Raises OSCClientTimeout on timeout.
+		"""
+		if timeout != None:
+			deadline = self._clock() + timeout
+		else:
+			deadline = None
+		
+		self._cond.acquire()
+		try:
+			while self._control or self._bulk or self._busy:
+				self._wait(deadline)
+		finally:
+			self._cond.release()
+	
+	def close(self, timeout=None):
+		"""Send all queued packets (waiting at most 'timeout' seconds, if given), then stop the sending thread.
+		"""
+		self._cond.acquire()
+		try:
+			self._running = False
+			self._cond.notifyAll()
+		finally:
+			self._cond.release()
+		
+		self._thread.join(timeout)
+
+######
+#
+# OSC over TCP
+#
+######
+
+def _framePacket(binary):
+	"""Returns a binary OSC-packet, or a list of buffer-segments, as a list of buffer-segments
+	prefixed by the packet's length (as an int32), for sending over a stream
+	"""
+	if type(binary) != types.ListType:
+		binary = [binary]
+	
+	return [struct.pack(">i", _segmentsLength(binary))] + binary
+
+class OSCStreamDecoder(object):
+	"""Splits a byte-stream into OSC-packets, each prefixed by its length as a
+	big-endian int32 (the framing scsynth uses in TCP-mode).
+	The stream can be fed in pieces of any size; incomplete packets are kept
+	until the rest of their data arrives.
+	"""
+	def __init__(self, max_packet_size=None):
+		"""Instantiate a new decoder.
+		Packets longer than 'max_packet_size' bytes (if given) are considered a corrupt stream.
+		"""
+		self.max_packet_size = max_packet_size
+		self._buffer = bytearray()
+	
+	def feed(self, data):
+		"""Add the given data to the stream.
+		Returns a list of the (binary) OSC-packets completed by it.
+		Raises OSCError when the stream contains an invalid packet-length.
+		"""
+		buf = self._buffer
+		buf.extend(data)
+		
+		packets = []
+		offset = 0
+		while len(buf) - offset >= 4:
+			length = struct.unpack_from(">i", buf, offset)[0]
+			if (length < 0) or ((self.max_packet_size != None) and (length > self.max_packet_size)):
+				raise OSCError("Invalid OSC-packet length %d in stream" % length)
+			
+			if len(buf) - offset - 4 < length:
+				break
+			
+			packets.append(str(buf[offset + 4:offset + 4 + length]))
+			offset += 4 + length
+		
+		if offset:
+			del buf[:offset]
+		
+		return packets
+	
+	def pending(self):
+		"""Returns the number of bytes received but not yet returned as a complete packet
+		"""
+		return len(self._buffer)
+
+class OSCStreamClient(OSCClient):
+	"""OSC Client for sending OSC-Packets (OSCMessage or OSCBundle) over a TCP-connection,
+	framed by a 4-byte length-prefix. It is used the same way as an OSCClient, but has no
+	packet-size limit, and never loses packets.
+	
+	Nagle's algorithm is turned off (TCP_NODELAY), so every packet goes out as soon as
+	it is sent. To pipeline many small packets into fewer, larger writes, give a 'buffer_size':
+	packets are then collected until that many bytes are waiting, or flush() is called.
+	
+	Replies from the server arrive on the same connection; see receive().
+	"""
+	# a length-prefix is a signed int32
+	max_packet_size = 0x7fffffff
+	
+	def __init__(self, address=None, buffer_size=0):
+		"""Construct an OSC stream Client.
+		  - address ((host, port) tuple): the remote server to connect to, if given.
+		  Otherwise, call connect() before sending.
+		  - buffer_size (int): the number of bytes to collect before writing to the connection.
+		  0 (default) writes every packet as soon as it is sent.
+		"""
+		self.socket = None
+		self.server = None
+		self.client_address = None
+		self.address_map = None
+		self.buffer_size = buffer_size
+		
+		self._wbuf = []
+		self._wlen = 0
+		self._decoder = OSCStreamDecoder()
+		self._lock = threading.Lock()
+		
+		if address != None:
+			self.connect(address)
+	
+	def setServer(self, server):
+		"""Associate this Client with the given OSCStreamServer;
+		the Client sends to remote clients connected to the Server over their connection.
+		"""
+		server.setClient(self)
+	
+	def connect(self, address):
+		"""Open a TCP-connection to an OSC server:
+		the 'address' argument is a (host, port) tuple
+		"""
+		self.close()
+		
+		try:
+			self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+			self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+			self.socket.connect(address)
+			self._fd = self.socket.fileno()
+			self.client_address = address
+		except socket.error, e:
+			self.close()
+			raise OSCClientError("SocketError: %s" % str(e))
+		
+		self._decoder = OSCStreamDecoder()
+	
+	def close(self):
+		"""Flush any buffered packets, then close the connection
+		"""
+		if self.socket != None:
+			try:
+				self.flush()
+			finally:
+				self.socket.close()
+				self.socket = None
+				self.client_address = None
+	
+	def _sendPacket(self, binary):
+		"""Write a binary OSC-packet, or a list of buffer-segments, to the connection,
+		or to the write-buffer
+		"""
+		frame = _framePacket(binary)
+		if self.buffer_size:
+			self._wbuf.extend(frame)
+			self._wlen += _segmentsLength(frame)
+			if self._wlen >= self.buffer_size:
+				self._flush()
+		elif hasattr(self.socket, 'sendmsg') and (len(frame) <= self.max_segments):
+			self.socket.sendmsg(frame)
+		else:
+			self.socket.sendall(joinSegments(frame))
+	
+	def _flush(self):
+		if self._wbuf:
+			binary = joinSegments(self._wbuf)
+			self._wbuf = []
+			self._wlen = 0
+			self.socket.sendall(binary)
+	
+	def flush(self):
+		"""Write all buffered packets to the connection
+		"""
+		self._lock.acquire()
+		try:
+			self._flush()
+		except socket.error, e:
+			raise OSCClientError("while sending: %s" % str(e))
+		finally:
+			self._lock.release()
+	
+	def sendBinary(self, binary, address=None, timeout=None):
+		"""Send an already-encoded OSC-packet (see OSCClient.sendBinary())
+		  - address:  (host, port) tuple specifing remote server to send the packet to.
+			If address == None, the packet is sent to the server this Client is connected to.
+			If this Client belongs to an OSCStreamServer, which has a connection from the given
+			address, the packet is sent over that connection. Otherwise, the Client connects to
+			the given address (closing its current connection).
+		  - timeout:  A timeout value for attempting to send. If timeout == None,
+			this call blocks until socket is available for writing. 
+		"""
+		if (address != None) and (address != self.client_address):
+			if (self.server != None) and self.server.hasConnection(address):
+				self.server.sendOnConnection(address, binary)
+				return
+			
+			self.connect(address)
+		
+		if self.socket == None:
+			raise OSCClientError("Not connected")
+		
+		if timeout != None:
+			if not select.select([], [self._fd], [], timeout)[1]:
+				raise OSCClientTimeout("Timed out waiting for file descriptor")
+		
+		self._lock.acquire()
+		try:
+			self._sendPacket(binary)
+		except socket.error, e:
+			raise OSCClientError("while sending to %s: %s" % (str(self.client_address), str(e)))
+		finally:
+			self._lock.release()
+	
+	def receive(self, timeout=None):
+		"""Flush any buffered packets, then wait (at most 'timeout' seconds, if given)
+		for data from the server. Returns a list of the decoded OSC-packets completed
+		by the received data, which may be empty.
+		Raises OSCClientError when the server has closed the connection.
+		"""
+		self.flush()
+		if not select.select([self._fd], [], [], timeout)[0]:
+			return []
+		
+		try:
+			data = self.socket.recv(65536)
+		except socket.error, e:
+			raise OSCClientError("while receiving: %s" % str(e))
+		
+		if not data:
+			raise OSCClientError("Connection closed by %s" % str(self.client_address))
+		
+		return [decodeOSC(packet) for packet in self._decoder.feed(data)]
+
+class OSCUnixClient(OSCClient):
+	"""OSC Client for sending OSC-Packets over an AF_UNIX datagram-socket, to a server on the same host.
+	It is used the same way as an OSCClient, with the remote server's socket-path in place of a (host, port) tuple.
+	Datagrams between local sockets skip the IP stack, and are never dropped: when the receiver
+	falls behind, sending blocks (or times out) instead.
+	"""
+	# enough for a max_packet_size datagram, which must fit the sending socket's buffer
+	sndbuf_size = 4096 * 64
+	
+	address_family = socket.AF_UNIX
+	
+	def __init__(self, server=None, path=None):
+		"""Construct an OSC Unix Client.
+		  - server: Local OSCUnixServer-instance this client will use the socket of for transmissions.
+		  If none is supplied, a socket will be created.
+		  - path (string): the local socket-path to bind a created socket to, which replies are sent to.
+		  If none is supplied, the socket is bound to a unique address in the abstract namespace (on Linux),
+		  or left unbound (elsewhere), in which case it can't receive replies.
+		"""
+		OSCClient.__init__(self, server)
+		
+		if server == None:
+			try:
+				self.socket.bind(path or '')
+			except socket.error, e:
+				if path:
+					self.close()
+					raise OSCClientError("SocketError: %s" % str(e))
+	
+	def setServer(self, server):
+		"""Associate this Client with given OSCUnixServer.
+		The Client will send from the Server's socket.
+		The Server will use this Client instance to send replies.
+		"""
+		if not isinstance(server, OSCUnixServer):
+			raise ValueError("'server' argument is not a valid OSCUnixServer object")
+		
+		OSCClient.setServer(self, server)
+	
+	def localAddress(self):
+		"""Returns the socket-path this Client receives replies on, or None if unbound
+		"""
+		try:
+			return self.socket.getsockname() or None
+		except socket.error:
+			return None
+	
+	def __str__(self):
+		"""Returns a string containing this Client's Class-name, software-version
+		and the socket-path it is connected to (if any)
+		"""
+		out = self.__class__.__name__
+		out += " v%s.%s-%s" % version
+		addr = self.address()
+		if addr:
+			out += " connected to %s" % addr
+		else:
+			out += " (unconnected)"
 		
-		try:
-			self.socket.sendall(msg.getBinary())
-		except socket.error, e:
-			if e[0] in (7, 65):	# 7 = 'no address associated with nodename',  65 = 'no route to host'
-				raise e
-			else:
-				raise OSCClientError("while sending: %s" % str(e))
+		return out
 
 ######
 #
@@ -1233,20 +3044,177 @@ def getFilterStr(filters):
 
 	return out
 
-# A translation-table for mapping OSC-address expressions to Python 're' expressions
-OSCtrans = string.maketrans("{,}?","(|).")
+def _translatePattern(pattern):
+	"""Translate OSC address-pattern syntax to python 're' syntax:
+	'?' matches any single character, '*' any sequence of characters, '[abc]' or '[a-z]' one of
+	the listed characters, '[!abc]' any character not listed, and '{foo,bar}' either of the listed strings.
+	Everything else matches itself.
+	"""
+	out = []
+	i = 0
+	while i < len(pattern):
+		c = pattern[i]
+		i += 1
+		if c == '?':
+			out.append('.')
+		elif c == '*':
+			out.append('.*')
+		elif (c == '[') and (pattern.find(']', i) >= 0):
+			end = pattern.find(']', i)
+			chars = pattern[i:end]
+			i = end + 1
+			negate = chars.startswith('!')
+			if negate:
+				chars = chars[1:]
+			
+			if not len(chars):
+				if negate:
+					out.append('.')
+				else:
+					out.append('(?!)')	# matches nothing
+				continue
+			
+			chars = ''.join([(ch == '-') and '-' or re.escape(ch) for ch in chars])
+			out.append('[%s%s]' % (negate and '^' or '', chars))
+		elif (c == '{') and (pattern.find('}', i) >= 0):
+			end = pattern.find('}', i)
+			out.append('(?:%s)' % '|'.join([re.escape(s) for s in pattern[i:end].split(',')]))
+			i = end + 1
+		else:
+			out.append(re.escape(c))
+	
+	return ''.join(out)
 
 def getRegEx(pattern):
 	"""Compiles and returns a 'regular expression' object for the given address-pattern.
+	(see _translatePattern() for the syntax)
+	"""
+	return re.compile(_translatePattern(pattern))
+
+# matches the characters making an OSC-address a pattern
+_wildcards = re.compile(r'[*?\[\]{}]')
+
+class OSCAddressSpace(dict):
+	"""The OSC-addresses registered with an OSCServer, mapped to their callbacks.
+	
+	This is a dict, which also indexes its addresses in a trie of address-parts, to find the
+	addresses matching an address-pattern (see match()) without testing every address:
+	a literal address is looked up directly, and a pattern is matched part by part,
+	testing only the names in the branches of the trie it reaches.
+	Following OSC 1.0, wildcards match within an address-part only, never across a '/'.
+	
+	The regular expressions of pattern-parts are cached, up to 'pattern_cache_size' of them;
+	the least recently used one is evicted first.
 	"""
-	# Translate OSC-address syntax to python 're' syntax
-	pattern = pattern.replace(".", r"\.")		# first, escape all '.'s in the pattern.
-	pattern = pattern.replace("(", r"\(")		# escape all '('s.
-	pattern = pattern.replace(")", r"\)")		# escape all ')'s.
-	pattern = pattern.replace("*", r".*")		# replace a '*' by '.*' (match 0 or more characters)
-	pattern = pattern.translate(OSCtrans)		# change '?' to '.' and '{,}' to '(|)'
+	pattern_cache_size = 1024
+	
+	def __init__(self, *args, **kwargs):
+		dict.__init__(self, *args, **kwargs)
+		self._version = 0
+		self._trie = None
+		self._trie_version = None
+		self._patterns = collections.OrderedDict()
+		self._lock = threading.Lock()
+	
+	# every change to the dict invalidates the trie, which is rebuilt when next needed
+	
+	def __setitem__(self, key, value):
+		dict.__setitem__(self, key, value)
+		self._version += 1
+	
+	def __delitem__(self, key):
+		dict.__delitem__(self, key)
+		self._version += 1
+	
+	def clear(self):
+		dict.clear(self)
+		self._version += 1
+	
+	def pop(self, *args):
+		self._version += 1
+		return dict.pop(self, *args)
 	
-	return re.compile(pattern)
+	def popitem(self):
+		self._version += 1
+		return dict.popitem(self)
+	
+	def setdefault(self, key, default=None):
+		self._version += 1
+		return dict.setdefault(self, key, default)
+	
+	def update(self, *args, **kwargs):
+		dict.update(self, *args, **kwargs)
+		self._version += 1
+	
+	def _index(self):
+		"""Returns the root of the trie of registered addresses, rebuilding it if the dict has changed.
+		Each node is a [{address-part: child-node}, address] list, where 'address' is None
+		unless the path to the node spells a registered address.
+		"""
+		if self._trie_version == self._version:
+			return self._trie
+		
+		self._lock.acquire()
+		try:
+			version = self._version
+			root = [{}, None]
+			for address in self.keys():
+				if (address == 'default') or (type(address) not in types.StringTypes):
+					continue
+				
+				node = root
+				for part in address.split('/'):
+					node = node[0].setdefault(part, [{}, None])
+				
+				node[1] = address
+			
+			self._trie = root
+			self._trie_version = version
+		finally:
+			self._lock.release()
+		
+		return root
+	
+	def _compile(self, part):
+		"""Returns the (cached) regular expression matching the given pattern-part
+		"""
+		self._lock.acquire()
+		try:
+			try:
+				expr = self._patterns.pop(part)
+			except KeyError:
+				expr = re.compile(_translatePattern(part) + r'\Z')
+				if len(self._patterns) >= self.pattern_cache_size:
+					self._patterns.popitem(last=False)
+			
+			self._patterns[part] = expr
+		finally:
+			self._lock.release()
+		
+		return expr
+	
+	def match(self, pattern):
+		"""Returns a list of the registered OSC-addresses matching the given OSC address-pattern.
+		An integer address (a scsynth command-number) only matches itself.
+		"""
+		if (type(pattern) not in types.StringTypes) or not _wildcards.search(pattern):
+			if pattern in self:
+				return [pattern]
+			
+			return []
+		
+		nodes = [self._index()]
+		for part in pattern.split('/'):
+			if not _wildcards.search(part):
+				nodes = [node[0][part] for node in nodes if part in node[0]]
+			else:
+				expr = self._compile(part)
+				nodes = [child for node in nodes for (name, child) in node[0].iteritems() if expr.match(name)]
+			
+			if not nodes:
+				return []
+		
+		return [node[1] for node in nodes if node[1] != None]
 	
 ######
 #
@@ -1268,6 +3236,7 @@ class OSCMultiClient(OSCClient):
 		super(OSCMultiClient, self).__init__(server)
 		
 		self.targets = {}
+		self._filter_cache = {}
 		
 	def _searchHostAddr(self, host):
 		"""Search the subscribed OSCTargets for (the first occurence of) given host.
@@ -1506,116 +3475,526 @@ class OSCMultiClient(OSCClient):
 		  - address:  (host, port) tuple specifing remote server to send the message to
 		  - timeout:  A timeout value for attempting to send. If timeout == None,
 		  	this call blocks until socket is available for writing. 
-		Raises OSCClientError when timing out while waiting for the socket. 
+		Raises OSCClientTimeout (an OSCClientError) when timing out while waiting for the socket. 
 		"""
 		self.send(msg, timeout)
 
-	def _filterMessage(self, filters, msg):
+	def _filterAddress(self, filters, address):
+		"""Returns True if an OSCMessage with the given OSC-address passes the given filters.
+		"""
+		if '/*' in filters.keys():
+			out = filters['/*']
+		elif False in filters.values(): 
+			out = True
+		else:
+			out = False
+
+		if type(address) not in types.StringTypes:
+			# an integer address (scsynth command-number) only matches itself
+			return filters.get(address, out)
+
+		expr = getRegEx(address)
+
+		for addr in filters.keys():
+			if addr == '/*':
+				continue
+			
+			match = expr.match(addr)
+			if match and (match.end() == len(addr)):
+				out = filters[addr]
+				break
+
+		return out
+
+	def _filterMessage(self, filters, msg, filters_key=None):
 		"""Checks the given OSCMessge against the given filters.
 		'filters' is a dict containing OSC-address:bool pairs.
 		If 'msg' is an OSCBundle, recursively filters its constituents. 
 		Returns None if the message is to be filtered, else returns the message.
 		or
 		Returns a copy of the OSCBundle with the filtered messages removed.
+		The decision for each OSC-address is cached, by the (hashable) 'filters_key'
+		identifying the filters (computed from 'filters' if not given).
 		"""
+		if filters_key == None:
+			filters_key = tuple(sorted(filters.items()))
+		
 		if isinstance(msg, OSCBundle):
 			out = msg.copy()
-			msgs = out.values()
 			out.clearData()
-			for m in msgs:
-				m = self._filterMessage(filters, m)
-				if m:		# this catches 'None' and empty bundles.
-					out.append(m)
-					
-		elif isinstance(msg, OSCMessage):
-			if '/*' in filters.keys():
-				if filters['/*']:
-					out = msg
-				else:
-					out = None
-					
-			elif False in filters.values(): 
-				out = msg
-			else:
-				out = None
+			for m in msg._elements:
+				m = self._filterMessage(filters, m, filters_key)
+				if not _isEmpty(m):
+					out._appendElement(m)
+			
+			return out
 
-		else:
+		elif not isinstance(msg, OSCMessage):
 			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
 
-		expr = getRegEx(msg.address)
-
-		for addr in filters.keys():
-			if addr == '/*':
-				continue
+		key = (filters_key, msg.address)
+		try:
+			passes = self._filter_cache[key]
+		except KeyError:
+			if len(self._filter_cache) >= 4096:
+				self._filter_cache.clear()
 			
-			match = expr.match(addr)
-			if match and (match.end() == len(addr)):
-				if filters[addr]:
-					out = msg
-				else:
-					out = None
-				break
-
-		return out
+			passes = self._filter_cache[key] = self._filterAddress(filters, msg.address)
+		
+		if passes:
+			return msg
+		
+		return None
 		
 	def _prefixAddress(self, prefix, msg):
 		"""Makes a copy of the given OSCMessage, then prepends the given prefix to
 		The message's OSC-address.
 		If 'msg' is an OSCBundle, recursively prepends the prefix to its constituents. 
+		Integer addresses (scsynth command-numbers) can't take a prefix, and are left as they are.
 		"""
 		out = msg.copy()
 		
 		if isinstance(msg, OSCBundle):
-			msgs = out.values()
 			out.clearData()
-			for m in msgs:
-				out.append(self._prefixAddress(prefix, m))
+			for m in msg._elements:
+				out._appendElement(self._prefixAddress(prefix, m))
 
 		elif isinstance(msg, OSCMessage):
-			out.setAddress(prefix + out.address)
+			if type(out.address) in types.StringTypes:
+				out.setAddress(prefix + out.address)
 
 		else:
 			raise TypeError("'msg' argument is not an OSCMessage or OSCBundle object")
 		
 		return out
 
+	def _targetGroups(self):
+		"""Returns the subscribed OSCTargets grouped by identical prefix & filters,
+		as a list of (prefix, filters, filters_key, [address, ...]) tuples
+		"""
+		groups = {}
+		for (address, (prefix, filters)) in self.targets.items():
+			filters_key = tuple(sorted(filters.items()))
+			try:
+				groups[(prefix, filters_key)][3].append(address)
+			except KeyError:
+				groups[(prefix, filters_key)] = (prefix, filters, filters_key, [address])
+		
+		return groups.values()
+
 	def send(self, msg, timeout=None):
 		"""Send the given OSCMessage to all subscribed OSCTargets
+		OSCTargets with the same prefix & filters share one filtered, prefixed & encoded copy of the message.
 		  - msg:  OSCMessage (or OSCBundle) to be sent
 		  - timeout:  A timeout value for attempting to send. If timeout == None,
 		  	this call blocks until socket is available for writing. 
 		Raises OSCClientError when timing out while waiting for	the socket.
 		"""
-		for (address, (prefix, filters)) in self.targets.items():
+		for (prefix, filters, filters_key, addresses) in self._targetGroups():
 			if len(filters):
-				out = self._filterMessage(filters, msg)
-				if not out:			# this catches 'None' and empty bundles.
+				out = self._filterMessage(filters, msg, filters_key)
+				if _isEmpty(out):
 					continue
 			else:
 				out = msg
 
 			if len(prefix):
-				out = self._prefixAddress(prefix, msg)
+				out = self._prefixAddress(prefix, out)
 
-			binary = out.getBinary()
-			
+			if self.stats != None:
+				self._sendGroupInstrumented(out, addresses, timeout)
+				continue
+
+			for packet in _splitPacket(out, self.max_packet_size, self.address_map):
+				binary = packet.getBinary(self.address_map)
+				for address in addresses:
+					self._sendto(binary, address, timeout)
+
+	def _sendGroupInstrumented(self, msg, addresses, timeout):
+		"""Send the given OSCMessage to the given addresses, recording the sends with this Client's OSCStats.
+		Each packet's encode-time is recorded with the first address only.
+		"""
+		stats = self.stats
+		clock = stats.clock
+		try:
+			packets = _splitPacket(msg, self.max_packet_size, self.address_map)
+		except OSCClientError, e:
+			for address in addresses:
+				stats.error(address, msg, e)
+			raise
+		
+		for packet in packets:
+			start = clock()
+			binary = packet.getBinary(self.address_map)
+			encode_time = clock() - start
+			for address in addresses:
+				start = clock()
+				try:
+					self._sendto(binary, address, timeout)
+				except (OSCClientError, socket.error), e:
+					stats.error(address, packet, e, dropped=isinstance(e, OSCClientTimeout))
+					raise
+				
+				stats.record(address, packet, len(binary), encode_time, clock() - start, self.address_map)
+				encode_time = None
+
+	def _sendto(self, binary, address, timeout):
+		"""Send a binary OSC-packet to the given address
+		"""
+		if timeout != None:
 			ret = select.select([],[self._fd], [], timeout)
 			try:
 				ret[1].index(self._fd)
 			except:
 				# for the very rare case this might happen
-				raise OSCClientError("Timed out waiting for file descriptor")
+				raise OSCClientTimeout("Timed out waiting for file descriptor")
+		
+		try:
+			while len(binary):
+				sent = self.socket.sendto(binary, address)
+				binary = binary[sent:]
+		
+		except socket.error, e:
+			if e[0] in (7, 65):	# 7 = 'no address associated with nodename',  65 = 'no route to host'
+				raise e
+			else:
+				raise OSCClientError("while sending to %s: %s" % (str(address), str(e)))
+
+def _isEmpty(msg):
+	"""Returns True if 'msg' is None, or an OSCBundle without any elements
+	(which OSCMultiClient filtering leaves out)
+	"""
+	return (msg is None) or (isinstance(msg, OSCBundle) and not len(msg))
+
+######
+#
+# OSCScheduler class
+#
+######
+
+class OSCScheduler(object):
+	"""Runs functions at given wall-clock times, from a dedicated thread.
+	An OSCServer uses one to dispatch received bundles with a future timetag when they're due,
+	so a future-dated bundle doesn't hold up the server's receive-loop (see OSCServer.setScheduler()).
+	
+	Pending functions are kept on a heap, ordered by due time. The thread is started
+	when the first function is scheduled, and waits in select() on a wake-up pipe,
+	so it wakes precisely at the next due time, or when an earlier function is scheduled.
+	
+	A bundle is 'late' when it's dispatched more than 'late_tolerance' seconds after its timetag,
+	either because it was received late or because the scheduler fell behind.
+	The 'late_policy' is either 'dispatch' (dispatch late bundles anyway, the default) or 'drop'.
+	
+	Metrics:
+	  - scheduled:  the number of functions scheduled
+	  - dispatched:  the number of scheduled functions run
+	  - late:  the number of late bundles (dispatched or dropped)
+	  - dropped:  the number of late bundles dropped
+	  - lateness:  an OSCHistogram of how long after their due time scheduled functions ran
+	"""
+	def __init__(self, late_policy='dispatch', late_tolerance=0.0, bounds=None):
+		"""Instantiate an OSCScheduler.
+		  - late_policy:  'dispatch' or 'drop' (see above)
+		  - late_tolerance:  how many seconds after its timetag a bundle still isn't late
+		  - bounds (list):  the upper bounds of the lateness-histogram's buckets (see OSCHistogram)
+		"""
+		if late_policy not in ('dispatch', 'drop'):
+			raise ValueError("unknown late policy %r" % (late_policy,))
+		
+		self.late_policy = late_policy
+		self.late_tolerance = late_tolerance
+		
+		self.scheduled = 0
+		self.dispatched = 0
+		self.late = 0
+		self.dropped = 0
+		self.lateness = OSCHistogram(bounds)
+		
+		self.running = False
+		self._heap = []
+		self._count = 0
+		self._lock = threading.Lock()
+		self._thread = None
+		self._wakeup = None
+	
+	def pending(self):
+		"""Returns the number of functions waiting to be run
+		"""
+		return len(self._heap)
+	
+	def schedule(self, when, function, *args):
+		"""Run function(*args) at the given time (in floating seconds since the Epoch)
+		"""
+		self._lock.acquire()
+		try:
+			if self._thread == None:
+				self._start()
 			
+			self._count += 1
+			self.scheduled += 1
+			item = (when, self._count, function, args)
+			heapq.heappush(self._heap, item)
+			if self._heap[0] is item:
+				self._wake()
+		finally:
+			self._lock.release()
+	
+	def admit(self, when, now=None):
+		"""Count the bundle with the given timetag as late if it's dispatched (at 'now') too long
+		after its timetag, and return False if the late-policy drops it.
+		"""
+		if now == None:
+			now = time.time()
+		
+		if now - when <= self.late_tolerance:
+			return True
+		
+		self._lock.acquire()
+		try:
+			self.late += 1
+			if self.late_policy == 'drop':
+				self.dropped += 1
+				return False
+		finally:
+			self._lock.release()
+		
+		return True
+	
+	def _start(self):
+		self._wakeup = os.pipe()
+		try:
+			import fcntl
+		except ImportError:
+			pass	# not on Windows; a full pipe would then block _wake(), which never happens in practice
+		else:
+			fcntl.fcntl(self._wakeup[1], fcntl.F_SETFL, os.O_NONBLOCK)
+		
+		self.running = True
+		self._thread = threading.Thread(target=self._run)
+		self._thread.setDaemon(True)
+		self._thread.start()
+	
+	def _wake(self):
+		try:
+			os.write(self._wakeup[1], 'x')
+		except OSError:
+			pass	# the pipe is full; the thread will wake anyway
+	
+	def _run(self):
+		while True:
+			self._lock.acquire()
 			try:
-				while len(binary):
-					sent = self.socket.sendto(binary, address)
-					binary = binary[sent:]
+				if not self.running:
+					break
 				
-			except socket.error, e:
-				if e[0] in (7, 65):	# 7 = 'no address associated with nodename',  65 = 'no route to host'
-					raise e
+				item = None
+				delay = None
+				if self._heap:
+					delay = self._heap[0][0] - time.time()
+					if delay <= 0:
+						item = heapq.heappop(self._heap)
+			finally:
+				self._lock.release()
+			
+			if item == None:
+				if select.select([self._wakeup[0]], [], [], delay)[0]:
+					os.read(self._wakeup[0], 4096)
+				continue
+			
+			(when, _, function, args) = item
+			now = time.time()
+			if not self.admit(when, now):
+				continue
+			
+			self.lateness.add(now - when)
+			self.dispatched += 1
+			try:
+				function(*args)
+			except Exception:
+				import traceback
+				traceback.print_exc()
+	
+	def close(self):
+		"""Stop the thread. Functions not run yet are discarded.
+		May be called from a scheduled function, in which case the thread stops once that returns.
+		"""
+		self._lock.acquire()
+		try:
+			thread = self._thread
+			self.running = False
+			del self._heap[:]
+			if thread != None:
+				self._wake()
+		finally:
+			self._lock.release()
+		
+		if thread != None:
+			if threading.currentThread() is not thread:
+				thread.join()
+			os.close(self._wakeup[0])
+			os.close(self._wakeup[1])
+			self._thread = None
+	
+	def asDict(self):
+		"""Returns the metrics as a dict (see above), including the number of 'pending' functions
+		"""
+		return {'scheduled': self.scheduled, 'dispatched': self.dispatched, 'late': self.late,
+			'dropped': self.dropped, 'pending': self.pending(), 'lateness': self.lateness.asDict()}
+
+class OSCWorkerPool(object):
+	"""A fixed number of worker-threads, running the functions submitted to them.
+	Each worker has its own bounded queue; submit() blocks while the chosen worker's queue is full
+	(without holding up submissions to other workers). A function running on a worker can't wait for room
+	in that worker's own queue, so submitting to it while it's full raises OSCServerError instead.
+	
+	Functions submitted with the same 'key' run on the same worker, so in the order submitted
+	(e.g. all requests from one client). Functions without a key go to the worker with the shortest queue.
+	
+	Metrics:
+	  - submitted, completed, errors:  the number of functions submitted, run, and raising an exception
+	  - max_depth:  the most functions queued at once (over all workers)
+	  - queue_time:  an OSCHistogram of the time functions waited in the queue
+	  - run_time:  an OSCHistogram of the time functions took to run
+	"""
+	def __init__(self, workers=4, max_queue=1024, bounds=None, error_handler=None):
+		"""Start a pool of 'workers' threads, each queueing at most 'max_queue' functions.
+		When a function raises, error_handler(function, args) is called from within the except-clause
+		(so sys.exc_info() is available); by default, the traceback is printed.
+		"""
+		self.submitted = 0
+		self.completed = 0
+		self.errors = 0
+		self.max_depth = 0
+		self.queue_time = OSCHistogram(bounds)
+		self.run_time = OSCHistogram(bounds)
+		
+		self.running = True
+		self.error_handler = error_handler
+		self._clock = defaultClock.monotonic
+		self._lock = threading.Lock()
+		# the number of submit() calls queueing (without holding _lock);
+		# close() waits for these, so nothing is queued behind its sentinels
+		self._submitting = 0
+		self._idle = threading.Condition(self._lock)
+		self._queues = [Queue.Queue(max_queue) for i in range(workers)]
+		self._threads = []
+		self._own_queues = {}
+		for queue in self._queues:
+			thread = threading.Thread(target=self._run, args=(queue,))
+			thread.setDaemon(True)
+			self._own_queues[thread] = queue
+			thread.start()
+			self._threads.append(thread)
+	
+	def depth(self):
+		"""Returns the number of functions queued (over all workers)
+		"""
+		return sum([queue.qsize() for queue in self._queues])
+	
+	def submit(self, function, args=(), key=None):
+		"""Queue function(*args) to run on a worker, the same one for every submission with the same (hashable) key.
+		Raises OSCServerError if the pool has been closed, or if a worker submits to its own, full queue.
+		"""
+		if key == None:
+			queue = min(self._queues, key=lambda q: q.qsize())
+		else:
+			queue = self._queues[hash(key) % len(self._queues)]
+		
+		self._lock.acquire()
+		try:
+			if not self.running:
+				raise OSCServerError("Worker pool closed")
+			
+			self._submitting += 1
+			self.submitted += 1
+		finally:
+			self._lock.release()
+		
+		queued = False
+		try:
+			item = (self._clock(), function, args)
+			if self._own_queues.get(threading.currentThread()) is queue:
+				try:
+					queue.put_nowait(item)
+				except Queue.Full:
+					raise OSCServerError("A worker can't wait for room in its own queue")
+			else:
+				queue.put(item)
+			
+			queued = True
+		finally:
+			self._lock.acquire()
+			try:
+				self._submitting -= 1
+				if not queued:
+					self.submitted -= 1
+				
+				depth = self.depth()
+				if depth > self.max_depth:
+					self.max_depth = depth
+				
+				if self._submitting == 0:
+					self._idle.notifyAll()
+			finally:
+				self._lock.release()
+	
+	def _run(self, queue):
+		clock = self._clock
+		while True:
+			item = queue.get()
+			if item == None:
+				break
+			
+			(queued, function, args) = item
+			start = clock()
+			failed = False
+			try:
+				function(*args)
+			except Exception:
+				failed = True
+				if self.error_handler != None:
+					self.error_handler(function, args)
 				else:
-					raise OSCClientError("while sending to %s: %s" % (str(address), str(e)))
+					import traceback
+					traceback.print_exc()
+			
+			end = clock()
+			self._lock.acquire()
+			try:
+				self.completed += 1
+				self.errors += failed
+				self.queue_time.add(start - queued)
+				self.run_time.add(end - start)
+			finally:
+				self._lock.release()
+	
+	def close(self):
+		"""Run the functions still queued, then stop the workers
+		"""
+		self._lock.acquire()
+		try:
+			self.running = False
+			while self._submitting:
+				self._idle.wait()
+		finally:
+			self._lock.release()
+		
+		for queue in self._queues:
+			queue.put(None)
+		
+		for thread in self._threads:
+			thread.join()
+	
+	def asDict(self):
+		"""Returns the metrics as a dict (see above), including the current queue 'depth'
+		"""
+		self._lock.acquire()
+		try:
+			return {'submitted': self.submitted, 'completed': self.completed, 'errors': self.errors,
+				'depth': self.depth(), 'max_depth': self.max_depth,
+				'queue_time': self.queue_time.asDict(), 'run_time': self.run_time.asDict()}
+		finally:
+			self._lock.release()
 
 ######
 #
@@ -1627,8 +4006,8 @@ class OSCRequestHandler(DatagramRequestHandler):
 	"""RequestHandler class for the OSCServer
 	"""
 	def dispatchMessage(self, pattern, tags, data):
-		"""Attmept to match the given OSC-address pattern, which may contain '*',
-		against all callbacks registered with the OSCServer.
+		"""Attmept to match the given OSC-address pattern, which may contain wildcards
+		(see _translatePattern()), against all callbacks registered with the OSCServer.
 		Calls the matching callback and returns whatever it returns.
 		If no match is found, and a 'default' callback is registered, it calls that one,
 		or raises NoCallbackError if a 'default' callback is not registered.
@@ -1640,14 +4019,12 @@ class OSCRequestHandler(DatagramRequestHandler):
 		if len(tags) != len(data):
 			raise OSCServerError("Malformed OSC-message; got %d typetags [%s] vs. %d values" % (len(tags), tags, len(data)))
 		
-		expr = getRegEx(pattern)
-		
 		replies = []
 		matched = 0
-		for addr in self.server.callbacks.keys():
-			match = expr.match(addr)
-			if match and (match.end() == len(addr)):
-				reply = self.server.callbacks[addr](pattern, tags, data, self.client_address)
+		for addr in self.server.callbacks.match(pattern):
+			callback = self.server.callbacks.get(addr)
+			if callback != None:	# unless unregistered meanwhile
+				reply = callback(pattern, tags, data, self.client_address)
 				matched += 1
 				if isinstance(reply, OSCMessage):
 					replies.append(reply)
@@ -1680,13 +4057,47 @@ class OSCRequestHandler(DatagramRequestHandler):
 			self.replies += self.dispatchMessage(decoded[0], decoded[1][1:], decoded[2:])
 			return
 		
-		now = time.time()
-		timetag = decoded[1]
-		if (timetag > 0.) and (timetag > now):
-			time.sleep(timetag - now)
+		if self._deferred(decoded):
+			return
 		
 		for msg in decoded[2:]:
 			self._unbundle(msg)
+	
+	def _deferred(self, decoded):
+		"""Returns True if the given decoded bundle isn't to be dispatched now, because it has
+		been scheduled for its timetag with the server's OSCScheduler, or dropped as late.
+		Without a scheduler, waits until the bundle is due, and returns False.
+		"""
+		timetag = decoded[1]
+		if timetag <= 0.:
+			return False
+		
+		now = time.time()
+		scheduler = self.server.scheduler
+		if scheduler == None:
+			if timetag > now:
+				time.sleep(timetag - now)
+			return False
+		
+		if timetag > now:
+			# a copy, so its replies don't get mixed up with those of the next request
+			handler = copy.copy(self)
+			handler.replies = []
+			scheduler.schedule(timetag, handler._dispatchScheduled, decoded[2:])
+			return True
+		
+		return not scheduler.admit(timetag, now)
+	
+	def _dispatchScheduled(self, elements):
+		"""Dispatch the elements of a scheduled bundle (from the scheduler's thread), and send any replies
+		"""
+		try:
+			for msg in elements:
+				self._unbundle(msg)
+			
+			self._reply()
+		except Exception:
+			self.server.handle_error(self.request, self.client_address)
 		
 	def handle(self):
 		"""Handle incoming OSCMessage
@@ -1702,9 +4113,73 @@ class OSCRequestHandler(DatagramRequestHandler):
 		Send any reply returned by the callback(s) back to the originating client
 		as an OSCMessage or OSCBundle
 		"""
-		if self.server.return_port:
-			self.client_address = (self.client_address[0], self.server.return_port)
-		
+		self._reply()
+	
+	def _reply(self):
+		"""Send any replies returned by the callback(s) back to the originating client
+		"""
+		if self.client_address == None:
+			# an unbound AF_UNIX client can't be replied to
+			return
+		
+		if self.server.return_port:
+			self.client_address = (self.client_address[0], self.server.return_port)
+		
+		if len(self.replies) > 1:
+			msg = OSCBundle()
+			for reply in self.replies:
+				msg.append(reply)
+		elif len(self.replies) == 1:
+			msg = self.replies[0]
+		else:
+			return
+		
+		self.server.client.sendto(msg, self.client_address)
+
+class OSCStreamRequestHandler(OSCRequestHandler):
+	"""RequestHandler class for the OSCStreamServer.
+	Serves one TCP-connection: OSC-packets are handled in the order they arrive,
+	and any replies are sent back over the same connection.
+	"""
+	def setup(self):
+		"""Prepare RequestHandler.
+		Registers the connection with the server, so replies can be sent over it
+		"""
+		self.connection = self.request
+		self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+		self.decoder = OSCStreamDecoder()
+		self.server._addConnection(self.client_address, self.connection)
+	
+	def handle(self):
+		"""Handle incoming OSC-packets until the connection closes.
+		Errors in the callbacks are reported (see OSCServer.handle_error())
+		without closing the connection.
+		"""
+		while True:
+			try:
+				data = self.connection.recv(65536)
+				if not data:
+					break
+				
+				packets = self.decoder.feed(data)
+			except (socket.error, OSCError):
+				self.server.handle_error(self.request, self.client_address)
+				break
+			
+			for self.packet in packets:
+				self.replies = []
+				try:
+					decoded = decodeOSC(self.packet)
+					if len(decoded):
+						self._unbundle(decoded)
+					
+					self._reply()
+				except Exception:
+					self.server.handle_error(self.request, self.client_address)
+	
+	def _reply(self):
+		"""Send any replies returned by the callback(s) back over the connection
+		"""
 		if len(self.replies) > 1:
 			msg = OSCBundle()
 			for reply in self.replies:
@@ -1714,7 +4189,32 @@ class OSCRequestHandler(DatagramRequestHandler):
 		else:
 			return
 		
-		self.server.client.sendto(msg, self.client_address)
+		self.server.sendOnConnection(self.client_address, msg.getSegments(self.server.client.address_map))
+	
+	def finish(self):
+		"""Unregister the connection
+		"""
+		self.server._delConnection(self.client_address)
+
+class OSCBatchRequestHandler(OSCRequestHandler):
+	"""RequestHandler class for the BatchOSCServer.
+	One instance dispatches all packets the server receives, instead of one instance per packet.
+	"""
+	def __init__(self, server):
+		self.server = server
+		self.request = None
+		self.client_address = None
+		self.replies = []
+	
+	def dispatchPacket(self, decoded, client_address):
+		"""Dispatch a decoded OSC-packet received from the given address, and send any replies
+		"""
+		self.client_address = client_address
+		self.replies = []
+		if len(decoded):
+			self._unbundle(decoded)
+		
+		self._reply()
 
 class ThreadingOSCRequestHandler(OSCRequestHandler):
 	"""Multi-threaded OSCRequestHandler;
@@ -1729,12 +4229,9 @@ class ThreadingOSCRequestHandler(OSCRequestHandler):
 			self.replies += self.dispatchMessage(decoded[0], decoded[1][1:], decoded[2:])
 			return
 		
-		now = time.time()
-		timetag = decoded[1]
-		if (timetag > 0.) and (timetag > now):
-			time.sleep(timetag - now)
-			now = time.time()
-			
+		if self._deferred(decoded):
+			return
+		
 		children = []
 		
 		for msg in decoded[2:]:
@@ -1770,6 +4267,13 @@ class OSCServer(UDPServer):
 	# DEBUG: print error-tracebacks (to stderr)?
 	print_tracebacks = False
 	
+	# dispatch bundles with a future timetag from an OSCScheduler's thread (see setScheduler())
+	use_scheduler = True
+	scheduler = None
+	
+	# bind with SO_REUSEPORT, so several servers can share a port (see ShardedOSCServer)
+	reuse_port = False
+	
 	def __init__(self, server_address, client=None, return_port=0):
 		"""Instantiate an OSCServer.
 		  - server_address ((host, port) tuple): the local host & UDP-port
@@ -1781,7 +4285,7 @@ class OSCServer(UDPServer):
 		"""
 		UDPServer.__init__(self, server_address, self.RequestHandlerClass)
 		
-		self.callbacks = {}
+		self.callbacks = OSCAddressSpace()
 		self.setReturnPort(return_port)
 		self.error_prefix = ""
 		self.info_prefix = "/info"
@@ -1791,6 +4295,9 @@ class OSCServer(UDPServer):
 		self.running = False
 		self.client = None
 		
+		if self.use_scheduler:
+			self.scheduler = OSCScheduler()
+		
 		if client == None:
 			self.client = OSCClient(server=self)
 		else:
@@ -1818,7 +4325,7 @@ class OSCServer(UDPServer):
 		
 		if client_address:
 			client.connect(client_address)
-			if not self.return_port:
+			if (not self.return_port) and (type(client_address) == types.TupleType):
 				self.return_port = client_address[1]
 		
 		if self.client != None:
@@ -1826,17 +4333,35 @@ class OSCServer(UDPServer):
 
 		self.client = client
 
+	def server_bind(self):
+		if self.reuse_port:
+			self.socket.setsockopt(socket.SOL_SOCKET, _SO_REUSEPORT, 1)
+		
+		UDPServer.server_bind(self)
+
 	def serve_forever(self):
 		"""Handle one request at a time until server is closed."""
 		self.running = True
 		while self.running:
 			self.handle_request()	# this times-out when no data arrives.
 
+	def setScheduler(self, scheduler):
+		"""Set the OSCScheduler which dispatches received bundles with a future timetag when they're due,
+		closing the one this Server is currently using.
+		If None, the request-handler waits until such a bundle is due, holding up the requests behind it.
+		"""
+		if self.scheduler != None:
+			self.scheduler.close()
+		
+		self.scheduler = scheduler
+
 	def close(self):
-		"""Stops serving requests, closes server (socket), closes used client
+		"""Stops serving requests, closes server (socket), closes used client & scheduler
 		"""
 		self.running = False
 		self.client.close()
+		if self.scheduler != None:
+			self.scheduler.close()
 		self.server_close()
 	
 	def __str__(self):
@@ -2283,6 +4808,9 @@ class ForkingOSCServer(ForkingMixIn, OSCServer):
 	""" 
 	# set the RequestHandlerClass, will be overridden by ForkingOSCServer & ThreadingOSCServer
 	RequestHandlerClass = ThreadingOSCRequestHandler
+	
+	# a forked handler exits before its bundles would be due
+	use_scheduler = False
 
 class ThreadingOSCServer(ThreadingMixIn, OSCServer):
 	"""An Asynchronous OSCServer.
@@ -2291,6 +4819,680 @@ class ThreadingOSCServer(ThreadingMixIn, OSCServer):
 	# set the RequestHandlerClass, will be overridden by ForkingOSCServer & ThreadingOSCServer
 	RequestHandlerClass = ThreadingOSCRequestHandler
 
+def _kernelDrops(sock):
+	"""Returns the number of datagrams the (Linux) kernel has dropped because the given
+	UDP-socket's receive-buffer was full, read from /proc/net/udp (or udp6),
+	or None where that isn't available.
+	"""
+	try:
+		inode = str(os.fstat(sock.fileno()).st_ino)
+	except (OSError, socket.error):
+		return None
+	
+	for table in ('/proc/net/udp', '/proc/net/udp6'):
+		try:
+			f = open(table)
+		except IOError:
+			continue
+		
+		try:
+			f.readline()	# the column-headers
+			for line in f:
+				fields = line.split()
+				# sl local rem st tx:rx tr:when retrnsmt uid timeout inode ref pointer drops
+				if (len(fields) >= 13) and (fields[9] == inode):
+					return int(fields[12])
+		finally:
+			f.close()
+	
+	return None
+
+class BatchOSCServer(OSCServer):
+	"""A Synchronous OSCServer for high packet-rates (e.g. /tr or SendReply messages from scsynth).
+	Each time packets arrive, all pending packets (up to 'max_batch') are received into one
+	preallocated buffer with recvfrom_into(), decoded, and then dispatched as a batch (see dispatchBatch()),
+	by a single request-handler instance.
+	
+	Metrics (see asDict()): the number of wakeups & packets, a histogram of packets per wakeup,
+	and the number of packets the kernel dropped because the socket's receive-buffer was full
+	(on Linux; see kernelDrops()).
+	"""
+	# the most packets received per wakeup
+	max_batch = 256
+	
+	# the size to set the socket's receive-buffer to, or None to keep the system default
+	rcvbuf_size = None
+	
+	def __init__(self, server_address, client=None, return_port=0, rcvbuf_size=None, max_batch=None):
+		"""Instantiate a BatchOSCServer (see OSCServer).
+		  - rcvbuf_size (int): the size to set the socket's receive-buffer (SO_RCVBUF) to.
+		  The kernel caps this at net.core.rmem_max.
+		  - max_batch (int): the most packets received per wakeup (default 256)
+		"""
+		OSCServer.__init__(self, server_address, client, return_port)
+		
+		if rcvbuf_size != None:
+			self.rcvbuf_size = rcvbuf_size
+		if max_batch != None:
+			self.max_batch = max_batch
+		
+		if self.rcvbuf_size != None:
+			self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf_size)
+		
+		# a non-blocking duplicate of the socket, to drain it
+		self._receiver = socket.fromfd(self.socket.fileno(), self.address_family, self.socket_type)
+		self._receiver.settimeout(0.0)
+		self._buffer = bytearray(65536)
+		self._view = memoryview(self._buffer)
+		self._handler = OSCBatchRequestHandler(self)
+		
+		self.wakeups = 0
+		self.packets = 0
+		self.batch_sizes = OSCHistogram([2 ** i for i in range(int(math.log(self.max_batch, 2)) + 1)])
+	
+	def getRcvBufSize(self):
+		"""Returns the actual size of the socket's receive-buffer (Linux reports double the size set)
+		"""
+		return self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+	
+	def kernelDrops(self):
+		"""Returns the number of packets dropped by the kernel, or None where that isn't observable
+		"""
+		return _kernelDrops(self.socket)
+	
+	def _receiveBatch(self):
+		"""Receive & decode all pending packets, up to max_batch.
+		Returns a list of (decoded packet, client_address) tuples
+		"""
+		batch = []
+		for i in xrange(self.max_batch):
+			try:
+				(size, client_address) = self._receiver.recvfrom_into(self._buffer)
+			except socket.error, e:
+				if e[0] in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+					break
+				raise
+			
+			try:
+				decoded = _decodeAt(self._buffer, self._view, 0, size, True)
+			except (struct.error, OSCError):
+				self.handle_error(None, client_address)
+				continue
+			
+			batch.append((decoded, client_address))
+		
+		return batch
+	
+	def dispatchBatch(self, batch):
+		"""Dispatch a list of (decoded packet, client_address) tuples, in order.
+		Override this to hand batches elsewhere, e.g. to an OSCWorkerPool
+		"""
+		for (decoded, client_address) in batch:
+			try:
+				self._handler.dispatchPacket(decoded, client_address)
+			except Exception:
+				self.handle_error(None, client_address)
+	
+	def handle_request(self):
+		"""Wait (at most socket_timeout seconds) for packets to arrive,
+		then receive & dispatch all pending packets, up to max_batch.
+		"""
+		try:
+			if not select.select([self._receiver], [], [], self.socket_timeout)[0]:
+				return
+			
+			batch = self._receiveBatch()
+		except (select.error, socket.error):
+			if not self.running:
+				return	# closed meanwhile
+			raise
+		
+		self.wakeups += 1
+		self.packets += len(batch)
+		self.batch_sizes.add(len(batch))
+		self.dispatchBatch(batch)
+	
+	def close(self):
+		"""Stops serving requests, closes server (socket), closes used client & scheduler
+		"""
+		OSCServer.close(self)
+		self._receiver.close()
+	
+	def asDict(self):
+		"""Returns the receive-metrics as a dict: 'wakeups', 'packets', 'batch_sizes' (see OSCHistogram.asDict()),
+		'kernel_drops' (None where not observable) and 'rcvbuf_size' (the actual size)
+		"""
+		return {'wakeups': self.wakeups, 'packets': self.packets, 'batch_sizes': self.batch_sizes.asDict(),
+			'kernel_drops': self.kernelDrops(), 'rcvbuf_size': self.getRcvBufSize()}
+
+class PooledOSCServer(OSCServer):
+	"""An Asynchronous OSCServer.
+	This server handles requests on a fixed pool of worker-threads (see OSCWorkerPool),
+	instead of starting a thread per request (and, with the ThreadingOSCRequestHandler, per bundle-element),
+	so a burst of packets doesn't create a burst of threads.
+	
+	The elements of a bundle are dispatched in order, by one worker. If 'ordered' is True (default),
+	all requests from the same client-address are also handled in the order received.
+	When the workers' queues are full, the receive-loop waits for room
+	(while the socket's receive-buffer holds further packets).
+	The pool's metrics (queue depth, handler latency, ...) are available as 'server.pool.asDict()'.
+	"""
+	workers = 4
+	max_queue = 1024
+	
+	def __init__(self, server_address, client=None, return_port=0, workers=None, max_queue=None, ordered=True):
+		"""Instantiate a PooledOSCServer (see OSCServer).
+		  - workers (int): the number of worker-threads (default 4)
+		  - max_queue (int): the most requests queued per worker (default 1024)
+		  - ordered (bool): handle the requests from each client-address in order
+		"""
+		OSCServer.__init__(self, server_address, client, return_port)
+		
+		self.ordered = ordered
+		self.pool = OSCWorkerPool(workers or self.workers, max_queue or self.max_queue,
+			error_handler=self._requestError)
+	
+	def process_request(self, request, client_address):
+		"""Queue the request for a worker
+		"""
+		if self.ordered:
+			key = client_address
+		else:
+			key = None
+		
+		self.pool.submit(self._processRequest, (request, client_address), key)
+	
+	def _processRequest(self, request, client_address):
+		try:
+			self.finish_request(request, client_address)
+		finally:
+			self.shutdown_request(request)
+	
+	def _requestError(self, function, args):
+		"""Report a request that raised (counted in the pool's 'errors') through handle_error()
+		"""
+		self.handle_error(*args)
+	
+	def close(self):
+		"""Stops serving requests, handles those still queued, then closes server (socket),
+		the used client & scheduler
+		"""
+		self.running = False
+		self.pool.close()
+		OSCServer.close(self)
+
+class ShardedOSCServer(object):
+	"""Spreads the receiving, decoding & handling of OSC-packets over several processes (and so cores),
+	which each run an OSCServer (a BatchOSCServer by default) bound to the same address with SO_REUSEPORT.
+	The kernel distributes the incoming packets over the processes by source-address,
+	so all packets from one client are handled, in order, by the same process.
+	
+	Handlers are registered once, before start(), and replicated in every process (which are forked,
+	so the callbacks needn't be picklable). Each process can send results back to the parent
+	through emit(); the parent collects them with results(), and should keep doing so:
+	results pile up in the pipe between the processes, and a shard blocks once that is full.
+	Results not collected before close() are discarded.
+	
+	  sharded = ShardedOSCServer(('0.0.0.0', 57120), shards=4)
+	  sharded.addMsgHandler("/tr", lambda addr, tags, data, source: sharded.emit(data[2]))
+	  sharded.start()
+	  while True:
+		  for (shard, value) in sharded.results(1.0):
+			  ...
+	
+	Requires SO_REUSEPORT (Linux 3.9+, BSD, macOS).
+	"""
+	def __init__(self, server_address, shards=None, server_class=None, initializer=None, aggregate=True):
+		"""Instantiate a ShardedOSCServer.
+		  - server_address ((host, port) tuple): the local host & UDP-port all shards listen on.
+		  If the port is 0, a free port is chosen (see address()).
+		  - shards (int): the number of processes (default: the number of CPUs)
+		  - server_class: the OSCServer class each process runs (default BatchOSCServer)
+		  - initializer: a function called in each process before serving, as initializer(server, shard),
+		  with the process' server and shard-index
+		  - aggregate (bool): set up the channel back to the parent (see emit())
+		"""
+		if _SO_REUSEPORT == None:
+			raise OSCServerError("SO_REUSEPORT is not available on this platform")
+		
+		if shards == None:
+			shards = multiprocessing.cpu_count()
+		
+		if server_class == None:
+			server_class = BatchOSCServer
+		
+		self.server_address = server_address
+		self.shards = shards
+		self.server_class = server_class
+		self.initializer = initializer
+		
+		# the index of the shard running in this process, or None in the parent
+		self.shard = None
+		self.server = None
+		
+		self._handlers = []
+		self._processes = []
+		self._probe = None
+		self._stopping = multiprocessing.Event()
+		self._ready = multiprocessing.Queue()
+		if aggregate:
+			self._results = multiprocessing.Queue()
+		else:
+			self._results = None
+	
+	def addMsgHandler(self, address, callback):
+		"""Register a handler for an OSC-address in every shard (see OSCServer.addMsgHandler()).
+		Must be called before start().
+		"""
+		if self._processes:
+			raise OSCServerError("Can't add handlers to a started ShardedOSCServer")
+		
+		self._handlers.append((address, callback))
+	
+	def address(self):
+		"""Returns the (host, port) tuple all shards listen on
+		"""
+		return self.server_address
+	
+	def start(self, timeout=5.0):
+		"""Start the shard-processes, and wait (at most 'timeout' seconds) until all are listening.
+		Raises OSCServerError if a shard fails to start (e.g. its initializer raises) or times out.
+		"""
+		# bind a placeholder socket until the shards are listening, to reserve the port
+		self._probe = probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		try:
+			probe.setsockopt(socket.SOL_SOCKET, _SO_REUSEPORT, 1)
+			probe.bind(self.server_address)
+			self.server_address = probe.getsockname()
+			
+			for shard in range(self.shards):
+				process = multiprocessing.Process(target=self._serve, args=(shard,))
+				process.daemon = True
+				process.start()
+				self._processes.append(process)
+			
+			deadline = defaultClock.monotonic() + timeout
+			for i in range(self.shards):
+				(shard, error) = self._waitReady(deadline)
+				if error != None:
+					self.close()
+					raise OSCServerError("Shard %d failed to start: %s" % (shard, error))
+				
+				# once a shard holds the port, the placeholder would only take packets away from it
+				self._closeProbe()
+		finally:
+			self._closeProbe()
+	
+	def _waitReady(self, deadline):
+		"""Returns the (shard, error) tuple the next shard to start reports, where 'error' is None
+		if it's serving. Raises OSCServerError (after closing) if none does before the deadline.
+		"""
+		while True:
+			remaining = deadline - defaultClock.monotonic()
+			try:
+				# in slices, to notice a shard that died without reporting
+				return self._ready.get(True, max(min(remaining, 0.1), 0))
+			except Queue.Empty:
+				pass
+			
+			for (shard, process) in enumerate(self._processes):
+				if (process.exitcode != None) and self._ready.empty():
+					self.close()
+					raise OSCServerError("Shard %d exited with code %d while starting" % (shard, process.exitcode))
+			
+			if remaining <= 0:
+				self.close()
+				raise OSCServerError("Timed out waiting for the shards to start")
+	
+	def _closeProbe(self):
+		if self._probe != None:
+			self._probe.close()
+			self._probe = None
+	
+	def _serve(self, shard):
+		"""Run one shard (in its own process)
+		"""
+		# the forked copy of the placeholder would otherwise receive a share of the packets
+		self._closeProbe()
+		self.shard = shard
+		class server_class(self.server_class):
+			reuse_port = True
+		
+		try:
+			self.server = server = server_class(self.server_address)
+			for (address, callback) in self._handlers:
+				server.addMsgHandler(address, callback)
+			
+			if self.initializer != None:
+				self.initializer(server, shard)
+		except Exception, e:
+			# reported by start() in the parent
+			self._ready.put((shard, "%s: %s" % (e.__class__.__name__, str(e))))
+			return
+		
+		self._ready.put((shard, None))
+		server.running = True
+		try:
+			while not self._stopping.is_set():
+				server.handle_request()	# this times-out when no data arrives.
+		finally:
+			server.close()
+			if self._results != None:
+				# don't wait at exit until the parent has read every result; it's closing
+				self._results.cancel_join_thread()
+	
+	def emit(self, item):
+		"""Send a (picklable) item from a shard to the parent, where results() returns it
+		"""
+		if self._results == None:
+			raise OSCServerError("This ShardedOSCServer doesn't aggregate results")
+		
+		self._results.put((self.shard, item))
+	
+	def results(self, timeout=None):
+		"""Returns a list of the (shard, item) tuples emitted by the shards since the last call,
+		after waiting (at most 'timeout' seconds, if given) for the first one.
+		"""
+		if self._results == None:
+			raise OSCServerError("This ShardedOSCServer doesn't aggregate results")
+		
+		out = []
+		try:
+			out.append(self._results.get(True, timeout))
+			while True:
+				out.append(self._results.get_nowait())
+		except Queue.Empty:
+			pass
+		
+		return out
+	
+	def close(self, timeout=5.0):
+		"""Stop all shards, waiting at most 'timeout' seconds for each before terminating it.
+		Results not collected yet are discarded.
+		"""
+		self._stopping.set()
+		for process in self._processes:
+			process.join(timeout)
+			if process.is_alive():
+				process.terminate()
+				process.join()
+		
+		self._processes = []
+
+class OSCStreamServer(ThreadingMixIn, OSCServer):
+	"""An OSCServer for OSC over TCP, with OSC-packets framed by a 4-byte length-prefix.
+	This server starts a new thread for each incoming connection, which handles that
+	connection's OSC-packets in order. Replies, and anything sent through the server's
+	OSCStreamClient to the address of a connected client, go back over that client's connection.
+	"""
+	socket_type = socket.SOCK_STREAM
+	allow_reuse_address = True
+	daemon_threads = True
+	
+	RequestHandlerClass = OSCStreamRequestHandler
+	
+	def __init__(self, server_address, client=None):
+		"""Instantiate an OSCStreamServer.
+		  - server_address ((host, port) tuple): the local host & TCP-port
+		  the server listens on
+		  - client (OSCStreamClient instance): The client used to send messages from this server.
+		  If none is supplied (default) an OSCStreamClient will be created.
+		"""
+		self.connections = {}
+		self._connection_lock = threading.Lock()
+		
+		if client == None:
+			client = OSCStreamClient()
+		
+		OSCServer.__init__(self, server_address, client)
+	
+	def setClient(self, client):
+		"""Associate this Server with a new OSCStreamClient instance, closing the Client this Server is currently using.
+		"""
+		if not isinstance(client, OSCStreamClient):
+			raise ValueError("'client' argument is not a valid OSCStreamClient object")
+		
+		if (self.client != None) and (self.client is not client):
+			self.client.close()
+		
+		client.server = self
+		self.client = client
+	
+	def server_activate(self):
+		TCPServer.server_activate(self)
+	
+	def get_request(self):
+		return TCPServer.get_request(self)
+	
+	def shutdown_request(self, request):
+		TCPServer.shutdown_request(self, request)
+	
+	def close_request(self, request):
+		TCPServer.close_request(self, request)
+	
+	def _addConnection(self, address, connection):
+		self._connection_lock.acquire()
+		try:
+			self.connections[address] = (connection, threading.Lock())
+		finally:
+			self._connection_lock.release()
+	
+	def _delConnection(self, address):
+		self._connection_lock.acquire()
+		try:
+			self.connections.pop(address, None)
+		finally:
+			self._connection_lock.release()
+	
+	def hasConnection(self, address):
+		"""Returns True if a remote client is connected from the given (host, port) address
+		"""
+		return address in self.connections
+	
+	def sendOnConnection(self, address, binary):
+		"""Send an already-encoded OSC-packet (or list of buffer-segments)
+		over the connection from the given (host, port) address
+		"""
+		try:
+			(connection, lock) = self.connections[address]
+		except KeyError:
+			raise OSCServerError("No connection from %s" % str(address))
+		
+		lock.acquire()
+		try:
+			connection.sendall(joinSegments(_framePacket(binary)))
+		except socket.error, e:
+			raise OSCServerError("while sending to %s: %s" % (str(address), str(e)))
+		finally:
+			lock.release()
+	
+	def close(self):
+		"""Stops serving requests, closes all connections, the server (socket) and the used client
+		"""
+		for (connection, lock) in self.connections.values():
+			try:
+				connection.shutdown(socket.SHUT_RDWR)
+			except socket.error:
+				pass
+		
+		OSCServer.close(self)
+
+class OSCUnixServer(OSCServer):
+	"""An OSCServer listening on an AF_UNIX datagram-socket, for clients on the same host (see OSCUnixClient).
+	The 'client_address' passed to callbacks is the sending socket's path, or None for an unbound
+	client (which can't be replied to).
+	"""
+	address_family = socket.AF_UNIX
+	
+	# the largest packet an OSCUnixClient sends
+	max_packet_size = OSCClient.max_packet_size
+	
+	def __init__(self, server_address, client=None):
+		"""Instantiate an OSCUnixServer.
+		  - server_address (string): the socket-path the server listens on.
+		  A stale socket left at that path (by a server that wasn't closed) is removed.
+		  A path starting with a NUL character is in the abstract namespace (on Linux), and leaves no file.
+		  - client (OSCUnixClient instance): The OSCUnixClient used to send replies from this server.
+		  If none is supplied (default) an OSCUnixClient will be created.
+		"""
+		if client == None:
+			client = OSCUnixClient()
+		
+		OSCServer.__init__(self, server_address, client)
+	
+	def server_bind(self):
+		_unlinkSocket(self.server_address)
+		OSCServer.server_bind(self)
+	
+	def setClient(self, client):
+		"""Associate this Server with a new OSCUnixClient instance, closing the Client this Server is currently using.
+		"""
+		if not isinstance(client, OSCUnixClient):
+			raise ValueError("'client' argument is not a valid OSCUnixClient object")
+		
+		OSCServer.setClient(self, client)
+	
+	def close(self):
+		"""Stops serving requests, closes server (socket) & used client, and removes the socket-file
+		"""
+		OSCServer.close(self)
+		_unlinkSocket(self.server_address)
+	
+	def __str__(self):
+		"""Returns a string containing this Server's Class-name, software-version and socket-path
+		"""
+		out = self.__class__.__name__
+		out += " v%s.%s-%s" % version
+		out += " listening on %s" % repr(self.server_address)
+		
+		return out
+
+def _unlinkSocket(path):
+	"""Remove the socket-file at the given path, if there is one
+	"""
+	if (not path) or path.startswith('\0'):
+		return
+	
+	try:
+		if stat.S_ISSOCK(os.stat(path).st_mode):
+			os.unlink(path)
+	except OSError:
+		pass
+
+class OSCUnixRelay(object):
+	"""Relays OSC-packets between AF_UNIX datagram-sockets and a server which only listens on UDP,
+	so local clients can use an OSCUnixClient to talk to e.g. scsynth on the same host.
+	
+	Each local client gets its own UDP-socket towards the server, so whatever the server sends
+	back (replies, /n_go notifications, ...) is relayed to the client it was meant for.
+	Packets are relayed as they are, without decoding.
+	
+	  relay = OSCUnixRelay('/tmp/scsynth.sock', ('127.0.0.1', 57110))
+	  threading.Thread(target=relay.serve_forever).start()
+	  client = OSCUnixClient()
+	  client.connect('/tmp/scsynth.sock')
+	"""
+	# the largest datagram relayed either way
+	max_packet_size = 65536
+	
+	# define a select timeout, so the serve_forever loop can actually exit.
+	socket_timeout = 1
+	
+	def __init__(self, path, address):
+		"""Instantiate an OSCUnixRelay.
+		  - path (string): the socket-path local clients send to
+		  (a stale socket left at that path is removed, see OSCUnixServer)
+		  - address ((host, port) tuple): the UDP-address of the server to relay to
+		"""
+		self.path = path
+		self.address = address
+		self.running = False
+		
+		_unlinkSocket(path)
+		self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+		self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, OSCUnixClient.sndbuf_size)
+		self.socket.bind(path)
+		
+		# local client's path -> its UDP-socket, and UDP-socket's fd -> (local client's path, UDP-socket)
+		self._upstream = {}
+		self._downstream = {}
+	
+	def _upstreamSocket(self, client_address):
+		"""Returns the UDP-socket relaying for the given local client, creating it if needed
+		"""
+		try:
+			return self._upstream[client_address]
+		except KeyError:
+			pass
+		
+		sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		sock.connect(self.address)
+		if client_address != None:
+			# unbound clients can't be replied to, so share one socket that isn't listened to
+			self._downstream[sock.fileno()] = (client_address, sock)
+		
+		self._upstream[client_address] = sock
+		return sock
+	
+	def handle_request(self, timeout=None):
+		"""Relay the packets that arrive within 'timeout' seconds (or socket_timeout, if not given)
+		"""
+		if timeout == None:
+			timeout = self.socket_timeout
+		
+		fds = [self.socket.fileno()] + self._downstream.keys()
+		ready = select.select(fds, [], [], timeout)[0]
+		
+		for fd in ready:
+			if fd == self.socket.fileno():
+				(data, client_address) = self.socket.recvfrom(self.max_packet_size)
+				try:
+					self._upstreamSocket(client_address).send(data)
+				except socket.error:
+					# e.g. 'connection refused' reported for an earlier packet; the server may come up later
+					pass
+			
+			else:
+				(client_address, sock) = self._downstream[fd]
+				try:
+					data = sock.recv(self.max_packet_size)
+				except socket.error:
+					# 'connection refused', for a packet the server didn't receive
+					continue
+				
+				try:
+					self.socket.sendto(data, client_address)
+				except socket.error, e:
+					if e[0] in (errno.ENOENT, errno.ECONNREFUSED):
+						# the local client has gone
+						self._forget(client_address)
+	
+	def _forget(self, client_address):
+		sock = self._upstream.pop(client_address, None)
+		if sock != None:
+			self._downstream.pop(sock.fileno(), None)
+			sock.close()
+	
+	def serve_forever(self):
+		"""Relay packets until the relay is closed."""
+		self.running = True
+		while self.running:
+			try:
+				self.handle_request()
+			except (select.error, socket.error):
+				if self.running:
+					raise
+	
+	def close(self):
+		"""Stops relaying, closes all sockets and removes the socket-file
+		"""
+		self.running = False
+		for client_address in self._upstream.keys():
+			self._forget(client_address)
+		
+		self.socket.close()
+		_unlinkSocket(self.path)
+
 ######
 #
 # OSCError classes
@@ -2311,6 +5513,11 @@ class OSCClientError(OSCError):
 	"""
 	pass
 
+class OSCClientTimeout(OSCClientError):
+	"""This error is raised (by an OSCClient) when a send times out
+	"""
+	pass
+
 class OSCServerError(OSCError):
 	"""Class for all OSCServer errors
 	"""
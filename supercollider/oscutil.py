@@ -1,12 +1,122 @@
 import supercollider.osc as osc
-import time
+
+## scsynth accepts these command numbers in place of the command name
+## as a message's address. Pass this table to
+## OSCClient.setAddressMap() to have one client send them, or set
+## numeric_addresses to have msg() and template() emit them directly.
+commands = {
+    "/notify": 1,
+    "/status": 2,
+    "/quit": 3,
+    "/cmd": 4,
+    "/d_recv": 5,
+    "/d_load": 6,
+    "/d_loadDir": 7,
+    "/d_freeAll": 8,
+    "/s_new": 9,
+    "/n_trace": 10,
+    "/n_free": 11,
+    "/n_run": 12,
+    "/n_cmd": 13,
+    "/n_map": 14,
+    "/n_set": 15,
+    "/n_setn": 16,
+    "/n_fill": 17,
+    "/n_before": 18,
+    "/n_after": 19,
+    "/u_cmd": 20,
+    "/g_new": 21,
+    "/g_head": 22,
+    "/g_tail": 23,
+    "/g_freeAll": 24,
+    "/c_set": 25,
+    "/c_setn": 26,
+    "/c_fill": 27,
+    "/b_alloc": 28,
+    "/b_allocRead": 29,
+    "/b_read": 30,
+    "/b_write": 31,
+    "/b_free": 32,
+    "/b_close": 33,
+    "/b_zero": 34,
+    "/b_set": 35,
+    "/b_setn": 36,
+    "/b_fill": 37,
+    "/b_gen": 38,
+    "/dumpOSC": 39,
+    "/c_get": 40,
+    "/c_getn": 41,
+    "/b_get": 42,
+    "/b_getn": 43,
+    "/s_get": 44,
+    "/s_getn": 45,
+    "/n_query": 46,
+    "/b_query": 47,
+    "/n_mapn": 48,
+    "/s_noid": 49,
+    "/g_deepFree": 50,
+    "/clearSched": 51,
+    "/sync": 52,
+    "/d_free": 53,
+    "/b_allocReadChannel": 54,
+    "/b_readChannel": 55,
+    "/g_dumpTree": 56,
+    "/g_queryTree": 57,
+    "/error": 58,
+    "/s_newargs": 59,
+    "/n_mapa": 60,
+    "/n_mapan": 61,
+    "/n_order": 62,
+}
+
+command_names = dict((n, a) for (a, n) in commands.items())
+
+numeric_addresses = False
+
+def command(address):
+    if numeric_addresses:
+        return commands.get(address, address)
+    else:
+        return address
 
 def msg(address, *args):
-    m = osc.OSCMessage(address)
+    m = osc.OSCMessage(command(address))
     for a in args:
         m.append(a)
     return m
 
+def template(address, typetags, frozen = None):
+    return osc.OSCTemplate(command(address), typetags, frozen)
+
+def setnChunks(address, args, start_index, values, max_size = None):
+    ## Splits a "set n values from start_index" command (like /b_setn
+    ## or /c_setn) into messages of at most max_size bytes each, so a
+    ## long run of values doesn't exceed what a UDP packet can carry.
+    ## args are the arguments preceding the start index.
+    if max_size is None:
+        max_size = osc.OSCClient.max_packet_size
+    head = msg(address, *(list(args) + [start_index, 0]))
+    ## every value takes 4 bytes, plus 1 byte of typetag (which pads
+    ## to at most 4 more)
+    count = (max_size - head.encodedSize() - 4) // 5
+    if count < 1:
+        raise osc.OSCError("%s doesn't fit in %d bytes" % (address, max_size))
+    msgs = []
+    for i in xrange(0, len(values), count):
+        chunk = values[i:i + count]
+        m = msg(address, *(list(args) + [start_index + i, len(chunk)]))
+        m.append(chunk, 'f')
+        msgs.append(m)
+    return msgs
+
+def c_setn(start_index, values):
+    m = msg("/c_setn", start_index, len(values))
+    m.append(values, 'f')
+    return m
+
+def c_setnChunks(start_index, values, max_size = None):
+    return setnChunks("/c_setn", [], start_index, values, max_size)
+
 def bundle(*msgs):
     b = osc.OSCBundle()
     for m in msgs:
@@ -19,4 +129,24 @@ def timedBundle(timeTag, *msgs):
     return b
 
 def delayedBundle(delta, *msgs):
-    return timedBundle(time.time() + delta, *msgs)
+    b = bundle(*msgs)
+    b.setDelayedTimeTag(delta)
+    return b
+
+def addMsgHandler(server, address, callback):
+    ## Like server.addMsgHandler(), but if a handler is already
+    ## registered for address, both are called (the earlier one
+    ## first), so helpers sharing a server (e.g. reply.Replies and
+    ## cluster.Cluster, which both want /status.reply) don't displace
+    ## each other. Returns the first reply either handler returns.
+    previous = server.callbacks.get(address)
+    if previous is None:
+        server.addMsgHandler(address, callback)
+        return
+    def both(addr, tags, data, client_address):
+        first = previous(addr, tags, data, client_address)
+        second = callback(addr, tags, data, client_address)
+        if first is not None:
+            return first
+        return second
+    server.addMsgHandler(address, both)
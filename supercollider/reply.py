@@ -0,0 +1,209 @@
+import supercollider.oscutil as oscutil
+import itertools
+import threading
+
+## scsynth answers asynchronous commands with /done (or /fail) and
+## queries with /synced, /b_info, /n_info or /status.reply. Replies
+## registers handlers for these with an OSCServer whose client talks
+## to scsynth, and hands out a Future per request, so callers can wait
+## for exactly the round-trip they need instead of sleeping:
+##
+##   server = osc.OSCServer(('localhost', 14641))
+##   threading.Thread(target = server.serve_forever).start()
+##   replies = Replies(server, ('localhost', 57110))
+##   replies.done(buf.allocRead(0, path)).result(5.0)
+##   replies.sync()
+##
+## Only commands scsynth answers can be waited for: /b_set, /b_setn,
+## /n_set and the like never get a /done, so result() on a Future
+## for one of them blocks forever unless given a timeout.
+
+class ReplyTimeout(Exception):
+    pass
+
+class CommandFailed(Exception):
+    pass
+
+class Future(object):
+    def __init__(self, key):
+        self.key = key
+        self._event = threading.Event()
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+        ## Guards _callbacks and the done-state, so each callback
+        ## runs exactly once however add_done_callback and the reply
+        ## interleave.
+        self._lock = threading.Lock()
+
+    def done(self):
+        return self._event.isSet()
+
+    def set_result(self, result):
+        self._finish(result, None)
+
+    def set_exception(self, exception):
+        self._finish(None, exception)
+
+    def _finish(self, result, exception):
+        self._lock.acquire()
+        try:
+            self._result = result
+            self._exception = exception
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        finally:
+            self._lock.release()
+        for callback in callbacks:
+            callback(self)
+
+    def add_done_callback(self, callback):
+        ## Called with the future as argument, from the server's
+        ## thread, once the reply arrives (or at once, if it has).
+        self._lock.acquire()
+        try:
+            if not self.done():
+                self._callbacks.append(callback)
+                return
+        finally:
+            self._lock.release()
+        callback(self)
+
+    def result(self, timeout = None):
+        ## Returns the reply's arguments, after waiting for at most
+        ## timeout seconds (forever if None, so only without a
+        ## timeout for commands scsynth is sure to answer).
+        if not self._event.wait(timeout):
+            raise ReplyTimeout('no reply to %s within %s s' % (self.key, timeout))
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+def _commandName(address):
+    ## Replies always name commands, even if sent by number.
+    return oscutil.command_names.get(address, address)
+
+class Replies(object):
+    def __init__(self, server, address = None):
+        ## server is the OSCServer receiving scsynth's replies (so its
+        ## client must be the one sending the requests); address is
+        ## scsynth's (host, port), or None if the client is connected.
+        self.server = server
+        self.address = address
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._sync_ids = itertools.count(1)
+        for reply in ['/done', '/fail', '/synced', '/b_info', '/n_info', '/status.reply']:
+            oscutil.addMsgHandler(server, reply, self._handler)
+
+    def send(self, msg):
+        if self.address is None:
+            self.server.client.send(msg)
+        else:
+            self.server.client.sendto(msg, self.address)
+
+    def expect(self, key):
+        ## Returns a Future for the next reply matching key, which is
+        ## a tuple of the reply's address and its identifying
+        ## arguments (see _keys()).
+        future = Future(key)
+        self._lock.acquire()
+        try:
+            self._pending.setdefault(key, []).append(future)
+        finally:
+            self._lock.release()
+        return future
+
+    def cancel(self, future):
+        self._lock.acquire()
+        try:
+            futures = self._pending.get(future.key, [])
+            if future in futures:
+                futures.remove(future)
+                if not futures:
+                    del self._pending[future.key]
+        finally:
+            self._lock.release()
+
+    def request(self, msg, key):
+        ## Sends msg, returning a Future for the reply matching key.
+        future = self.expect(key)
+        try:
+            self.send(msg)
+        except:
+            self.cancel(future)
+            raise
+        return future
+
+    def done(self, msg):
+        ## Sends an asynchronous command, returning a Future for its
+        ## /done. Buffer commands are told apart by buffer number.
+        name = _commandName(msg.address)
+        if name.startswith('/b_') and len(msg):
+            return self.request(msg, ('/done', name, msg[0]))
+        return self.request(msg, ('/done', name))
+
+    def sync(self, timeout = None):
+        ## Waits until scsynth has completed all asynchronous commands
+        ## sent before this call.
+        sync_id = self._sync_ids.next()
+        future = self.request(oscutil.msg("/sync", sync_id), ('/synced', sync_id))
+        try:
+            return future.result(timeout)
+        except ReplyTimeout:
+            self.cancel(future)
+            raise
+
+    def b_query(self, buffer_number):
+        ## Future for [bufnum, frames, channels, sample rate]
+        return self.request(oscutil.msg("/b_query", buffer_number), ('/b_info', buffer_number))
+
+    def n_query(self, node_id):
+        ## Future for [node, parent, previous, next, is group, ...]
+        return self.request(oscutil.msg("/n_query", node_id), ('/n_info', node_id))
+
+    def status(self):
+        ## Future for [1, ugens, synths, groups, synthdefs, average
+        ## cpu, peak cpu, nominal sample rate, actual sample rate]
+        return self.request(oscutil.msg("/status"), ('/status.reply',))
+
+    def _keys(self, address, data):
+        ## The keys a reply may have been expected under, most
+        ## specific first.
+        if address in ('/done', '/fail'):
+            if not data:
+                return []
+            name = _commandName(data[0])
+            if address == '/fail':
+                ## /fail command error [bufnum]
+                ids = data[2:3]
+            else:
+                ids = data[1:2]
+            if ids:
+                return [('/done', name, ids[0]), ('/done', name)]
+            return [('/done', name)]
+        if address == '/status.reply':
+            return [(address,)]
+        if data:
+            return [(address, data[0])]
+        return []
+
+    def _handler(self, address, tags, data, client_address):
+        future = None
+        self._lock.acquire()
+        try:
+            for key in self._keys(address, data):
+                futures = self._pending.get(key)
+                if futures:
+                    future = futures.pop(0)
+                    if not futures:
+                        del self._pending[key]
+                    break
+        finally:
+            self._lock.release()
+        if future is None:
+            return
+        if address == '/fail':
+            future.set_exception(CommandFailed(*data))
+        else:
+            future.set_result(data)
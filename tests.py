@@ -1,5 +1,22 @@
+import array
+import asyncore
+import os
+import socket
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
 import unittest
 import supercollider.buf
+import supercollider.cluster
+import supercollider.core
+import supercollider.node
+import supercollider.oscutil
+import supercollider.reply
+import supercollider.osc as osc
+from supercollider.oscutil import msg
 
 class TestBufferManager(unittest.TestCase):
     def setUp(self):
@@ -19,5 +36,1164 @@ class TestBufferManager(unittest.TestCase):
         self.assertEqual(self.m.freeset, set([]))
         self.assertEqual(self.m.next_unused, 0)
 
+class TestOSCMessageBuffer(unittest.TestCase):
+    def test_cached_binary_invalidated(self):
+        m = msg("/n_set", 1000)
+        b = m.getBinary()
+        self.assertTrue(m.getBinary() is b)
+        m.append(0.5)
+        self.assertEqual(m.getBinary(), msg("/n_set", 1000, 0.5).getBinary())
+        m.setAddress("/n_setn")
+        self.assertEqual(m.getBinary()[:8], "/n_setn\0")
+        self.assertEqual(m.typetags, ",if")
+        self.assertEqual(m.values(), [1000, 0.5])
+
+    def test_copy(self):
+        m = msg("/n_set", 1000, "freq", 440.0)
+        c = m.copy()
+        c.append(1)
+        self.assertEqual(len(m), 3)
+        self.assertEqual(len(c), 4)
+        self.assertNotEqual(m, c)
+
+class TestOSCMessageList(unittest.TestCase):
+    def test_docstring_example(self):
+        m = osc.OSCMessage("/my/osc/address")
+        m.append('something')
+        m.insert(0, 'something else')
+        m[1] = 'entirely'
+        m.extend([1, 2, 3.])
+        m += [4, 5, 6.]
+        del m[3:6]
+        self.assertEqual(m.pop(-2), 5)
+        self.assertEqual(m.values(), ['something else', 'entirely', 1, 6.0])
+        self.assertEqual(m.getBinary(),
+                         msg("/my/osc/address", 'something else', 'entirely', 1, 6.0).getBinary())
+
+    def test_indexing(self):
+        m = msg("/n_set", 1000, "freq", 440.0, "amp", 0.5)
+        self.assertEqual(m[0], 1000)
+        self.assertEqual(m[-1], 0.5)
+        self.assertEqual(m[1:3], ["freq", 440.0])
+        self.assertEqual(list(m), m.values())
+        self.assertEqual(list(reversed(m)), list(reversed(m.values())))
+        self.assertTrue("amp" in m)
+        self.assertEqual(m.index(440.0), 2)
+        self.assertRaises(IndexError, m.__getitem__, 5)
+
+    def test_patching(self):
+        m = msg("/n_set", 1000, "freq", 440.0)
+        m[1] = "frequency"
+        m.setItem(2, 3, 'f')
+        m.insert(1, ("i", 7))
+        self.assertEqual(m, msg("/n_set", 1000, 7, "frequency", 3.0))
+        m.remove(7)
+        del m[0]
+        self.assertEqual(m, msg("/n_set", "frequency", 3.0))
+        self.assertEqual(m.popitem(0), ('s', "frequency"))
+        self.assertEqual(m.items(), [('f', 3.0)])
+
+class TestDecodeOSC(unittest.TestCase):
+    def test_runs(self):
+        m = msg("/b_setn", 1, 0, 3, 0.5, 0.25, 0.125, "x", 7, 8)
+        self.assertEqual(osc.decodeOSC(m.getBinary()),
+                         ["/b_setn", ",iiifffsii", 1, 0, 3, 0.5, 0.25, 0.125, "x", 7, 8])
+
+    def test_blob_views(self):
+        m = msg("/d_recv")
+        m.append("abcdefgh", 'b')
+        m.append(3)
+        decoded = osc.decodeOSCBuffer(m.getBinary())
+        self.assertTrue(isinstance(decoded[2], memoryview))
+        self.assertEqual(decoded[2].tobytes(), "abcdefgh")
+        self.assertEqual(decoded[3], 3)
+        self.assertEqual(osc.decodeOSC(m.getBinary())[2], "abcdefgh")
+
+    def test_bundle(self):
+        inner = msg("/n_free", 1000).getBinary()
+        packet = osc.OSCString("#bundle") + struct.pack(">ii", 0, 1) + \
+            struct.pack(">i", len(inner)) + inner
+        self.assertEqual(osc.decodeOSC(packet), ["#bundle", 0.0, ["/n_free", ",i", 1000]])
+
+class TestArrayArguments(unittest.TestCase):
+    def test_array_run(self):
+        values = [0.5, 0.25, -1.0]
+        m = msg("/b_setn", 0, 0, 3)
+        m.append(array.array('d', values))
+        self.assertEqual(m, msg("/b_setn", 0, 0, 3, *values))
+        m = msg("/c_setn")
+        m.append(array.array('h', [1, -2]))
+        m.append(array.array('f', [1.5, 2.5]), 'i')
+        self.assertEqual(m, msg("/c_setn", 1, -2, 1, 2))
+
+    def test_buf_setn(self):
+        m = supercollider.buf.setn(1, 0, array.array('f', [0.5, 0.25]))
+        self.assertEqual(m.values(), [1, 0, 2, 0.5, 0.25])
+
+    @unittest.skipIf(osc.numpy is None, "numpy not available")
+    def test_numpy(self):
+        values = osc.numpy.arange(1000, dtype='float64')
+        m = msg("/b_setn", 0, 0, 1000)
+        m.append(values)
+        self.assertEqual(m.tags(), ['i'] * 3 + ['f'] * 1000)
+        decoded = osc.decodeOSC(m.getBinary(), min_array_run=4)
+        self.assertEqual(decoded[2:5], [0, 0, 1000])
+        self.assertTrue((decoded[5] == values).all())
+
+    @unittest.skipIf(osc.numpy is None, "numpy not available")
+    def test_numpy_read_only(self):
+        data = bytearray(msg("/b_setn", 0, 0, 4, 0.0, 1.0, 2.0, 3.0).getBinary())
+        decoded = osc.decodeOSCBuffer(data, min_array_run=4)
+        self.assertRaises(ValueError, decoded[5].__setitem__, 0, 99.0)
+
+    @unittest.skipIf(osc.numpy is None, "numpy not available")
+    def test_numpy_int_range(self):
+        m = msg("/c_setn")
+        self.assertRaises(osc.OSCError, m.append, osc.numpy.array([1, 2 ** 31], dtype='uint32'))
+        self.assertRaises(osc.OSCError, m.append, osc.numpy.array([1.0, float('nan')]), 'i')
+        self.assertEqual(len(m), 0)
+        m.append(osc.numpy.array([-2 ** 31, 2 ** 31 - 1], dtype='int64'))
+        self.assertEqual(m.values(), [-2 ** 31, 2 ** 31 - 1])
+
+class TestOSCBundle(unittest.TestCase):
+    def test_lazy_elements(self):
+        m = msg("/n_set", 1000, "freq", 440.0)
+        b = osc.OSCBundle()
+        b.append(m)
+        b.append({'addr': "/n_free", 'args': [1000]})
+        m.append(1)
+        self.assertEqual(len(b), 2)
+        self.assertEqual(b.values(), [msg("/n_set", 1000, "freq", 440.0), msg("/n_free", 1000)])
+        decoded = osc.decodeOSC(b.getBinary())
+        self.assertEqual(decoded[2:], [["/n_set", ",isf", 1000, "freq", 440.0],
+                                       ["/n_free", ",i", 1000]])
+
+    def test_nested_copy(self):
+        inner = osc.OSCBundle()
+        inner.append(msg("/n_free", 1000))
+        outer = osc.OSCBundle()
+        outer.append(inner)
+        c = outer.copy()
+        c.append(msg("/status"))
+        self.assertEqual(len(outer), 1)
+        self.assertEqual(c.values()[0], inner)
+        self.assertEqual(osc.decodeOSC(outer.getBinary())[2][2], ["/n_free", ",i", 1000])
+
+    def test_prefix(self):
+        b = osc.OSCBundle()
+        b.append(msg("/n_free", 1000))
+        out = osc.OSCMultiClient()._prefixAddress("/pre", b)
+        self.assertEqual(out.values()[0].address, "/pre/n_free")
+        self.assertEqual(b.values()[0].address, "/n_free")
+
+class TestTimeTags(unittest.TestCase):
+    def test_fixed_point(self):
+        b = osc.OSCBundle(time=1.5)
+        self.assertEqual(b.getBinary()[8:16], struct.pack(">LL", osc.seconds1900To1970 + 1, 2 ** 31))
+        self.assertEqual(osc.decodeOSC(b.getBinary())[1], 1.5)
+        self.assertEqual(osc.OSCBundle().getBinary()[8:16], struct.pack(">LL", 0, 1))
+
+    def test_round_trip(self):
+        t = 1400000000.123456
+        self.assertAlmostEqual(osc.decodeOSC(osc.OSCBundle(time=t).getBinary())[1], t, 6)
+        m = msg("/t")
+        m.append(t, 't')
+        self.assertAlmostEqual(osc.decodeOSC(m.getBinary())[2], t, 6)
+
+    def test_clock(self):
+        ticks = [100.0]
+        clock = osc.OSCClock(lambda: ticks[0])
+        start = clock.ntp()
+        ticks[0] += 0.25
+        self.assertEqual(clock.ntp(0.5) - start, 3 * 2 ** 30)
+        b = supercollider.oscutil.delayedBundle(1.0, msg("/n_free", 1000))
+        self.assertAlmostEqual(b.getNTPTimeTag() / 2.0 ** 32,
+                               osc.seconds1900To1970 + time.time() + 1.0, 1)
+
+class TestSegments(unittest.TestCase):
+    def test_message_blob(self):
+        inner = msg("/s_new", "s", 1000, 0, 1)
+        m = msg("/d_recv")
+        m.append("SCgf", 'b')
+        m.append(inner, 'b')
+        expected = msg("/d_recv")
+        expected.append("SCgf", 'b')
+        expected.append(inner.getBinary(), 'b')
+        self.assertEqual(m.getBinary(), expected.getBinary())
+        self.assertEqual(str(osc.joinSegments(m.getSegments())), m.getBinary())
+
+    def test_bundle_segments(self):
+        b = osc.OSCBundle()
+        b.append(msg("/n_free", 1000))
+        b.append(msg("/d_recv", "x" * 1000))
+        commands = supercollider.oscutil.commands
+        self.assertEqual(str(osc.joinSegments(b.getSegments(commands))), b.getBinary(commands))
+        self.assertEqual(str(osc.joinSegments(b.getSegments())), b.getBinary())
+
+    def test_send(self):
+        r = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        r.bind(('127.0.0.1', 0))
+        c = osc.OSCClient()
+        c.connect(r.getsockname())
+        m = msg("/d_recv")
+        m.append("x" * 20000, 'b')
+        c.send(m)
+        self.assertEqual(r.recv(65536), m.getBinary())
+        c.close()
+        r.close()
+
+    def test_sendto_unconnected(self):
+        r = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        r.bind(('127.0.0.1', 0))
+        c = osc.OSCClient()
+        c.sendto(msg("/status"), r.getsockname())
+        self.assertEqual(r.recv(65536), msg("/status").getBinary())
+        self.assertEqual(c.address(), None)
+        c.close()
+        r.close()
+
+class TestAsyncClient(unittest.TestCase):
+    def setUp(self):
+        self.map = {}
+        self.r = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.r.bind(('127.0.0.1', 0))
+        self.client = osc.OSCAsyncClient(self.r.getsockname(), map=self.map)
+
+    def tearDown(self):
+        self.client.close()
+        self.r.close()
+
+    def test_send(self):
+        self.client.send(msg("/status"))
+        self.client.send_at(msg("/n_free", 1000), 1400000000.5)
+        self.assertEqual(self.r.recv(65536), msg("/status").getBinary())
+        decoded = osc.decodeOSC(self.r.recv(65536))
+        self.assertEqual(decoded[1], 1400000000.5)
+        self.assertEqual(decoded[2], ["/n_free", ",i", 1000])
+
+    def test_queue_and_reply(self):
+        replies = []
+        self.client.callback = lambda decoded, address: replies.append(decoded)
+        self.client._queue.append((msg("/queued").getBinary(), self.r.getsockname()))
+        self.client.send(msg("/status"))
+        self.assertEqual(self.client.pending(), 2)
+        asyncore.loop(0.1, map=self.map, count=1)
+        self.assertEqual(self.client.pending(), 0)
+        self.assertEqual(self.r.recv(65536), msg("/queued").getBinary())
+        data, address = self.r.recvfrom(65536)
+        self.r.sendto(msg("/status.reply", 1).getBinary(), address)
+        asyncore.loop(0.1, map=self.map, count=1)
+        self.assertEqual(replies, [["/status.reply", ",i", 1]])
+
+    def test_bad_packet_keeps_client_open(self):
+        replies = []
+        errors = []
+        def callback(decoded, address):
+            if decoded[2] == 0:
+                raise ValueError(decoded)
+            replies.append(decoded[2])
+        self.client.callback = callback
+        self.client.handle_packet_error = lambda data, address: errors.append(sys.exc_info()[0])
+        self.client.send(msg("/status"))
+        data, address = self.r.recvfrom(65536)
+        for packet in ("/trunc", msg("/status.reply", 0).getBinary(), msg("/status.reply", 1).getBinary()):
+            self.r.sendto(packet, address)
+            asyncore.loop(0.1, map=self.map, count=1)
+        self.assertEqual(errors, [osc.OSCError, ValueError])
+        self.assertEqual(replies, [1])
+        self.assertTrue(self.client.fileno() in self.map)
+
+class TestMultiClient(unittest.TestCase):
+    def setUp(self):
+        self.r = []
+        for i in range(3):
+            r = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            r.bind(('127.0.0.1', 0))
+            r.settimeout(1.0)
+            self.r.append(r)
+        self.client = osc.OSCMultiClient()
+        self.client.setOSCTarget(self.r[0].getsockname())
+        self.client.setOSCTarget(self.r[1].getsockname())
+        self.client.setOSCTarget(self.r[2].getsockname(), "/a", {'/n_free': False})
+
+    def tearDown(self):
+        self.client.close()
+        for r in self.r:
+            r.close()
+
+    def test_integer_address(self):
+        self.client.send(osc.OSCMessage(12))
+        for r in self.r:
+            self.assertEqual(osc.decodeOSC(r.recv(65536)), [12, ","])
+
+    def test_groups(self):
+        self.assertEqual(sorted(len(g[3]) for g in self.client._targetGroups()), [1, 2])
+        b = osc.OSCBundle()
+        b.append(msg("/n_set", 1, "freq", 440.0))
+        b.append(msg("/n_free", 1))
+        self.client.send(b)
+        self.client.send(msg("/n_free", 2))
+        self.client.send(msg("/status"))
+        self.assertEqual(self.r[0].recv(65536), b.getBinary())
+        self.assertEqual(self.r[1].recv(65536), b.getBinary())
+        self.assertEqual(osc.decodeOSC(self.r[2].recv(65536))[2:], [["/a/n_set", ",isf", 1, "freq", 440.0]])
+        self.assertEqual(osc.decodeOSC(self.r[2].recv(65536)), ["/a/status", ","])
+        self.assertEqual(len(self.client._filter_cache), 3)
+
+class TestStats(unittest.TestCase):
+    def test_client(self):
+        r = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        r.bind(('127.0.0.1', 0))
+        address = r.getsockname()
+        client = osc.OSCClient()
+        stats = osc.OSCStats()
+        traced = []
+        stats.addTrace(lambda *args: traced.append(args))
+        client.setStats(stats)
+        try:
+            b = osc.OSCBundle()
+            b.append(msg("/n_free", 1))
+            b.append(msg("/n_free", 2))
+            client.sendto(msg("/status"), address)
+            client.sendto(b, address)
+            self.assertRaises(osc.OSCClientError, client.sendto, msg("/d_recv", "x" * 70000), address)
+        finally:
+            client.close()
+            r.close()
+        key = "127.0.0.1:%d" % address[1]
+        d = stats.asDict()
+        self.assertEqual(d['addresses'].keys(), [key])
+        total = d['total']
+        self.assertEqual((total['packets'], total['messages'], total['errors'], total['dropped']), (2, 3, 1, 0))
+        self.assertEqual(total['bytes'], len(msg("/status").getBinary()) + len(b.getBinary()))
+        self.assertEqual(total['wait_time']['count'], 2)
+        self.assertEqual(sum(c for (bound, c) in total['encode_time']['buckets']), 2)
+        self.assertEqual(d['osc_addresses'], {
+            "/status": {'messages': 1, 'bytes': len(msg("/status").getBinary())},
+            "/n_free": {'messages': 2, 'bytes': 2 * len(msg("/n_free", 1).getBinary())}})
+        self.assertEqual([t[0] for t in traced], [address] * 3)
+        self.assertTrue(isinstance(traced[-1][5], osc.OSCClientError))
+
+    def test_connected_with_address_map(self):
+        r = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        r.bind(('127.0.0.1', 0))
+        address = r.getsockname()
+        client = osc.OSCClient()
+        client.socket.connect(address)  # connected without connect(), as by a server
+        client.setAddressMap({"/n_free": 11})
+        stats = osc.OSCStats()
+        client.setStats(stats)
+        try:
+            client.send(msg("/n_free", 1))
+            self.assertEqual(len(r.recv(65536)), 12)
+        finally:
+            client.close()
+            r.close()
+        d = stats.asDict()
+        self.assertEqual(d['addresses'].keys(), ["127.0.0.1:%d" % address[1]])
+        self.assertEqual(d['osc_addresses'], {"/n_free": {'messages': 1, 'bytes': 12}})
+        self.assertEqual(d['total']['bytes'], 12)
+
+    def test_dropped(self):
+        class TimingOutClient(osc.OSCClient):
+            def sendBinary(self, binary, address=None, timeout=None):
+                raise osc.OSCClientTimeout("Timed out waiting for file descriptor")
+        client = TimingOutClient()
+        stats = osc.OSCStats()
+        client.setStats(stats)
+        try:
+            self.assertRaises(osc.OSCClientTimeout, client.sendto, msg("/status"), ('127.0.0.1', 57110), 0.01)
+        finally:
+            client.close()
+        total = stats.asDict()['total']
+        self.assertEqual((total['errors'], total['dropped']), (0, 1))
+
+    def test_multi_client(self):
+        r = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for i in range(2)]
+        client = osc.OSCMultiClient()
+        stats = osc.OSCStats()
+        client.setStats(stats)
+        try:
+            for s in r:
+                s.bind(('127.0.0.1', 0))
+                client.setOSCTarget(s.getsockname())
+            client.send(msg("/status"))
+        finally:
+            client.close()
+            for s in r:
+                s.close()
+        d = stats.asDict()
+        self.assertEqual(d['total']['packets'], 2)
+        self.assertEqual(d['total']['encode_time']['count'], 1)
+        self.assertEqual(sorted(a['packets'] for a in d['addresses'].values()), [1, 1])
+
+class FakeClient(object):
+    def __init__(self):
+        self.sent = []
+
+    def sendBinary(self, binary, address=None):
+        self.sent.append(osc.decodeOSC(binary))
+
+class TestCoalescer(unittest.TestCase):
+    def test_mtu(self):
+        client = FakeClient()
+        c = osc.OSCCoalescer(client, mtu=160)
+        with c:
+            for i in range(6):
+                c.send(msg("/n_set", i, "freq", 440.0))
+            self.assertEqual(len(client.sent), 1)
+            self.assertEqual(c.pending(), 2)
+        self.assertEqual([len(b) - 2 for b in client.sent], [4, 2])
+        self.assertEqual(client.sent[1][3], ["/n_set", ",isf", 5, "freq", 440.0])
+        c.send(msg("/d_recv", "x" * 200))
+        self.assertEqual(client.sent[2][0], "/d_recv")
+
+    def test_urgent_and_window(self):
+        client = FakeClient()
+        c = osc.OSCCoalescer(client, window=0.01)
+        c.send(msg("/n_set", 1, "freq", 440.0))
+        c.send(msg("/n_free", 1), urgent=True)
+        self.assertEqual(client.sent[0][0], "#bundle")
+        c.send(msg("/status"))
+        time.sleep(0.1)
+        self.assertEqual(client.sent[1], ["/status", ","])
+        self.assertEqual(c.pending(), 0)
+
+    def test_stale_window(self):
+        client = FakeClient()
+        c = osc.OSCCoalescer(client, window=10.0)
+        c.send(msg("/n_set", 1, "freq", 440.0))
+        generation = c._generation
+        c.flush()
+        c.send(msg("/n_free", 1))
+        # the first bundle's timer, firing after that bundle was flushed
+        c._expire(generation)
+        self.assertEqual((len(client.sent), c.pending()), (1, 1))
+        c._expire(c._generation)
+        self.assertEqual((len(client.sent), c.pending()), (2, 0))
+
+    def test_send_outside_lock(self):
+        client = HeldClient()
+        c = osc.OSCCoalescer(client)
+        sender = threading.Thread(target=c.send, args=(msg("/n_free", 1),), kwargs={'urgent': True})
+        sender.start()
+        time.sleep(0.05)    # the sender now waits in sendBinary
+        c.send(msg("/n_free", 2))
+        # collected while the first datagram is still being sent
+        self.assertEqual((client.sent, c.pending()), ([], 1))
+        client.release.set()
+        sender.join()
+        c.flush()
+        self.assertEqual([m[2] for m in client.sent], [1, 2])
+
+class HeldClient(FakeClient):
+    """A FakeClient whose sends wait until released"""
+    def __init__(self):
+        FakeClient.__init__(self)
+        self.release = threading.Event()
+
+    def sendBinary(self, binary, address=None):
+        self.release.wait(5.0)
+        FakeClient.sendBinary(self, binary, address)
+
+class TestSendQueue(unittest.TestCase):
+    def test_priority(self):
+        client = HeldClient()
+        queue = osc.OSCSendQueue(client)
+        queue.send(msg("/b_setn", 0, 0, 1, 0.5), bulk=True)
+        time.sleep(0.05)    # the sending thread now holds the first bulk packet
+        queue.send(msg("/b_setn", 0, 1, 1, 0.5), bulk=True)
+        queue.send(msg("/n_set", 1000, "freq", 440.0))
+        client.release.set()
+        queue.flush(5.0)
+        self.assertEqual([(m[0], m[3]) for m in client.sent], [("/b_setn", 0), ("/n_set", "freq"), ("/b_setn", 1)])
+        queue.close()
+
+    def test_overflow(self):
+        client = HeldClient()
+        queue = osc.OSCSendQueue(client, max_depth=2, overflow='replace')
+        queue.send(msg("/status"))
+        time.sleep(0.05)
+        queue.send(msg("/n_set", 1000, "freq", 440.0))
+        queue.send(msg("/n_set", 1000, "amp", 0.5))
+        queue.send(msg("/n_set", 1000, "freq", 880.0))
+        self.assertEqual(queue.replaced, 1)
+        self.assertRaises(osc.OSCClientTimeout, queue.send, msg("/n_free", 1000), timeout=0.05)
+        queue.overflow = 'raise'
+        self.assertRaises(osc.OSCClientError, queue.send, msg("/n_set", 1000, "amp", 0.1))
+        client.release.set()
+        queue.close()
+        self.assertEqual([m[3:] for m in client.sent[1:]], [["amp", 0.5], ["freq", 880.0]])
+
+    def test_split_bundle_all_or_nothing(self):
+        client = HeldClient()
+        client.max_packet_size = 64
+        queue = osc.OSCSendQueue(client, max_depth=3, overflow='raise')
+        queue.send(msg("/status"))
+        time.sleep(0.05)    # the sending thread now holds /status
+        queue.send(msg("/n_free", 1))
+        b = osc.OSCBundle()
+        for i in range(3):
+            b.append(msg("/n_set", i, "freq", 440.0))
+        self.assertRaises(osc.OSCClientError, queue.send, b)
+        self.assertEqual(queue.pending(), (1, 0))
+        queue.overflow = 'block'
+        self.assertRaises(osc.OSCClientTimeout, queue.send, b, timeout=0.05)
+        self.assertEqual(queue.pending(), (1, 0))
+        client.release.set()
+        queue.send(b, timeout=1.0)
+        queue.close()
+        self.assertEqual([m[0] for m in client.sent], ["/status", "/n_free"] + ["#bundle"] * 3)
+
+    def test_bulk_rate(self):
+        client = FakeClient()
+        queue = osc.OSCSendQueue(client, bulk_rate=20000)
+        queue.bulk_burst = 0
+        queue._allowance = 0
+        start = time.time()
+        for i in range(3):
+            queue.send(msg("/d_recv", "x" * 1000), bulk=True)
+        queue.flush(5.0)
+        self.assertTrue(time.time() - start >= 0.09)
+        queue.close()
+
+class TestPacketSize(unittest.TestCase):
+    def test_encoded_size(self):
+        commands = supercollider.oscutil.commands
+        for m in [msg(""), msg("/abc"), msg("/n_set", 1, "freq", 440.0), msg("/d_recv", "x" * 13)]:
+            self.assertEqual(m.encodedSize(), len(m.getBinary()))
+            self.assertEqual(m.encodedSize(commands), len(m.getBinary(commands)))
+        b = supercollider.oscutil.bundle(msg("/n_free", 1), supercollider.oscutil.bundle(msg("/abcde")))
+        self.assertEqual(b.encodedSize(), len(b.getBinary()))
+        self.assertEqual(b.encodedSize(commands), len(b.getBinary(commands)))
+
+    def test_split(self):
+        inner = supercollider.oscutil.bundle(*[msg("/n_free", i) for i in range(10)])
+        b = supercollider.oscutil.timedBundle(1400000000.5, msg("/status"), inner)
+        parts = b.split(100)
+        self.assertTrue(len(parts) > 1)
+        flattened = []
+        for part in parts:
+            binary = part.getBinary()
+            self.assertTrue(len(binary) <= 100)
+            self.assertEqual(part.getNTPTimeTag(), b.getNTPTimeTag())
+            for element in osc.decodeOSC(binary)[2:]:
+                if element[0] == "#bundle":
+                    flattened.extend(element[2:])
+                else:
+                    flattened.append(element)
+        self.assertEqual(flattened, [["/status", ","]] + [["/n_free", ",i", i] for i in range(10)])
+        self.assertRaises(osc.OSCError, b.split, 20)
+
+    def test_client_limit(self):
+        r = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        r.bind(('127.0.0.1', 0))
+        c = osc.OSCClient()
+        c.max_packet_size = 48
+        c.connect(r.getsockname())
+        self.assertRaises(osc.OSCClientError, c.send, msg("/d_recv", "x" * 100))
+        c.send(supercollider.oscutil.bundle(msg("/n_free", 1), msg("/n_free", 2)))
+        self.assertEqual(osc.decodeOSC(r.recv(65536))[2:], [["/n_free", ",i", 1]])
+        self.assertEqual(osc.decodeOSC(r.recv(65536))[2:], [["/n_free", ",i", 2]])
+        c.close()
+        r.close()
+
+    def test_setn_chunks(self):
+        values = array.array('f', range(100))
+        msgs = supercollider.buf.setnChunks(3, 10, values, 128)
+        decoded = [osc.decodeOSC(m.getBinary()) for m in msgs]
+        self.assertTrue(all(len(m.getBinary()) <= 128 for m in msgs))
+        self.assertEqual(decoded[1][2:5], [3, 10 + decoded[0][4], decoded[1][4]])
+        self.assertEqual(sum([d[5:] for d in decoded], []), list(values))
+        self.assertEqual(len(supercollider.oscutil.c_setnChunks(0, values)), 1)
+
+    def test_d_recv_fallback(self):
+        directory = tempfile.mkdtemp()
+        try:
+            sd = supercollider.core.SynthDef("big", [('freq', 440)])
+            m = supercollider.core.d_recv([sd], max_size=16, directory=directory)
+            self.assertEqual(m.address, "/d_load")
+            with open(m[0], 'rb') as f:
+                self.assertEqual(f.read(), supercollider.core.compileDefs([sd]))
+            self.assertEqual(supercollider.core.d_recv([sd]).address, "/d_recv")
+            # sent again, it replaces its file
+            self.assertEqual(supercollider.core.d_recv([sd], max_size=16, directory=directory)[0], m[0])
+            self.assertEqual(os.listdir(directory), [os.path.basename(m[0])])
+            sd = supercollider.core.SynthDef("../escape", [('freq', 440)])
+            path = supercollider.core.d_recv([sd], max_size=16, directory=directory)[0]
+            self.assertEqual(os.path.dirname(path), directory)
+            self.assertFalse("escape" in path)
+            default = supercollider.core.d_recv([sd], max_size=16)[0]
+            self.assertEqual(os.path.dirname(default), supercollider.core._defsDirectory())
+        finally:
+            shutil.rmtree(directory)
+
+class TestStream(unittest.TestCase):
+    def test_decoder(self):
+        packets = [msg("/status").getBinary(), msg("/d_recv", "x" * 1000).getBinary()]
+        stream = ''.join([struct.pack(">i", len(p)) + p for p in packets])
+        decoder = osc.OSCStreamDecoder()
+        received = []
+        for i in range(0, len(stream), 7):
+            received.extend(decoder.feed(stream[i:i + 7]))
+        self.assertEqual(received, packets)
+        self.assertEqual(decoder.pending(), 0)
+        self.assertRaises(osc.OSCError, osc.OSCStreamDecoder(100).feed, struct.pack(">i", 101))
+
+    def test_round_trip(self):
+        server = osc.OSCStreamServer(('127.0.0.1', 0))
+        server.addMsgHandler("/echo", lambda addr, tags, data, source: msg("/echoed", len(data[0])))
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            client = osc.OSCStreamClient(server.address(), buffer_size=4096)
+            client.send(msg("/echo", "x" * 100000))
+            client.send(msg("/echo", "y"))
+            received = []
+            while len(received) < 2:
+                received.extend(client.receive(5.0))
+            self.assertEqual(received, [["/echoed", ",i", 100000], ["/echoed", ",i", 1]])
+            client.close()
+        finally:
+            server.close()
+            thread.join()
+
+class TestUnix(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "osc.sock")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        server = osc.OSCUnixServer(self.path)
+        server.addMsgHandler("/echo", lambda addr, tags, data, source: msg("/echoed", len(data[0])))
+        client = osc.OSCUnixClient()
+        try:
+            client.sendto(msg("/echo", "x" * 50000), self.path)
+            server.handle_request()
+            client.socket.settimeout(1.0)
+            self.assertEqual(osc.decodeOSC(client.socket.recv(65536)), ["/echoed", ",i", 50000])
+        finally:
+            client.close()
+            server.close()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_relay(self):
+        scsynth = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        scsynth.bind(('127.0.0.1', 0))
+        relay = osc.OSCUnixRelay(self.path, scsynth.getsockname())
+        client = osc.OSCUnixClient()
+        try:
+            client.connect(self.path)
+            client.send(msg("/status"))
+            relay.handle_request(1.0)
+            data, address = scsynth.recvfrom(65536)
+            self.assertEqual(data, msg("/status").getBinary())
+            scsynth.sendto(msg("/status.reply", 1).getBinary(), address)
+            relay.handle_request(1.0)
+            client.socket.settimeout(1.0)
+            self.assertEqual(osc.decodeOSC(client.socket.recv(65536)), ["/status.reply", ",i", 1])
+        finally:
+            client.close()
+            relay.close()
+            scsynth.close()
+
+class TestReplies(unittest.TestCase):
+    def setUp(self):
+        self.scsynth = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.scsynth.bind(('127.0.0.1', 0))
+        self.server = osc.OSCServer(('127.0.0.1', 0))
+        self.replies = supercollider.reply.Replies(self.server, self.scsynth.getsockname())
+
+    def tearDown(self):
+        self.server.close()
+        self.scsynth.close()
+
+    def reply(self, *msgs):
+        data, address = self.scsynth.recvfrom(65536)
+        for m in msgs:
+            self.scsynth.sendto(m.getBinary(), address)
+            self.server.handle_request()
+        return osc.decodeOSC(data)
+
+    def test_callbacks_run_once(self):
+        future = supercollider.reply.Future(('/synced', 1))
+        called = []
+        future.add_done_callback(called.append)
+        threads = [threading.Thread(target=future.add_done_callback, args=(called.append,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        future.set_result([1])
+        for thread in threads:
+            thread.join()
+        future.add_done_callback(called.append)
+        self.assertEqual(called, [future] * 22)
+        self.assertEqual(future.result(0), [1])
+
+    def test_done_and_fail(self):
+        loaded = self.replies.done(supercollider.buf.allocRead(1, "a.wav"))
+        other = self.replies.done(supercollider.buf.allocRead(2, "b.wav"))
+        self.assertEqual(self.reply(msg("/done", "/b_allocRead", 2))[:3], ["/b_allocRead", ",isii", 1])
+        self.assertFalse(loaded.done())
+        self.assertEqual(other.result(0), ["/b_allocRead", 2])
+        self.reply(msg("/fail", "/b_allocRead", "File not found", 1))
+        self.assertRaises(supercollider.reply.CommandFailed, loaded.result, 0)
+        self.assertRaises(supercollider.reply.ReplyTimeout, self.replies.status().result, 0)
+
+    def test_queries(self):
+        info = self.replies.b_query(3)
+        self.reply(msg("/b_info", 3, 44100, 2, 44100.0))
+        self.assertEqual(info.result(0), [3, 44100, 2, 44100.0])
+        status = self.replies.status()
+        self.reply(msg("/status.reply", 1, 0, 0, 1, 3))
+        self.assertEqual(status.result(0), [1, 0, 0, 1, 3])
+
+    def test_sync(self):
+        def scsynth():
+            data, address = self.scsynth.recvfrom(65536)
+            self.scsynth.sendto(msg("/synced", osc.decodeOSC(data)[2]).getBinary(), address)
+            self.server.handle_request()
+        # answer a /sync, once the first one has timed out
+        self.assertRaises(supercollider.reply.ReplyTimeout, self.replies.sync, 0)
+        self.assertEqual(osc.decodeOSC(self.scsynth.recv(65536)), ["/sync", ",i", 1])
+        thread = threading.Thread(target=scsynth)
+        thread.start()
+        self.replies.sync(5.0)
+        thread.join()
+
+class TestCluster(unittest.TestCase):
+    def setUp(self):
+        self.scsynths = []
+        for i in range(2):
+            r = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            r.bind(('127.0.0.1', 0))
+            self.scsynths.append(r)
+        self.server = osc.OSCServer(('127.0.0.1', 0))
+        self.cluster = supercollider.cluster.Cluster([r.getsockname() for r in self.scsynths],
+                                                     self.server)
+
+    def tearDown(self):
+        self.server.close()
+        for r in self.scsynths:
+            r.close()
+
+    def received(self, i):
+        return osc.decodeOSC(self.scsynths[i].recv(65536))
+
+    def test_placement(self):
+        self.cluster.broadcast(msg("/d_recv", "x"))
+        self.assertEqual([self.received(i)[0] for i in range(2)], ["/d_recv", "/d_recv"])
+        nodes = [supercollider.node.Node("s") for i in range(3)]
+        homes = [self.cluster.s_new(n) for n in nodes]
+        self.assertEqual(homes, [r.getsockname() for r in self.scsynths + self.scsynths[:1]])
+        self.assertEqual(self.received(0)[:3], ["/s_new", ",siii", "s"])
+        self.cluster.send(nodes[1], nodes[1].set("freq", 440).n_set())
+        self.received(1)
+        self.assertEqual(self.received(1)[2:], [nodes[1].id, "freq", 440.0])
+        self.cluster.n_free(nodes[1])
+        self.assertEqual(self.received(1), ["/n_free", ",i", nodes[1].id])
+        load = self.cluster.load()
+        self.assertEqual([load[r.getsockname()]['nodes'] for r in self.scsynths], [2, 0])
+        self.assertRaises(KeyError, self.cluster.home, nodes[1])
+
+    def test_status_and_n_end(self):
+        self.cluster.policy = 'cpu'
+        n = supercollider.node.Node("s")
+        self.assertEqual(self.cluster.s_new(n), self.scsynths[0].getsockname())
+        self.scsynths[0].sendto(msg("/status.reply", 1, 0, 1, 1, 1, 50.0, 60.0).getBinary(),
+                                self.server.address())
+        self.server.handle_request()
+        self.assertEqual(self.cluster.load()[self.scsynths[0].getsockname()]['avg_cpu'], 50.0)
+        self.scsynths[0].sendto(msg("/n_end", n.id).getBinary(), self.server.address())
+        self.server.handle_request()
+        self.assertEqual(self.cluster.load()[self.scsynths[0].getsockname()]['nodes'], 0)
+
+    def test_cpu_between_polls(self):
+        self.cluster.policy = 'cpu'
+        # one synth (not ours) costs 10% on the first server; the second isn't polled yet
+        self.scsynths[0].sendto(msg("/status.reply", 1, 0, 1, 1, 1, 10.0, 12.0).getBinary(),
+                                self.server.address())
+        self.server.handle_request()
+        self.assertEqual(self.cluster.node_cpu(), 10.0)
+        homes = [self.cluster.s_new(supercollider.node.Node("s")) for i in range(4)]
+        # estimates (first, second): (10, 0) -> (10, 10) -> (20, 10) -> (20, 20)
+        self.assertEqual(homes, [r.getsockname() for r in [self.scsynths[1], self.scsynths[0]] * 2])
+
+    def test_shared_with_replies(self):
+        replies = supercollider.reply.Replies(self.server, self.scsynths[0].getsockname())
+        future = replies.status()
+        self.received(0)
+        self.scsynths[0].sendto(msg("/status.reply", 1, 0, 1, 1, 1, 25.0, 30.0).getBinary(),
+                                self.server.address())
+        self.server.handle_request()
+        self.assertEqual(future.result(1.0)[5], 25.0)
+        self.assertEqual(self.cluster.load()[self.scsynths[0].getsockname()]['avg_cpu'], 25.0)
+
+class TestCommandNumbers(unittest.TestCase):
+    def tearDown(self):
+        supercollider.oscutil.numeric_addresses = False
+
+    def test_msg(self):
+        supercollider.oscutil.numeric_addresses = True
+        n = supercollider.node.Node("s", 1234)
+        m = n.n_set()
+        self.assertEqual(m.address, 15)
+        self.assertEqual(m.getBinary(), struct.pack(">i", 15) + ",i\0\0" + struct.pack(">i", 1234))
+        self.assertEqual(osc.decodeOSC(m.getBinary()), [15, ",i", 1234])
+        self.assertEqual(supercollider.buf.free(0).address, 32)
+        self.assertEqual(n.n_set_template([]).getBinary(), m.getBinary())
+
+    def test_address_map(self):
+        m = msg("/n_free", 1234)
+        b = osc.OSCBundle()
+        b.append(m)
+        mapped = b.getBinary(supercollider.oscutil.commands)
+        self.assertEqual(osc.decodeOSC(mapped)[2], [11, ",i", 1234])
+        self.assertEqual(osc.decodeOSC(b.getBinary())[2], ["/n_free", ",i", 1234])
+        self.assertEqual(osc.decodeOSC(msg("", 1).getBinary()), ["", ",i", 1])
+
+class TestAddressSpace(unittest.TestCase):
+    def setUp(self):
+        self.space = osc.OSCAddressSpace()
+        for address in ["/n_go", "/n_end", "/node/1/freq", "/node/2/freq", "/node/10/amp", "/b.info", "default"]:
+            self.space[address] = address
+
+    def match(self, pattern):
+        return sorted(self.space.match(pattern))
+
+    def test_integer_address(self):
+        self.assertEqual(self.match(12), [])
+        self.space[12] = "n_go"
+        self.assertEqual(self.match(12), [12])
+        self.assertEqual(self.match("/n_*"), ["/n_end", "/n_go"])
+
+    def test_match(self):
+        self.assertEqual(self.match("/n_go"), ["/n_go"])
+        self.assertEqual(self.match("/n_*"), ["/n_end", "/n_go"])
+        self.assertEqual(self.match("/n_???"), ["/n_end"])
+        self.assertEqual(self.match("/node/*"), [])
+        self.assertEqual(self.match("/node/*/freq"), ["/node/1/freq", "/node/2/freq"])
+        self.assertEqual(self.match("/node/[0-1]*/*"), ["/node/1/freq", "/node/10/amp"])
+        self.assertEqual(self.match("/node/[!1]/freq"), ["/node/2/freq"])
+        self.assertEqual(self.match("/node/{2,10}/{freq,amp}"), ["/node/10/amp", "/node/2/freq"])
+        self.assertEqual(self.match("/b?info"), ["/b.info"])
+        self.assertEqual(self.match("/b.inf?"), ["/b.info"])
+        self.assertEqual(self.match("/bxinf?"), [])
+        self.assertEqual(self.match("/n_go/*"), [])
+
+    def test_changes(self):
+        self.assertEqual(self.match("/n_*"), ["/n_end", "/n_go"])
+        del self.space["/n_go"]
+        self.space.update({"/n_on": None})
+        self.assertEqual(self.match("/n_*"), ["/n_end", "/n_on"])
+        self.space.pattern_cache_size = 2
+        for pattern in ["/n_*", "/n_o?", "/n_e*"]:
+            self.space.match(pattern)
+        self.assertEqual(self.space._patterns.keys(), ["n_o?", "n_e*"])
+
+    def test_dispatch(self):
+        server = osc.OSCServer(('127.0.0.1', 0))
+        try:
+            received = []
+            server.addMsgHandler("/node/1/freq", lambda *args: received.append(args[:3]))
+            handler = FakeHandler(server)
+            handler.dispatchMessage("/node/{1,2}/freq", "f", [440.0])
+            self.assertEqual(received, [("/node/{1,2}/freq", "f", [440.0])])
+            self.assertRaises(osc.NoCallbackError, handler.dispatchMessage, "/node/2/freq", "f", [440.0])
+        finally:
+            server.close()
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.server = osc.OSCServer(('127.0.0.1', 0))
+        self.received = []
+        self.server.addMsgHandler("default", lambda addr, tags, data, source: self.received.append(addr))
+        self.client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def tearDown(self):
+        self.server.close()
+        self.client.close()
+
+    def send(self, m):
+        self.client.sendto(m.getBinary(), self.server.address())
+        self.server.handle_request()
+
+    def bundle(self, address, delay):
+        b = osc.OSCBundle()
+        b.setTimeTag(time.time() + delay)
+        b.append(msg(address))
+        return b
+
+    def test_future_bundle(self):
+        self.send(self.bundle("/later", 0.1))
+        self.send(msg("/now"))
+        self.assertEqual(self.received, ["/now"])
+        self.assertEqual(self.server.scheduler.pending(), 1)
+        time.sleep(0.3)
+        self.assertEqual(self.received, ["/now", "/later"])
+        metrics = self.server.scheduler.asDict()
+        self.assertEqual((metrics['scheduled'], metrics['dispatched'], metrics['pending']), (1, 1, 0))
+        self.assertTrue(0 <= metrics['lateness']['max'] < 0.05)
+
+    def test_late_policy(self):
+        self.server.setScheduler(osc.OSCScheduler(late_policy='drop', late_tolerance=0.5))
+        self.send(self.bundle("/late", -1.0))
+        self.send(self.bundle("/recent", -0.1))
+        self.assertEqual(self.received, ["/recent"])
+        metrics = self.server.scheduler.asDict()
+        self.assertEqual((metrics['late'], metrics['dropped'], metrics['scheduled']), (1, 1, 0))
+
+    def test_close_from_scheduled(self):
+        scheduler = osc.OSCScheduler()
+        errors = []
+        done = threading.Event()
+        def stop():
+            try:
+                scheduler.close()
+            except Exception, e:
+                errors.append(e)
+            done.set()
+        scheduler.schedule(time.time(), stop)
+        thread = scheduler._thread
+        self.assertTrue(done.wait(2.0))
+        thread.join(2.0)
+        self.assertEqual(errors, [])
+        self.assertFalse(thread.isAlive())
+
+class TestBatchServer(unittest.TestCase):
+    def test_batch(self):
+        server = osc.BatchOSCServer(('127.0.0.1', 0), rcvbuf_size=1 << 18, max_batch=8)
+        received = []
+        server.addMsgHandler("/tr", lambda addr, tags, data, source: received.append(data[2]))
+        server.addMsgHandler("/status", lambda addr, tags, data, source: msg("/status.reply", 1))
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        client.settimeout(1.0)
+        try:
+            for i in range(10):
+                client.sendto(msg("/tr", 1000, 0, float(i)).getBinary(), server.address())
+            client.sendto(msg("/status").getBinary(), server.address())
+            time.sleep(0.05)
+            server.handle_request()
+            self.assertEqual(received, range(8))
+            server.handle_request()
+            self.assertEqual(received, range(10))
+            self.assertEqual(osc.decodeOSC(client.recv(65536)), ["/status.reply", ",i", 1])
+            metrics = server.asDict()
+            self.assertEqual((metrics['wakeups'], metrics['packets']), (2, 11))
+            self.assertEqual(metrics['batch_sizes']['max'], 8)
+            self.assertTrue(metrics['rcvbuf_size'] >= 1 << 18)
+            if os.path.exists('/proc/net/udp'):
+                self.assertEqual(metrics['kernel_drops'], 0)
+        finally:
+            server.close()
+            client.close()
+
+    def test_truncated_after_long(self):
+        server = osc.BatchOSCServer(('127.0.0.1', 0))
+        received = []
+        errors = []
+        server.addMsgHandler("/s", lambda addr, tags, data, source: received.append(data[0]))
+        server.handle_error = lambda request, client_address: errors.append(sys.exc_info()[0])
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            binary = msg("/s", "abcdefgh" * 8).getBinary()
+            client.sendto(binary, server.address())
+            # the string's NUL is cut off; the previous packet's is still in the receive-buffer
+            client.sendto(binary[:24], server.address())
+            time.sleep(0.05)
+            server.handle_request()
+        finally:
+            server.close()
+            client.close()
+        self.assertEqual(received, ["abcdefgh" * 8])
+        self.assertEqual(errors, [osc.OSCError])
+
+class TestShardedServer(unittest.TestCase):
+    def test_shards(self):
+        sharded = osc.ShardedOSCServer(('127.0.0.1', 0), shards=2)
+        sharded.addMsgHandler("/tr", lambda addr, tags, data, source: sharded.emit(data[2]))
+        sharded.start()
+        clients = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for i in range(8)]
+        try:
+            for (i, client) in enumerate(clients):
+                client.sendto(msg("/tr", 1000, 0, i).getBinary(), sharded.address())
+            received = []
+            while len(received) < len(clients):
+                results = sharded.results(5.0)
+                self.assertTrue(results)
+                received.extend(results)
+        finally:
+            sharded.close()
+            for client in clients:
+                client.close()
+        self.assertEqual(sorted(value for (shard, value) in received), range(len(clients)))
+        self.assertTrue(set(shard for (shard, value) in received) <= set([0, 1]))
+
+    def test_start_failure(self):
+        def initializer(server, shard):
+            if shard == 1:
+                raise ValueError("no such buffer")
+        sharded = osc.ShardedOSCServer(('127.0.0.1', 0), shards=2, initializer=initializer)
+        start = time.time()
+        try:
+            sharded.start(timeout=5.0)
+        except osc.OSCServerError, e:
+            self.assertEqual(str(e), "Shard 1 failed to start: ValueError: no such buffer")
+        else:
+            sharded.close()
+            self.fail("start() didn't raise")
+        self.assertTrue(time.time() - start < 2.0)
+
+    def test_no_aggregate(self):
+        sharded = osc.ShardedOSCServer(('127.0.0.1', 0), shards=1, aggregate=False)
+        self.assertRaises(osc.OSCServerError, sharded.results, 0)
+
+    def test_close_with_uncollected_results(self):
+        sharded = osc.ShardedOSCServer(('127.0.0.1', 0), shards=1)
+        sharded.addMsgHandler("/big", lambda addr, tags, data, source: sharded.emit("x" * 200000))
+        sharded.start()
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            client.sendto(msg("/big").getBinary(), sharded.address())
+            time.sleep(0.2)
+        finally:
+            processes = list(sharded._processes)
+            start = time.time()
+            sharded.close(timeout=2.0)
+            client.close()
+        self.assertTrue(time.time() - start < 1.5)
+        self.assertEqual([p.exitcode for p in processes], [0])
+
+class TestPooledServer(unittest.TestCase):
+    def test_ordered(self):
+        server = osc.PooledOSCServer(('127.0.0.1', 0), workers=3)
+        received = []
+        lock = threading.Lock()
+        def handler(addr, tags, data, source):
+            with lock:
+                received.append((source[1], data[0]))
+        server.addMsgHandler("/n", handler)
+        clients = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for i in range(2)]
+        try:
+            for i in range(20):
+                for client in clients:
+                    client.sendto(msg("/n", i).getBinary(), server.address())
+                    server.handle_request()
+        finally:
+            server.close()
+            for client in clients:
+                client.close()
+        self.assertEqual(len(received), 40)
+        for port in set([port for (port, i) in received]):
+            self.assertEqual([i for (p, i) in received if p == port], range(20))
+        metrics = server.pool.asDict()
+        self.assertEqual((metrics['submitted'], metrics['completed'], metrics['depth']), (40, 40, 0))
+        self.assertEqual(metrics['run_time']['count'], 40)
+
+    def test_errors(self):
+        server = osc.PooledOSCServer(('127.0.0.1', 0), workers=2)
+        reported = []
+        server.handle_error = lambda request, client_address: reported.append(sys.exc_info()[0])
+        def handler(addr, tags, data, source):
+            raise ValueError(data[0])
+        server.addMsgHandler("/n", handler)
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            for i in range(3):
+                client.sendto(msg("/n", i).getBinary(), server.address())
+                server.handle_request()
+        finally:
+            server.close()
+            client.close()
+        self.assertEqual(reported, [ValueError] * 3)
+        metrics = server.pool.asDict()
+        self.assertEqual((metrics['completed'], metrics['errors']), (3, 3))
+
+    def test_full_queue_blocks_only_its_worker(self):
+        pool = osc.OSCWorkerPool(workers=2, max_queue=1)
+        release = threading.Event()
+        ran = []
+        pool.submit(release.wait, (5.0,), key=0)
+        time.sleep(0.05)    # worker 0 now runs the first function
+        pool.submit(ran.append, ("queued",), key=0)
+        blocked = threading.Thread(target=pool.submit, args=(ran.append, ("blocked",)), kwargs={'key': 0})
+        blocked.start()
+        time.sleep(0.05)
+        done = threading.Event()
+        start = time.time()
+        pool.submit(done.set, key=1)
+        self.assertTrue(done.wait(1.0))
+        self.assertTrue(time.time() - start < 1.0)
+        release.set()
+        blocked.join()
+        pool.close()
+        self.assertEqual(ran, ["queued", "blocked"])
+
+    def test_submit_to_own_full_queue(self):
+        pool = osc.OSCWorkerPool(workers=1, max_queue=1)
+        errors = []
+        finished = threading.Event()
+        def resubmit():
+            pool.submit(lambda: None, key=0)
+            try:
+                pool.submit(lambda: None, key=0)
+            except osc.OSCServerError, e:
+                errors.append(e)
+            finished.set()
+        pool.submit(resubmit, key=0)
+        self.assertTrue(finished.wait(2.0))
+        pool.close()
+        self.assertEqual(len(errors), 1)
+        metrics = pool.asDict()
+        self.assertEqual((metrics['submitted'], metrics['completed']), (2, 2))
+
+    def test_close_runs_all_submitted(self):
+        pool = osc.OSCWorkerPool(workers=2, max_queue=1)
+        ran = []
+        def submitter():
+            try:
+                for i in range(200):
+                    pool.submit(ran.append, (i,), key=0)
+            except osc.OSCServerError:
+                pass
+        thread = threading.Thread(target=submitter)
+        thread.start()
+        time.sleep(0.001)
+        pool.close()
+        thread.join()
+        self.assertEqual(ran, range(len(ran)))
+        self.assertEqual(pool.asDict()['submitted'], len(ran))
+        self.assertRaises(osc.OSCServerError, pool.submit, ran.append, (0,))
+
+class FakeHandler(osc.OSCRequestHandler):
+    """An OSCRequestHandler which doesn't handle a request when instantiated"""
+    def __init__(self, server):
+        self.server = server
+        self.client_address = ('127.0.0.1', 57110)
+
+class TestOSCTemplate(unittest.TestCase):
+    def test_matches_message(self):
+        t = osc.OSCTemplate("/n_set", ",isf", {1: 'freq'})
+        self.assertEqual(len(t), 2)
+        self.assertEqual(t.getBinary(1000, 440.0),
+                         msg("/n_set", 1000, 'freq', 440.0).getBinary())
+        self.assertEqual(t.message(1000, 440.0), msg("/n_set", 1000, 'freq', 440.0))
+
+    def test_unfrozen_string(self):
+        self.assertRaises(osc.OSCError, osc.OSCTemplate, "/s_new", ",si")
+
+    def test_node_templates(self):
+        n = supercollider.node.Node("s", 1234)
+        n.set("freqL", 400, "freqR", 500)
+        t = n.n_set_template(["freqL", "freqR"])
+        self.assertEqual(t.getBinary(400, 500),
+                         msg("/n_set", 1234, "freqL", 400.0, "freqR", 500.0).getBinary())
+        n = supercollider.node.Node("s", 1234)
+        n.set("freqL", 400)
+        t = n.s_new_template(["freqL"])
+        self.assertEqual(t.getBinary(400), n.s_new().getBinary())
+
 if __name__ == '__main__':
     unittest.main()